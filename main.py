@@ -1,37 +1,5 @@
-import pandas as pd
+from tpch.main import main
 
-
-column_names = [
-    "l_orderkey",
-    "l_partkey",
-    "l_suppkey",
-    "l_linenumber",
-    "l_quantity",
-    "l_extendedprice",
-    "l_discount",
-    "l_tax",
-    "l_returnflag",
-    "l_linestatus",
-    "l_shipdate",
-    "l_commitdate",
-    "l_receiptdate",
-    "l_shipinstruct",
-    "l_shipmode",
-    "l_comment",
-]
-
-
-def print_hi(name):
-    # Use a breakpoint in the code line below to debug your script.
-    print(f"Hi, {name}")  # Press Ctrl+F8 to toggle the breakpoint.
-
-
-# Press the green button in the gutter to run the script.
+# Same as python -m tpch
 if __name__ == "__main__":
-    print_hi("PyCharm")
-    lineitem = pd.read_csv(
-        "./TPC-H/tables/lineitem.tbl", sep="|", header=None, names=column_names
-    )
-
-
-# See PyCharm help at https://www.jetbrains.com/help/pycharm/
+    main()
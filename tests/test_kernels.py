@@ -0,0 +1,24 @@
+import numpy as np
+import pytest
+
+kernels = pytest.importorskip("tpch.kernels")
+
+
+def test_is_in_below_smallest_key():
+    # Sparse keys take the hash table, whose empty slots hold min(keys) - 1
+    keys = np.array([100, 5000, 90000])
+    values = np.array([99, 100, 98, 5000, 90001])
+
+    found = kernels.is_in(values, keys)
+
+    np.testing.assert_array_equal(found, np.isin(values, keys))
+
+
+def test_join_below_smallest_key():
+    right = np.array([100, 5000, 90000])
+    left = np.array([99, 5000, 99, 100])
+
+    left_rows, right_rows = kernels.join(left, right)
+
+    np.testing.assert_array_equal(left_rows, [1, 3])
+    np.testing.assert_array_equal(right_rows, [1, 0])
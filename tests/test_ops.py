@@ -0,0 +1,22 @@
+import pandas as pd
+import pytest
+
+from tpch.ops import top_k
+
+
+@pytest.mark.parametrize("n", [0, 2, 5])
+@pytest.mark.parametrize("ascending", [True, False])
+@pytest.mark.parametrize("dtype", ["int64[pyarrow]", "Float64", "float64"])
+def test_top_k_with_missing_keys(n, ascending, dtype):
+    # Fewer than n rows have their first key set
+    df = pd.DataFrame(
+        {
+            "a": pd.array([3, None, 1, 2, None, 5], dtype=dtype),
+            "b": [1, 2, 3, 4, 5, 6],
+        }
+    )
+
+    result = top_k(df, n, ["a", "b"], ascending=ascending)
+
+    expected = df.sort_values(["a", "b"], ascending=ascending).head(n)
+    pd.testing.assert_frame_equal(result, expected)
@@ -0,0 +1,44 @@
+import pandas as pd
+
+from dask import dataframe as dd
+from tpch.planner import join
+
+
+def _tables(npartitions=None):
+    # Frames that were not loaded by utils, with derived column names
+    tables = {
+        "facts": pd.DataFrame({"fact_key": [1, 2, 2, 3], "amount": [1, 2, 3, 4]}),
+        "dims": pd.DataFrame({"dim_key": [1, 2, 3], "name": ["a", "b", "c"]}),
+        "tags": pd.DataFrame({"tag_name": ["a", "b"], "tag": ["x", "y"]}),
+    }
+    if npartitions:
+        tables = {
+            name: dd.from_pandas(df, npartitions=npartitions)
+            for name, df in tables.items()
+        }
+    return tables
+
+
+JOINS = [
+    ("facts", "fact_key", "dims", "dim_key"),
+    ("dims", "name", "tags", "tag_name"),
+]
+
+
+def _sorted(df):
+    return df.sort_values("amount")[["amount", "tag"]].reset_index(drop=True)
+
+
+def test_join_unknown_tables():
+    result = join(_tables(), JOINS, filters={"facts": lambda df: df["amount"] > 1})
+
+    expected = pd.DataFrame({"amount": [2, 3], "tag": ["y", "y"]})
+    pd.testing.assert_frame_equal(_sorted(result), expected)
+
+
+def test_join_unknown_dask_tables():
+    result = join(_tables(npartitions=2), JOINS).compute()
+
+    expected = pd.DataFrame({"amount": [1, 2, 3], "tag": ["x", "y", "y"]})
+    # Dask converts the strings to Arrow
+    pd.testing.assert_frame_equal(_sorted(result), expected, check_dtype=False)
@@ -0,0 +1,3 @@
+from tpch.main import main
+
+main()
@@ -1,24 +1,31 @@
-import pyperf
 import cudf
 import numpy as np
 
 from datetime import date
 from tpch.utils import (
     get_line_item_ds,
-    export_df,
 )
 
 Q_NUM = 1
 
 
 def get_ds():
-    lineitem = get_line_item_ds("cudf")
+    lineitem = get_line_item_ds(
+        "cudf",
+        columns=[
+            "l_quantity",
+            "l_extendedprice",
+            "l_discount",
+            "l_tax",
+            "l_returnflag",
+            "l_linestatus",
+            "l_shipdate",
+        ],
+    )
     return lineitem
 
 
-def query():
-    lineitem = get_ds()
-
+def query(lineitem):
     # Convert target date to string format that cuDF can compare with
     target_date = np.datetime64(date(1998, 9, 2))
 
@@ -41,21 +48,3 @@ def query():
     )
 
     return q_final
-
-
-def bench_q1():
-    t0 = pyperf.perf_counter()
-    query()
-    return pyperf.perf_counter() - t0
-
-
-if __name__ == "__main__":
-    runner = pyperf.Runner()
-    runner.argparser.set_defaults(
-        quiet=False, loops=1, values=1, processes=1, warmups=0
-    )
-    runner.bench_func("cudf-q1", bench_q1)
-    # result = query()
-    #
-    # file_name = "q" + str(Q_NUM) + ".out"
-    # export_df(result, file_name, is_cudf=True)
@@ -1,22 +1,21 @@
-import pyperf
 import cudf
 
-from tpch.utils import get_part_supp_ds, get_supplier_ds, get_nation_ds, export_df
+from tpch.utils import get_part_supp_ds, get_supplier_ds, get_nation_ds
 
 Q_NUM = 11
 
 
 def get_ds():
-    partsupp = get_part_supp_ds("cudf")
-    supplier = get_supplier_ds("cudf")
-    nation = get_nation_ds("cudf")
+    partsupp = get_part_supp_ds(
+        "cudf", columns=["ps_partkey", "ps_suppkey", "ps_availqty", "ps_supplycost"]
+    )
+    supplier = get_supplier_ds("cudf", columns=["s_suppkey", "s_nationkey"])
+    nation = get_nation_ds("cudf", columns=["n_nationkey", "n_name"])
 
     return partsupp, supplier, nation
 
 
-def query():
-    partsupp, supplier, nation = get_ds()
-
+def query(partsupp, supplier, nation):
     var1 = "GERMANY"
     sumres_rate = 0.0001 / (supplier.shape[0] / 10000)
 
@@ -46,21 +45,3 @@ def query():
     )
 
     return q_final
-
-
-def bench_q11():
-    t0 = pyperf.perf_counter()
-    query()
-    return pyperf.perf_counter() - t0
-
-
-if __name__ == "__main__":
-    runner = pyperf.Runner()
-    runner.argparser.set_defaults(
-        quiet=False, loops=1, values=1, processes=1, warmups=0
-    )
-    runner.bench_func("cudf-q11", bench_q11)
-    # result = query()
-    #
-    # file_name = "q" + str(Q_NUM) + ".out"
-    # export_df(result, file_name, is_cudf=True)
@@ -1,4 +1,3 @@
-import pyperf
 import cudf
 import numpy as np
 
@@ -6,22 +5,28 @@ from datetime import date
 from tpch.utils import (
     get_line_item_ds,
     get_orders_ds,
-    export_df,
 )
 
 Q_NUM = 12
 
 
 def get_ds():
-    lineitem = get_line_item_ds("cudf")
-    orders = get_orders_ds("cudf")
+    lineitem = get_line_item_ds(
+        "cudf",
+        columns=[
+            "l_orderkey",
+            "l_shipdate",
+            "l_commitdate",
+            "l_receiptdate",
+            "l_shipmode",
+        ],
+    )
+    orders = get_orders_ds("cudf", columns=["o_orderkey", "o_orderpriority"])
 
     return lineitem, orders
 
 
-def query():
-    lineitem, orders = get_ds()
-
+def query(lineitem, orders):
     var1 = "MAIL"
     var2 = "SHIP"
     var3 = np.datetime64(date(1994, 1, 1))
@@ -57,21 +62,3 @@ def query():
     )
 
     return q_final
-
-
-def bench_q12():
-    t0 = pyperf.perf_counter()
-    query()
-    return pyperf.perf_counter() - t0
-
-
-if __name__ == "__main__":
-    runner = pyperf.Runner()
-    runner.argparser.set_defaults(
-        quiet=False, loops=1, values=1, processes=1, warmups=0
-    )
-    runner.bench_func("cudf-q12", bench_q12)
-    # result = query()
-    #
-    # file_name = "q" + str(Q_NUM) + ".out"
-    # export_df(result, file_name, is_cudf=True)
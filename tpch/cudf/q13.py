@@ -1,25 +1,23 @@
-import pyperf
 import cudf
 
 from tpch.utils import (
     get_customer_ds,
     get_orders_ds,
-    export_df,
 )
 
 Q_NUM = 13
 
 
 def get_ds():
-    customer = get_customer_ds(mode="cudf")
-    orders = get_orders_ds(mode="cudf")
+    customer = get_customer_ds(mode="cudf", columns=["c_custkey"])
+    orders = get_orders_ds(
+        mode="cudf", columns=["o_orderkey", "o_custkey", "o_comment"]
+    )
 
     return customer, orders
 
 
-def query():
-    customer, orders = get_ds()
-
+def query(customer, orders):
     var1 = "special"
     var2 = "requests"
 
@@ -36,21 +34,3 @@ def query():
     )
 
     return q_final
-
-
-def bench_q13():
-    t0 = pyperf.perf_counter()
-    query()
-    return pyperf.perf_counter() - t0
-
-
-if __name__ == "__main__":
-    runner = pyperf.Runner()
-    runner.argparser.set_defaults(
-        quiet=False, loops=1, values=1, processes=1, warmups=0
-    )
-    runner.bench_func("cudf-q13", bench_q13)
-    # result = query()
-    #
-    # file_name = "q" + str(Q_NUM) + ".out"
-    # export_df(result, file_name, is_cudf=True)
@@ -1,4 +1,3 @@
-import pyperf
 import cudf
 import pandas as pd
 import numpy as np
@@ -7,22 +6,27 @@ from datetime import date
 from tpch.utils import (
     get_line_item_ds,
     get_part_ds,
-    export_df,
 )
 
 Q_NUM = 14
 
 
 def get_ds():
-    lineitem = get_line_item_ds(mode="cudf")
-    part = get_part_ds(mode="cudf")
+    lineitem = get_line_item_ds(
+        mode="cudf",
+        columns=["l_partkey", "l_extendedprice", "l_discount", "l_shipdate"],
+        filters=[
+            ("l_shipdate", ">=", date(1995, 9, 1)),
+            ("l_shipdate", "<", date(1995, 10, 1)),
+        ],
+        clustered=True,
+    )
+    part = get_part_ds(mode="cudf", columns=["p_partkey", "p_type"])
 
     return lineitem, part
 
 
-def query():
-    lineitem, part = get_ds()
-
+def query(lineitem, part):
     var1 = np.datetime64(date(1995, 9, 1))
     var2 = np.datetime64(date(1995, 10, 1))
 
@@ -42,21 +46,3 @@ def query():
 
     q_final = pd.DataFrame({"promo_revenue": [round(promo_revenue, 2)]})
     return q_final
-
-
-def bench_q14():
-    t0 = pyperf.perf_counter()
-    query()
-    return pyperf.perf_counter() - t0
-
-
-if __name__ == "__main__":
-    runner = pyperf.Runner()
-    runner.argparser.set_defaults(
-        quiet=False, loops=1, values=1, processes=1, warmups=0
-    )
-    runner.bench_func("cudf-q14", bench_q14)
-    # result = query()
-    #
-    # file_name = "q" + str(Q_NUM) + ".out"
-    # export_df(result, file_name, is_cudf=False)
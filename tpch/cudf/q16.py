@@ -1,27 +1,25 @@
-import pyperf
 import cudf
 
 from tpch.utils import (
     get_supplier_ds,
     get_part_supp_ds,
     get_part_ds,
-    export_df,
 )
 
 Q_NUM = 16
 
 
 def get_ds():
-    supplier = get_supplier_ds(mode="cudf")
-    partsupp = get_part_supp_ds(mode="cudf")
-    part = get_part_ds(mode="cudf")
+    supplier = get_supplier_ds(mode="cudf", columns=["s_suppkey", "s_comment"])
+    partsupp = get_part_supp_ds(mode="cudf", columns=["ps_partkey", "ps_suppkey"])
+    part = get_part_ds(
+        mode="cudf", columns=["p_partkey", "p_brand", "p_type", "p_size"]
+    )
 
     return supplier, partsupp, part
 
 
-def query():
-    supplier, partsupp, part = get_ds()
-
+def query(supplier, partsupp, part):
     var1 = "Brand#45"
 
     complaint_suppliers = supplier[
@@ -57,21 +55,3 @@ def query():
     )
 
     return q_final
-
-
-def bench_q16():
-    t0 = pyperf.perf_counter()
-    query()
-    return pyperf.perf_counter() - t0
-
-
-if __name__ == "__main__":
-    runner = pyperf.Runner()
-    runner.argparser.set_defaults(
-        quiet=False, loops=1, values=1, processes=1, warmups=0
-    )
-    runner.bench_func("cudf-q16", bench_q16)
-    # result = query()
-    #
-    # file_name = "q" + str(Q_NUM) + ".out"
-    # export_df(result, file_name, is_cudf=True)
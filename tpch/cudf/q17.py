@@ -1,26 +1,25 @@
-import pyperf
 import cudf
 import pandas as pd
 
 from tpch.utils import (
     get_line_item_ds,
     get_part_ds,
-    export_df,
 )
+from tpch.ops import group_broadcast
 
 Q_NUM = 17
 
 
 def get_ds():
-    lineitem = get_line_item_ds(mode="cudf")
-    part = get_part_ds(mode="cudf")
+    lineitem = get_line_item_ds(
+        mode="cudf", columns=["l_partkey", "l_quantity", "l_extendedprice"]
+    )
+    part = get_part_ds(mode="cudf", columns=["p_partkey", "p_brand", "p_container"])
 
     return lineitem, part
 
 
-def query():
-    lineitem, part = get_ds()
-
+def query(lineitem, part):
     var1 = "Brand#23"
     var2 = "MED BOX"
 
@@ -35,14 +34,11 @@ def query():
         right_on="l_partkey",
     )
 
-    avg_qty = joined_data.groupby("p_partkey", as_index=False, sort=False).agg(
-        {"l_quantity": "mean"}
+    final_result = group_broadcast(
+        joined_data, "p_partkey", "l_quantity", "mean", "avg_quantity"
     )
-    avg_qty["avg_quantity"] = avg_qty["l_quantity"] * 0.2
+    final_result["avg_quantity"] = final_result["avg_quantity"] * 0.2
 
-    final_result = joined_data.merge(
-        avg_qty[["p_partkey", "avg_quantity"]], on="p_partkey"
-    )
     sum_value = (
         final_result[final_result["l_quantity"] < final_result["avg_quantity"]][
             "l_extendedprice"
@@ -51,21 +47,3 @@ def query():
     )
 
     return pd.DataFrame({"avg_yearly": [sum_value]})
-
-
-def bench_q17():
-    t0 = pyperf.perf_counter()
-    query()
-    return pyperf.perf_counter() - t0
-
-
-if __name__ == "__main__":
-    runner = pyperf.Runner()
-    runner.argparser.set_defaults(
-        quiet=False, loops=1, values=1, processes=1, warmups=0
-    )
-    runner.bench_func("cudf-q17", bench_q17)
-    # result = query()
-    #
-    # file_name = "q" + str(Q_NUM) + ".out"
-    # export_df(result, file_name, is_cudf=False)
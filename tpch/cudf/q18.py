@@ -1,27 +1,26 @@
-import pyperf
 import cudf
 
 from tpch.utils import (
     get_line_item_ds,
     get_customer_ds,
     get_orders_ds,
-    export_df,
 )
+from tpch.ops import top_k
 
 Q_NUM = 18
 
 
 def get_ds():
-    lineitem = get_line_item_ds(mode="cudf")
-    customer = get_customer_ds(mode="cudf")
-    orders = get_orders_ds(mode="cudf")
+    lineitem = get_line_item_ds(mode="cudf", columns=["l_orderkey", "l_quantity"])
+    customer = get_customer_ds(mode="cudf", columns=["c_custkey", "c_name"])
+    orders = get_orders_ds(
+        mode="cudf", columns=["o_orderkey", "o_custkey", "o_totalprice", "o_orderdate"]
+    )
 
     return lineitem, customer, orders
 
 
-def query():
-    lineitem, customer, orders = get_ds()
-
+def query(lineitem, customer, orders):
     var1 = 300
 
     filtered_orders = (
@@ -50,28 +49,9 @@ def query():
         )
         .agg({"l_quantity": "sum"})
         .rename(columns={"l_quantity": "col6", "o_orderdate": "o_orderdat"})
-        .sort_values(["o_totalprice", "o_orderdat"], ascending=[False, True])
+        .pipe(top_k, 100, ["o_totalprice", "o_orderdat"], ascending=[False, True])
         .astype({"col6": "float64"})
-        .head(100)
         .reset_index(drop=True)
     )
 
     return q_final
-
-
-def bench_q18():
-    t0 = pyperf.perf_counter()
-    query()
-    return pyperf.perf_counter() - t0
-
-
-if __name__ == "__main__":
-    runner = pyperf.Runner()
-    runner.argparser.set_defaults(
-        quiet=False, loops=1, values=1, processes=1, warmups=0
-    )
-    runner.bench_func("cudf-q18", bench_q18)
-    # result = query()
-    #
-    # file_name = "q" + str(Q_NUM) + ".out"
-    # export_df(result, file_name, is_cudf=True)
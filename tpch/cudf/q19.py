@@ -1,26 +1,34 @@
-import pyperf
 import cudf
 import pandas as pd
 
 from tpch.utils import (
     get_line_item_ds,
     get_part_ds,
-    export_df,
 )
 
 Q_NUM = 19
 
 
 def get_ds():
-    lineitem = get_line_item_ds(mode="cudf")
-    part = get_part_ds(mode="cudf")
+    lineitem = get_line_item_ds(
+        mode="cudf",
+        columns=[
+            "l_partkey",
+            "l_quantity",
+            "l_extendedprice",
+            "l_discount",
+            "l_shipinstruct",
+            "l_shipmode",
+        ],
+    )
+    part = get_part_ds(
+        mode="cudf", columns=["p_partkey", "p_brand", "p_size", "p_container"]
+    )
 
     return lineitem, part
 
 
-def query():
-    lineitem, part = get_ds()
-
+def query(lineitem, part):
     part_cols = part[["p_partkey", "p_brand", "p_container", "p_size"]]
     lineitem_cols = lineitem[
         [
@@ -77,21 +85,3 @@ def query():
     q_final = pd.DataFrame({"revenue": [revenue]})
 
     return q_final
-
-
-def bench_q19():
-    t0 = pyperf.perf_counter()
-    query()
-    return pyperf.perf_counter() - t0
-
-
-if __name__ == "__main__":
-    runner = pyperf.Runner()
-    runner.argparser.set_defaults(
-        quiet=False, loops=1, values=1, processes=1, warmups=0
-    )
-    runner.bench_func("cudf-q19", bench_q19)
-    # result = query()
-    #
-    # file_name = "q" + str(Q_NUM) + ".out"
-    # export_df(result, file_name, is_cudf=False)
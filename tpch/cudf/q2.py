@@ -1,45 +1,87 @@
-import pyperf
 import cudf
 import tpch.utils as utils
+from tpch.ops import gather, group_broadcast, top_k
+from tpch.planner import join
 
 Q_NUM = 2
 
 
 def get_ds():
-    region = utils.get_region_ds("cudf")
-    nation = utils.get_nation_ds("cudf")
-    supplier = utils.get_supplier_ds("cudf")
-    part = utils.get_part_ds("cudf")
-    part_supp = utils.get_part_supp_ds("cudf")
+    region = utils.get_region_ds("cudf", columns=["r_regionkey", "r_name"])
+    nation = utils.get_nation_ds(
+        "cudf", columns=["n_nationkey", "n_name", "n_regionkey"]
+    )
+    supplier = utils.get_supplier_ds(
+        "cudf",
+        columns=[
+            "s_suppkey",
+            "s_name",
+            "s_address",
+            "s_nationkey",
+            "s_phone",
+            "s_acctbal",
+            "s_comment",
+        ],
+    )
+    part = utils.get_part_ds(
+        "cudf", columns=["p_partkey", "p_mfgr", "p_type", "p_size"]
+    )
+    part_supp = utils.get_part_supp_ds(
+        "cudf", columns=["ps_partkey", "ps_suppkey", "ps_supplycost"]
+    )
 
     return region, nation, supplier, part, part_supp
 
 
-def query():
-    region, nation, supplier, part, part_supp = get_ds()
-
+def query(region, nation, supplier, part, part_supp):
     var1 = 15
     var2 = "BRASS"
     var3 = "EUROPE"
 
-    q1 = (
-        part.merge(part_supp, left_on="p_partkey", right_on="ps_partkey")
-        .merge(supplier, left_on="ps_suppkey", right_on="s_suppkey")
-        .merge(nation, left_on="s_nationkey", right_on="n_nationkey")
-        .merge(region, left_on="n_regionkey", right_on="r_regionkey")
-        .pipe(
-            lambda df: df[
-                (df["p_size"] == var1)
-                & (df["p_type"].str.endswith(var2))
-                & (df["r_name"] == var3)
-            ]
-        )
+    q1 = join(
+        {
+            "part": part[["p_partkey", "p_type", "p_size"]],
+            "partsupp": part_supp,
+            "supplier": supplier[["s_suppkey", "s_name", "s_nationkey", "s_acctbal"]],
+            "nation": nation,
+            "region": region,
+        },
+        joins=[
+            ("part", "p_partkey", "partsupp", "ps_partkey"),
+            ("partsupp", "ps_suppkey", "supplier", "s_suppkey"),
+            ("supplier", "s_nationkey", "nation", "n_nationkey"),
+            ("nation", "n_regionkey", "region", "r_regionkey"),
+        ],
+        filters={
+            "part": lambda df: (df["p_size"] == var1) & df["p_type"].str.endswith(var2),
+            "region": lambda df: df["r_name"] == var3,
+        },
     )
 
     q_final = (
-        q1.groupby("p_partkey", as_index=False)
-        .agg({"ps_supplycost": "min"})
-        .merge(q1, on=["p_partkey", "ps_supplycost"])[
+        q1.pipe(group_broadcast, "p_partkey", "ps_supplycost", "min", "min_cost")
+        .pipe(lambda df: df[df["ps_supplycost"] == df["min_cost"]])[
+            [
+                "s_acctbal",
+                "s_name",
+                "n_name",
+                "p_partkey",
+                "s_suppkey",
+            ]
+        ]
+        .pipe(
+            top_k,
+            100,
+            by=["s_acctbal", "n_name", "s_name", "p_partkey"],
+            ascending=[False, True, True, True],
+        )
+        # Only the 100 rows left get the wide columns of their part and supplier
+        .pipe(gather, part[["p_partkey", "p_mfgr"]], on="p_partkey")
+        .pipe(
+            gather,
+            supplier[["s_suppkey", "s_address", "s_phone", "s_comment"]],
+            on="s_suppkey",
+        )[
             [
                 "s_acctbal",
                 "s_name",
@@ -51,29 +93,6 @@ def query():
                 "s_comment",
             ]
         ]
-        .sort_values(
-            by=["s_acctbal", "n_name", "s_name", "p_partkey"],
-            ascending=[False, True, True, True],
-        )
-        .head(100)
     )
 
     return q_final
-
-
-def bench_q2():
-    t0 = pyperf.perf_counter()
-    query()
-    return pyperf.perf_counter() - t0
-
-
-if __name__ == "__main__":
-    runner = pyperf.Runner()
-    runner.argparser.set_defaults(
-        quiet=False, loops=1, values=1, processes=1, warmups=0
-    )
-    runner.bench_func("cudf-q2", bench_q2)
-    # result = query()
-    #
-    # file_name = "q" + str(Q_NUM) + ".out"
-    # utils.export_df(result, file_name, is_cudf=True)
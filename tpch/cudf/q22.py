@@ -1,25 +1,24 @@
-import pyperf
 import cudf
 
 from tpch.utils import (
     get_customer_ds,
     get_orders_ds,
-    export_df,
 )
+from tpch.ops import anti_join
 
 Q_NUM = 22
 
 
 def get_ds():
-    customer = get_customer_ds(mode="cudf")
-    orders = get_orders_ds(mode="cudf")
+    customer = get_customer_ds(
+        mode="cudf", columns=["c_custkey", "c_phone", "c_acctbal"]
+    )
+    orders = get_orders_ds(mode="cudf", columns=["o_custkey"])
 
     return customer, orders
 
 
-def query():
-    customer, orders = get_ds()
-
+def query(customer, orders):
     cntry_codes = ["13", "31", "23", "29", "30", "18", "17"]
     q1 = customer[["c_custkey", "c_phone", "c_acctbal"]]
 
@@ -27,12 +26,8 @@ def query():
     q1 = q1[q1["cntrycode"].isin(cntry_codes)]
 
     q2 = q1[q1["c_acctbal"] > 0.0]["c_acctbal"].mean()
-    q3 = orders[["o_custkey"]].drop_duplicates()
-
-    merged_df = q1.merge(q3, left_on="c_custkey", right_on="o_custkey", how="left")
-    filtered_df = merged_df[
-        merged_df["o_custkey"].isna() & (merged_df["c_acctbal"] > q2)
-    ]
+    q3 = anti_join(q1, orders, left_on="c_custkey", right_on="o_custkey")
+    filtered_df = q3[q3["c_acctbal"] > q2]
 
     q_final = (
         filtered_df.groupby("cntrycode")
@@ -42,21 +37,3 @@ def query():
     )
 
     return q_final
-
-
-def bench_q22():
-    t0 = pyperf.perf_counter()
-    query()
-    return pyperf.perf_counter() - t0
-
-
-if __name__ == "__main__":
-    runner = pyperf.Runner()
-    runner.argparser.set_defaults(
-        quiet=False, loops=1, values=1, processes=1, warmups=0
-    )
-    runner.bench_func("cudf-q22", bench_q22)
-    # result = query()
-    #
-    # file_name = "q" + str(Q_NUM) + ".out"
-    # export_df(result, file_name, is_cudf=True)
@@ -1,4 +1,3 @@
-import pyperf
 import cudf
 import numpy as np
 
@@ -7,23 +6,25 @@ from tpch.utils import (
     get_customer_ds,
     get_orders_ds,
     get_line_item_ds,
-    export_df,
 )
+from tpch.ops import top_k
 
 Q_NUM = 3
 
 
 def get_ds():
-    customer = get_customer_ds("cudf")
-    orders = get_orders_ds("cudf")
-    lineitem = get_line_item_ds("cudf")
+    customer = get_customer_ds("cudf", columns=["c_custkey", "c_mktsegment"])
+    orders = get_orders_ds(
+        "cudf", columns=["o_orderkey", "o_custkey", "o_orderdate", "o_shippriority"]
+    )
+    lineitem = get_line_item_ds(
+        "cudf", columns=["l_orderkey", "l_extendedprice", "l_discount", "l_shipdate"]
+    )
 
     return customer, orders, lineitem
 
 
-def query():
-    customer, orders, lineitem = get_ds()
-
+def query(customer, orders, lineitem):
     var1 = "BUILDING"
     var2 = np.datetime64(date(1995, 3, 15))
 
@@ -49,26 +50,7 @@ def query():
         .agg({"revenue": "sum"})[
             ["l_orderkey", "revenue", "o_orderdate", "o_shippriority"]
         ]
-        .sort_values(["revenue", "o_orderdate"], ascending=[False, True])
-        .head(10)
+        .pipe(top_k, 10, ["revenue", "o_orderdate"], ascending=[False, True])
     )
 
     return q_final
-
-
-def bench_q3():
-    t0 = pyperf.perf_counter()
-    query()
-    return pyperf.perf_counter() - t0
-
-
-if __name__ == "__main__":
-    runner = pyperf.Runner()
-    runner.argparser.set_defaults(
-        quiet=False, loops=1, values=1, processes=1, warmups=0
-    )
-    runner.bench_func("cudf-q3", bench_q3)
-    # result = query()
-    #
-    # file_name = "q" + str(Q_NUM) + ".out"
-    # export_df(result, file_name, is_cudf=True)
@@ -1,46 +1,58 @@
-import pyperf
 import cudf
 import numpy as np
 import tpch.utils as utils
 
 from datetime import date
+from tpch.planner import join
 
 Q_NUM = 5
 
 
 def get_ds():
-    customer = utils.get_customer_ds("cudf")
-    orders = utils.get_orders_ds("cudf")
-    lineitem = utils.get_line_item_ds("cudf")
-    supplier = utils.get_supplier_ds("cudf")
-    nation = utils.get_nation_ds("cudf")
-    region = utils.get_region_ds("cudf")
+    customer = utils.get_customer_ds("cudf", columns=["c_custkey", "c_nationkey"])
+    orders = utils.get_orders_ds(
+        "cudf", columns=["o_orderkey", "o_custkey", "o_orderdate"]
+    )
+    lineitem = utils.get_line_item_ds(
+        "cudf", columns=["l_orderkey", "l_suppkey", "l_extendedprice", "l_discount"]
+    )
+    supplier = utils.get_supplier_ds("cudf", columns=["s_suppkey", "s_nationkey"])
+    nation = utils.get_nation_ds(
+        "cudf", columns=["n_nationkey", "n_name", "n_regionkey"]
+    )
+    region = utils.get_region_ds("cudf", columns=["r_regionkey", "r_name"])
 
     return customer, orders, lineitem, supplier, nation, region
 
 
-def query():
-    customer, orders, lineitem, supplier, nation, region = get_ds()
-
+def query(customer, orders, lineitem, supplier, nation, region):
     var1 = "ASIA"
     var2 = np.datetime64(date(1994, 1, 1))
     var3 = np.datetime64(date(1995, 1, 1))
 
-    region_filtered = region[region["r_name"] == var1]
-    orders_filtered = orders[
-        (orders["o_orderdate"] >= var2) & (orders["o_orderdate"] < var3)
-    ]
-
-    result = (
-        region_filtered.merge(nation, left_on="r_regionkey", right_on="n_regionkey")
-        .merge(customer, left_on="n_nationkey", right_on="c_nationkey")
-        .merge(orders_filtered, left_on="c_custkey", right_on="o_custkey")
-        .merge(lineitem, left_on="o_orderkey", right_on="l_orderkey")
-        .merge(
-            supplier,
-            left_on=["l_suppkey", "n_nationkey"],
-            right_on=["s_suppkey", "s_nationkey"],
-        )
+    result = join(
+        {
+            "customer": customer,
+            "orders": orders,
+            "lineitem": lineitem,
+            "supplier": supplier,
+            "nation": nation,
+            "region": region,
+        },
+        joins=[
+            ("region", "r_regionkey", "nation", "n_regionkey"),
+            ("nation", "n_nationkey", "customer", "c_nationkey"),
+            ("customer", "c_custkey", "orders", "o_custkey"),
+            ("orders", "o_orderkey", "lineitem", "l_orderkey"),
+            ("lineitem", "l_suppkey", "supplier", "s_suppkey"),
+            # The suppliers are of the nation of the customer
+            ("nation", "n_nationkey", "supplier", "s_nationkey"),
+        ],
+        filters={
+            "region": lambda df: df["r_name"] == var1,
+            "orders": lambda df: (df["o_orderdate"] >= var2)
+            & (df["o_orderdate"] < var3),
+        },
     )
 
     q_final = (
@@ -52,21 +64,3 @@ def query():
     )
 
     return q_final
-
-
-def bench_q5():
-    t0 = pyperf.perf_counter()
-    query()
-    return pyperf.perf_counter() - t0
-
-
-if __name__ == "__main__":
-    runner = pyperf.Runner()
-    runner.argparser.set_defaults(
-        quiet=False, loops=1, values=1, processes=1, warmups=0
-    )
-    runner.bench_func("cudf-q5", bench_q5)
-    # result = query()
-    #
-    # file_name = "q" + str(Q_NUM) + ".out"
-    # utils.export_df(result, file_name, is_cudf=True)
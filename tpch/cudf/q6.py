@@ -1,4 +1,3 @@
-import pyperf
 import cudf
 import pandas as pd
 import numpy as np
@@ -6,20 +5,25 @@ import numpy as np
 from datetime import date
 from tpch.utils import (
     get_line_item_ds,
-    export_df,
 )
 
 Q_NUM = 6
 
 
 def get_ds():
-    lineitem = get_line_item_ds("cudf")
+    lineitem = get_line_item_ds(
+        "cudf",
+        columns=["l_quantity", "l_extendedprice", "l_discount", "l_shipdate"],
+        filters=[
+            ("l_shipdate", ">=", date(1994, 1, 1)),
+            ("l_shipdate", "<", date(1995, 1, 1)),
+        ],
+        clustered=True,
+    )
     return lineitem
 
 
-def query():
-    lineitem = get_ds()
-
+def query(lineitem):
     var1 = np.datetime64(date(1994, 1, 1))
     var2 = np.datetime64(date(1995, 1, 1))
     var3 = 0.05
@@ -38,21 +42,3 @@ def query():
     result = (filtered["l_extendedprice"] * filtered["l_discount"]).sum()
 
     return pd.DataFrame({"revenue": [result]})
-
-
-def bench_q6():
-    t0 = pyperf.perf_counter()
-    query()
-    return pyperf.perf_counter() - t0
-
-
-if __name__ == "__main__":
-    runner = pyperf.Runner()
-    runner.argparser.set_defaults(
-        quiet=False, loops=1, values=1, processes=1, warmups=0
-    )
-    runner.bench_func("cudf-q6", bench_q6)
-    # result = query()
-    #
-    # file_name = "q" + str(Q_NUM) + ".out"
-    # export_df(result, file_name, is_cudf=True)
@@ -1,4 +1,3 @@
-import pyperf
 import cudf
 import numpy as np
 import tpch.utils as utils
@@ -9,18 +8,25 @@ Q_NUM = 7
 
 
 def get_ds():
-    customer = utils.get_customer_ds("cudf")
-    lineitem = utils.get_line_item_ds("cudf")
-    nation = utils.get_nation_ds("cudf")
-    orders = utils.get_orders_ds("cudf")
-    supplier = utils.get_supplier_ds("cudf")
+    customer = utils.get_customer_ds("cudf", columns=["c_custkey", "c_nationkey"])
+    lineitem = utils.get_line_item_ds(
+        "cudf",
+        columns=[
+            "l_orderkey",
+            "l_suppkey",
+            "l_extendedprice",
+            "l_discount",
+            "l_shipdate",
+        ],
+    )
+    nation = utils.get_nation_ds("cudf", columns=["n_nationkey", "n_name"])
+    orders = utils.get_orders_ds("cudf", columns=["o_orderkey", "o_custkey"])
+    supplier = utils.get_supplier_ds("cudf", columns=["s_suppkey", "s_nationkey"])
 
     return customer, lineitem, nation, orders, supplier
 
 
-def query():
-    customer, lineitem, nation, orders, supplier = get_ds()
-
+def query(customer, lineitem, nation, orders, supplier):
     var1 = "FRANCE"
     var2 = "GERMANY"
     var3 = np.datetime64(date(1995, 1, 1))
@@ -69,21 +75,3 @@ def query():
     )
 
     return q_final
-
-
-def bench_q7():
-    t0 = pyperf.perf_counter()
-    query()
-    return pyperf.perf_counter() - t0
-
-
-if __name__ == "__main__":
-    runner = pyperf.Runner()
-    runner.argparser.set_defaults(
-        quiet=False, loops=1, values=1, processes=1, warmups=0
-    )
-    runner.bench_func("cudf-q7", bench_q7)
-    # result = query()
-    #
-    # file_name = "q" + str(Q_NUM) + ".out"
-    # utils.export_df(result, file_name, is_cudf=True)
@@ -1,24 +1,34 @@
-import pyperf
 import cudf
 import tpch.utils as utils
+from tpch.planner import join
 
 Q_NUM = 9
 
 
 def get_ds():
-    part = utils.get_part_ds("cudf")
-    supplier = utils.get_supplier_ds("cudf")
-    lineitem = utils.get_line_item_ds("cudf")
-    partsupp = utils.get_part_supp_ds("cudf")
-    orders = utils.get_orders_ds("cudf")
-    nation = utils.get_nation_ds("cudf")
+    part = utils.get_part_ds("cudf", columns=["p_partkey", "p_name"])
+    supplier = utils.get_supplier_ds("cudf", columns=["s_suppkey", "s_nationkey"])
+    lineitem = utils.get_line_item_ds(
+        "cudf",
+        columns=[
+            "l_orderkey",
+            "l_partkey",
+            "l_suppkey",
+            "l_quantity",
+            "l_extendedprice",
+            "l_discount",
+        ],
+    )
+    partsupp = utils.get_part_supp_ds(
+        "cudf", columns=["ps_partkey", "ps_suppkey", "ps_supplycost"]
+    )
+    orders = utils.get_orders_ds("cudf", columns=["o_orderkey", "o_orderdate"])
+    nation = utils.get_nation_ds("cudf", columns=["n_nationkey", "n_name"])
 
     return part, supplier, lineitem, partsupp, orders, nation
 
 
-def query():
-    part, supplier, lineitem, partsupp, orders, nation = get_ds()
-
+def query(part, supplier, lineitem, partsupp, orders, nation):
     filtered_part = part[part["p_name"].str.contains("green")][["p_partkey", "p_name"]]
 
     slim_partsupp = partsupp[["ps_partkey", "ps_suppkey", "ps_supplycost"]]
@@ -36,17 +46,31 @@ def query():
     slim_orders = orders[["o_orderkey", "o_orderdate"]]
     slim_nation = nation[["n_nationkey", "n_name"]]
 
+    joined = join(
+        {
+            "part": filtered_part,
+            "partsupp": slim_partsupp,
+            "supplier": slim_supplier,
+            "lineitem": slim_lineitem,
+            "orders": slim_orders,
+            "nation": slim_nation,
+        },
+        joins=[
+            ("part", "p_partkey", "partsupp", "ps_partkey"),
+            ("partsupp", "ps_suppkey", "supplier", "s_suppkey"),
+            (
+                "partsupp",
+                ["ps_partkey", "ps_suppkey"],
+                "lineitem",
+                ["l_partkey", "l_suppkey"],
+            ),
+            ("lineitem", "l_orderkey", "orders", "o_orderkey"),
+            ("supplier", "s_nationkey", "nation", "n_nationkey"),
+        ],
+    )
+
     q_final = (
-        filtered_part.merge(slim_partsupp, left_on="p_partkey", right_on="ps_partkey")
-        .merge(slim_supplier, left_on="ps_suppkey", right_on="s_suppkey")
-        .merge(
-            slim_lineitem,
-            left_on=["p_partkey", "ps_suppkey"],
-            right_on=["l_partkey", "l_suppkey"],
-        )
-        .merge(slim_orders, left_on="l_orderkey", right_on="o_orderkey")
-        .merge(slim_nation, left_on="s_nationkey", right_on="n_nationkey")
-        .assign(
+        joined.assign(
             o_year=lambda df: df["o_orderdate"].dt.year,
             amount=lambda df: df["l_extendedprice"] * (1 - df["l_discount"])
             - (df["ps_supplycost"] * df["l_quantity"]),
@@ -60,21 +84,3 @@ def query():
     )
 
     return q_final
-
-
-def bench_q9():
-    t0 = pyperf.perf_counter()
-    query()
-    return pyperf.perf_counter() - t0
-
-
-if __name__ == "__main__":
-    runner = pyperf.Runner()
-    runner.argparser.set_defaults(
-        quiet=False, loops=1, values=1, processes=1, warmups=0
-    )
-    runner.bench_func("cudf-q9", bench_q9)
-    # result = query()
-    #
-    # file_name = "q" + str(Q_NUM) + ".out"
-    # utils.export_df(result, file_name, is_cudf=True)
@@ -1,27 +1,35 @@
-import pyperf
 import pandas as pd
 import dask
 
 from datetime import date
 from dask import dataframe as dd
-from dask.distributed import Client
 from tpch.utils import (
     get_line_item_ds,
-    export_df,
 )
 
 Q_NUM = 1
 
 
 def get_ds():
-    line_item_ds = get_line_item_ds("dask")
+    line_item_ds = get_line_item_ds(
+        "dask",
+        columns=[
+            "l_orderkey",
+            "l_quantity",
+            "l_extendedprice",
+            "l_discount",
+            "l_tax",
+            "l_returnflag",
+            "l_linestatus",
+            "l_shipdate",
+        ],
+        filters=[("l_shipdate", "<=", date(1998, 9, 2))],
+    )
 
     return line_item_ds
 
 
-def query() -> dd.DataFrame:
-    line_item_ds = get_ds()
-
+def query(line_item_ds) -> dd.DataFrame:
     var1 = date(1998, 9, 2)
 
     filt = line_item_ds[line_item_ds["l_shipdate"] <= var1]
@@ -48,24 +56,4 @@ def query() -> dd.DataFrame:
 
     result_df = agg.sort_values(["l_returnflag", "l_linestatus"])
 
-    return result_df.compute()  # type: ignore[no-any-return]
-
-
-def bench_q1():
-    t0 = pyperf.perf_counter()
-    query()
-    return pyperf.perf_counter() - t0
-
-
-if __name__ == "__main__":
-    client = Client()
-    print(client.scheduler_info)
-    runner = pyperf.Runner()
-    runner.argparser.set_defaults(
-        quiet=False, loops=1, values=1, processes=1, warmups=0
-    )
-    runner.bench_func("dask-q1", bench_q1)
-    # result = query()
-    #
-    # file_name = "q" + str(Q_NUM) + ".out"
-    # export_df(result, file_name)
+    return result_df  # type: ignore[no-any-return]
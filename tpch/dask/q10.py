@@ -1,106 +1,78 @@
-import pyperf
-
 from datetime import date
 from tpch.utils import (
     get_customer_ds,
     get_orders_ds,
     get_line_item_ds,
     get_nation_ds,
-    export_df,
 )
 from dask import dataframe as dd
-from dask.distributed import Client
+from tpch.ops import gather, top_k
 
 Q_NUM = 10
 
 
 def get_ds():
-    customer = get_customer_ds("dask")
-    orders = get_orders_ds("dask")
-    lineitem = get_line_item_ds("dask")
-    nation = get_nation_ds("dask")
-
-    return customer, orders, lineitem, nation
-
-
-def query() -> dd.DataFrame:
-    customer, orders, lineitem, nation = get_ds()
-
-    var1 = date(1993, 10, 1)
-    var2 = date(1994, 1, 1)
-
-    merged_data = customer.merge(orders, left_on="c_custkey", right_on="o_custkey")
-    with_lineitem = merged_data.merge(
-        lineitem, left_on="o_orderkey", right_on="l_orderkey"
-    )
-    with_nation = with_lineitem.merge(
-        nation, left_on="c_nationkey", right_on="n_nationkey"
-    )
-
-    # Apply filters
-    date_filtered = with_nation[
-        (with_nation["o_orderdate"] < var2) & (with_nation["o_orderdate"] >= var1)
-    ]
-    return_filtered = date_filtered[date_filtered["l_returnflag"] == "R"]
-
-    # Calculate volume
-    return_filtered["volume"] = return_filtered["l_extendedprice"] * (
-        1 - return_filtered["l_discount"]
-    )
-
-    # Group and aggregate
-    grouped = return_filtered.groupby(
-        [
+    customer = get_customer_ds(
+        "dask",
+        columns=[
             "c_custkey",
             "c_name",
-            "c_acctbal",
-            "c_phone",
-            "n_name",
-            "c_address",
-            "c_comment",
-        ]
-    )
-
-    agg_result = grouped.agg({"volume": "sum"}).reset_index()
-    agg_result = agg_result.rename(columns={"volume": "revenue"})
-
-    # Select and order columns
-    final_result = agg_result[
-        [
-            "c_custkey",
-            "c_name",
-            "revenue",
-            "c_acctbal",
-            "n_name",
             "c_address",
+            "c_nationkey",
             "c_phone",
+            "c_acctbal",
             "c_comment",
-        ]
-    ]
-
-    # Sort and limit results
-    sorted_result = final_result.sort_values(by="revenue", ascending=False).reset_index(
-        drop=True
+        ],
     )
+    orders = get_orders_ds(
+        "dask",
+        columns=["o_orderkey", "o_custkey", "o_orderdate"],
+        filters=[
+            ("o_orderdate", ">=", date(1993, 10, 1)),
+            ("o_orderdate", "<", date(1994, 1, 1)),
+        ],
+    )
+    lineitem = get_line_item_ds(
+        "dask",
+        columns=["l_orderkey", "l_extendedprice", "l_discount", "l_returnflag"],
+        filters=[("l_returnflag", "==", "R")],
+    )
+    nation = get_nation_ds("dask", columns=["n_nationkey", "n_name"])
 
-    return sorted_result.head(20, compute=True)
-
+    return customer, orders, lineitem, nation
 
-def bench_q10():
-    t0 = pyperf.perf_counter()
-    query()
-    return pyperf.perf_counter() - t0
 
+def query(customer, orders, lineitem, nation) -> dd.DataFrame:
+    var1 = date(1993, 10, 1)
+    var2 = date(1994, 1, 1)
 
-if __name__ == "__main__":
-    client = Client()
-    print(client.scheduler_info)
-    runner = pyperf.Runner()
-    runner.argparser.set_defaults(
-        quiet=False, loops=1, values=1, processes=1, warmups=0
+    result = (
+        orders[(orders["o_orderdate"] < var2) & (orders["o_orderdate"] >= var1)]
+        .merge(
+            lineitem[lineitem["l_returnflag"] == "R"],
+            left_on="o_orderkey",
+            right_on="l_orderkey",
+        )
+        .assign(volume=lambda df: df["l_extendedprice"] * (1 - df["l_discount"]))
+        .groupby("o_custkey")
+        .agg({"volume": "sum"})
+        .reset_index()
+        .rename(columns={"volume": "revenue"})
+        .pipe(top_k, 20, by="revenue", ascending=False)
+        # Only the 20 customers left get their columns and nation
+        .pipe(gather, customer, left_on="o_custkey", right_on="c_custkey")
+        .pipe(gather, nation, left_on="c_nationkey", right_on="n_nationkey")[
+            [
+                "c_custkey",
+                "c_name",
+                "revenue",
+                "c_acctbal",
+                "n_name",
+                "c_address",
+                "c_phone",
+                "c_comment",
+            ]
+        ]
     )
-    runner.bench_func("dask-q10", bench_q10)
-    # result = query()
-    #
-    # file_name = "q" + str(Q_NUM) + ".out"
-    # export_df(result, file_name)
+
+    return result
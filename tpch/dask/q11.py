@@ -1,32 +1,29 @@
-import pyperf
-
 from dask import dataframe as dd
-from dask.distributed import Client
 from tpch.utils import (
     get_part_supp_ds,
     get_supplier_ds,
     get_nation_ds,
-    export_df,
+    get_table_rows,
 )
 
 Q_NUM = 11
 
 
 def get_ds():
-    partsupp = get_part_supp_ds("dask")
-    supplier = get_supplier_ds("dask")
-    nation = get_nation_ds("dask")
+    partsupp = get_part_supp_ds(
+        "dask", columns=["ps_partkey", "ps_suppkey", "ps_availqty", "ps_supplycost"]
+    )
+    supplier = get_supplier_ds("dask", columns=["s_suppkey", "s_nationkey"])
+    nation = get_nation_ds("dask", columns=["n_nationkey", "n_name"])
 
     return partsupp, supplier, nation
 
 
-def query() -> dd.DataFrame:
-    partsupp, supplier, nation = get_ds()
-
+def query(partsupp, supplier, nation) -> dd.DataFrame:
     var1 = "GERMANY"
 
-    # Get supplier count and handle potential divide-by-zero
-    supplier_count = supplier.shape[0].compute()
+    # Get supplier count from the table metadata, without reading it
+    supplier_count = get_table_rows("supplier")
     # FRACTION is chosen as 0.0001 / SF
     # S_SUPPKEY identifier SF*10,000 are populated
     sumres_rate = 0.0001 / (supplier_count / 10000)
@@ -48,7 +45,7 @@ def query() -> dd.DataFrame:
     grouped = filtered_data.groupby("ps_partkey")
     agg_result = grouped.agg({"value": "sum"}).reset_index()
 
-    total_value_sum = agg_result["value"].sum().compute()
+    total_value_sum = agg_result["value"].sum()
     threshold = total_value_sum * sumres_rate
 
     # Filter by threshold and sort
@@ -57,24 +54,4 @@ def query() -> dd.DataFrame:
         by=["value", "ps_partkey"], ascending=[False, True]
     ).reset_index(drop=True)
 
-    return sorted_result.compute()
-
-
-def bench_q11():
-    t0 = pyperf.perf_counter()
-    query()
-    return pyperf.perf_counter() - t0
-
-
-if __name__ == "__main__":
-    client = Client()
-    print(client.scheduler_info)
-    runner = pyperf.Runner()
-    runner.argparser.set_defaults(
-        quiet=False, loops=1, values=1, processes=1, warmups=0
-    )
-    runner.bench_func("dask-q11", bench_q11)
-    # result = query()
-    #
-    # file_name = "q" + str(Q_NUM) + ".out"
-    # export_df(result, file_name)
+    return sorted_result
@@ -1,27 +1,35 @@
-import pyperf
-
 from datetime import date
 from dask import dataframe as dd
-from dask.distributed import Client
 from tpch.utils import (
     get_line_item_ds,
     get_orders_ds,
-    export_df,
 )
 
 Q_NUM = 12
 
 
 def get_ds():
-    lineitem = get_line_item_ds("dask")
-    orders = get_orders_ds("dask")
+    lineitem = get_line_item_ds(
+        "dask",
+        columns=[
+            "l_orderkey",
+            "l_shipdate",
+            "l_commitdate",
+            "l_receiptdate",
+            "l_shipmode",
+        ],
+        filters=[
+            ("l_receiptdate", ">=", date(1994, 1, 1)),
+            ("l_receiptdate", "<", date(1995, 1, 1)),
+            ("l_shipmode", "in", ["MAIL", "SHIP"]),
+        ],
+    )
+    orders = get_orders_ds("dask", columns=["o_orderkey", "o_orderpriority"])
 
     return lineitem, orders
 
 
-def query() -> dd.DataFrame:
-    lineitem, orders = get_ds()
-
+def query(lineitem, orders) -> dd.DataFrame:
     var1 = "MAIL"
     var2 = "SHIP"
     var3 = date(1994, 1, 1)
@@ -63,24 +71,4 @@ def query() -> dd.DataFrame:
     # Sort by l_shipmode
     sorted_result = final_result.sort_values(by="l_shipmode").reset_index(drop=True)
 
-    return sorted_result.compute()
-
-
-def bench_q12():
-    t0 = pyperf.perf_counter()
-    query()
-    return pyperf.perf_counter() - t0
-
-
-if __name__ == "__main__":
-    client = Client()
-    print(client.scheduler_info)
-    runner = pyperf.Runner()
-    runner.argparser.set_defaults(
-        quiet=False, loops=1, values=1, processes=1, warmups=0
-    )
-    runner.bench_func("dask-q12", bench_q12)
-    # result = query()
-    #
-    # file_name = "q" + str(Q_NUM) + ".out"
-    # export_df(result, file_name)
+    return sorted_result
@@ -1,30 +1,25 @@
-import pyperf
-
 from dask import dataframe as dd
-from dask.distributed import Client
 from tpch.utils import (
     get_customer_ds,
     get_orders_ds,
-    export_df,
 )
+from tpch.ops import like
 
 Q_NUM = 13
 
 
 def get_ds():
-    customer = get_customer_ds("dask")
-    orders = get_orders_ds("dask")
+    customer = get_customer_ds("dask", columns=["c_custkey"])
+    orders = get_orders_ds("dask", columns=["o_orderkey", "o_custkey", "o_comment"])
 
     return customer, orders
 
 
-def query() -> dd.DataFrame:
-    customer, orders = get_ds()
-
+def query(customer, orders) -> dd.DataFrame:
     var1 = "special"
     var2 = "requests"
 
-    orders = orders[~orders["o_comment"].str.contains(f"{var1}.*{var2}", regex=True)]
+    orders = orders[~like(orders["o_comment"], f"%{var1}%{var2}%")]
 
     # Left merge to include customers without orders
     merged_data = customer.merge(
@@ -52,24 +47,4 @@ def query() -> dd.DataFrame:
         by=["custdist", "c_count"], ascending=[False, False]
     ).reset_index(drop=True)
 
-    return sorted_result.compute()
-
-
-def bench_q13():
-    t0 = pyperf.perf_counter()
-    query()
-    return pyperf.perf_counter() - t0
-
-
-if __name__ == "__main__":
-    client = Client()
-    print(client.scheduler_info)
-    runner = pyperf.Runner()
-    runner.argparser.set_defaults(
-        quiet=False, loops=1, values=1, processes=1, warmups=0
-    )
-    runner.bench_func("dask-q13", bench_q13)
-    # result = query()
-    #
-    # file_name = "q" + str(Q_NUM) + ".out"
-    # export_df(result, file_name)
+    return sorted_result
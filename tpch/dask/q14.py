@@ -1,27 +1,30 @@
-import pyperf
-import pandas as pd
-
+from dask import dataframe as dd
 from datetime import date
-from dask.distributed import Client
 from tpch.utils import (
     get_line_item_ds,
     get_part_ds,
-    export_df,
 )
+from tpch.ops import like, one_row
 
 Q_NUM = 14
 
 
 def get_ds():
-    lineitem = get_line_item_ds("dask")
-    part = get_part_ds("dask")
+    lineitem = get_line_item_ds(
+        "dask",
+        columns=["l_partkey", "l_extendedprice", "l_discount", "l_shipdate"],
+        filters=[
+            ("l_shipdate", ">=", date(1995, 9, 1)),
+            ("l_shipdate", "<", date(1995, 10, 1)),
+        ],
+        clustered=True,
+    )
+    part = get_part_ds("dask", columns=["p_partkey", "p_type"])
 
     return lineitem, part
 
 
-def query() -> pd.DataFrame:
-    lineitem, part = get_ds()
-
+def query(lineitem, part) -> dd.DataFrame:
     var1 = date(1995, 9, 1)
     var2 = date(1995, 10, 1)
 
@@ -37,33 +40,10 @@ def query() -> pd.DataFrame:
         1 - filtered_data["l_discount"]
     )
 
-    filtered_data["is_promo"] = filtered_data["p_type"].str.startswith("PROMO")
-    computed_data = filtered_data.compute()
-    promo_revenue = computed_data[computed_data["is_promo"]]["revenue"].sum()
-    total_revenue = computed_data["revenue"].sum()
+    filtered_data["is_promo"] = like(filtered_data["p_type"], "PROMO%")
+    promo_revenue = filtered_data[filtered_data["is_promo"]]["revenue"].sum()
+    total_revenue = filtered_data["revenue"].sum()
 
     promo_percentage = 100.00 * promo_revenue / total_revenue
 
-    result = pd.DataFrame({"promo_revenue": [round(promo_percentage, 2)]})
-
-    return result
-
-
-def bench_q14():
-    t0 = pyperf.perf_counter()
-    query()
-    return pyperf.perf_counter() - t0
-
-
-if __name__ == "__main__":
-    client = Client()
-    print(client.scheduler_info)
-    runner = pyperf.Runner()
-    runner.argparser.set_defaults(
-        quiet=False, loops=1, values=1, processes=1, warmups=0
-    )
-    runner.bench_func("dask-q14", bench_q14)
-    # result = query()
-    #
-    # file_name = "q" + str(Q_NUM) + ".out"
-    # export_df(result, file_name)
+    return one_row(promo_revenue=promo_percentage).round(2)
@@ -1,27 +1,31 @@
-import pyperf
-
 from datetime import date
 from dask import dataframe as dd
-from dask.distributed import Client
 from tpch.utils import (
     get_supplier_ds,
     get_line_item_ds,
-    export_df,
 )
 
 Q_NUM = 15
 
 
 def get_ds():
-    supplier = get_supplier_ds("dask")
-    lineitem = get_line_item_ds("dask")
+    supplier = get_supplier_ds(
+        "dask", columns=["s_suppkey", "s_name", "s_address", "s_phone"]
+    )
+    lineitem = get_line_item_ds(
+        "dask",
+        columns=["l_suppkey", "l_extendedprice", "l_discount", "l_shipdate"],
+        filters=[
+            ("l_shipdate", ">=", date(1996, 1, 1)),
+            ("l_shipdate", "<", date(1996, 4, 1)),
+        ],
+        clustered=True,
+    )
 
     return supplier, lineitem
 
 
-def query() -> dd.DataFrame:
-    supplier, lineitem = get_ds()
-
+def query(supplier, lineitem) -> dd.DataFrame:
     var1 = date(1996, 1, 1)
     var2 = date(1996, 4, 1)
 
@@ -42,13 +46,10 @@ def query() -> dd.DataFrame:
         .reset_index()
     )
 
-    computed_revenue = revenue.compute()
-    max_revenue = computed_revenue["total_revenue"].max()
+    max_revenue = revenue["total_revenue"].max()
 
     # Filter suppliers with maximum revenue
-    max_revenue_suppliers = computed_revenue[
-        computed_revenue["total_revenue"] == max_revenue
-    ]
+    max_revenue_suppliers = revenue[revenue["total_revenue"] == max_revenue]
 
     # Merge with supplier information
     result = (
@@ -60,24 +61,4 @@ def query() -> dd.DataFrame:
         .reset_index(drop=True)
     )
 
-    return result.compute()
-
-
-def bench_q15():
-    t0 = pyperf.perf_counter()
-    query()
-    return pyperf.perf_counter() - t0
-
-
-if __name__ == "__main__":
-    client = Client()
-    print(client.scheduler_info)
-    runner = pyperf.Runner()
-    runner.argparser.set_defaults(
-        quiet=False, loops=1, values=1, processes=1, warmups=0
-    )
-    runner.bench_func("dask-q15", bench_q15)
-    # result = query()
-    #
-    # file_name = "q" + str(Q_NUM) + ".out"
-    # export_df(result, file_name)
+    return result
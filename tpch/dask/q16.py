@@ -1,37 +1,32 @@
-import pyperf
-
 from dask import dataframe as dd
-from dask.distributed import Client
 from tpch.utils import (
     get_supplier_ds,
     get_part_supp_ds,
     get_part_ds,
-    export_df,
 )
+from tpch.ops import like
 
 Q_NUM = 16
 
 
 def get_ds():
-    supplier = get_supplier_ds("dask")
-    partsupp = get_part_supp_ds("dask")
-    part = get_part_ds("dask")
+    supplier = get_supplier_ds("dask", columns=["s_suppkey", "s_comment"])
+    partsupp = get_part_supp_ds("dask", columns=["ps_partkey", "ps_suppkey"])
+    part = get_part_ds("dask", columns=["p_partkey", "p_brand", "p_type", "p_size"])
 
     return supplier, partsupp, part
 
 
-def query() -> dd.DataFrame:
-    supplier, partsupp, part = get_ds()
-
+def query(supplier, partsupp, part) -> dd.DataFrame:
     var1 = "Brand#45"
 
     # Filter suppliers with complaints
     complaint_suppliers = supplier[
-        supplier["s_comment"].str.contains(".*Customer.*Complaints.*")
+        like(supplier["s_comment"], "%Customer%Complaints%")
     ][["s_suppkey"]]
     filtered_parts = part[
         (part["p_brand"] != var1)
-        & (~part["p_type"].str.startswith("MEDIUM POLISHED"))
+        & (~like(part["p_type"], "MEDIUM POLISHED%"))
         & (part["p_size"].isin([49, 14, 23, 45, 19, 3, 36, 9]))
     ]
 
@@ -58,24 +53,4 @@ def query() -> dd.DataFrame:
         ascending=[False, True, True, True],
     ).reset_index(drop=True)
 
-    return result.compute()
-
-
-def bench_q16():
-    t0 = pyperf.perf_counter()
-    query()
-    return pyperf.perf_counter() - t0
-
-
-if __name__ == "__main__":
-    client = Client()
-    print(client.scheduler_info)
-    runner = pyperf.Runner()
-    runner.argparser.set_defaults(
-        quiet=False, loops=1, values=1, processes=1, warmups=0
-    )
-    runner.bench_func("dask-q16", bench_q16)
-    # result = query()
-    #
-    # file_name = "q" + str(Q_NUM) + ".out"
-    # export_df(result, file_name)
+    return result
@@ -1,28 +1,26 @@
-import pyperf
 import pandas as pd
 
-from dask.distributed import Client
 from tpch.utils import (
     get_line_item_ds,
     get_customer_ds,
     get_orders_ds,
-    export_df,
 )
+from tpch.ops import prefilter, top_k
 
 Q_NUM = 18
 
 
 def get_ds():
-    lineitem = get_line_item_ds("dask")
-    customer = get_customer_ds("dask")
-    orders = get_orders_ds("dask")
+    lineitem = get_line_item_ds("dask", columns=["l_orderkey", "l_quantity"])
+    customer = get_customer_ds("dask", columns=["c_custkey", "c_name"])
+    orders = get_orders_ds(
+        "dask", columns=["o_orderkey", "o_custkey", "o_totalprice", "o_orderdate"]
+    )
 
     return lineitem, customer, orders
 
 
-def query() -> pd.DataFrame:
-    lineitem, customer, orders = get_ds()
-
+def query(lineitem, customer, orders) -> pd.DataFrame:
     var1 = 300
 
     # Aggregate lineitem quantities by order key
@@ -38,8 +36,12 @@ def query() -> pd.DataFrame:
     # Join with orders
     result = (
         orders.merge(large_quantity_orders, left_on="o_orderkey", right_on="l_orderkey")
-        # Join with lineitem for quantities
-        .merge(lineitem, left_on="o_orderkey", right_on="l_orderkey")
+        # Join with the lines of these orders only for quantities
+        .merge(
+            prefilter(lineitem, large_quantity_orders, on="l_orderkey"),
+            left_on="o_orderkey",
+            right_on="l_orderkey",
+        )
         # Join with customer data
         .merge(customer, left_on="o_custkey", right_on="c_custkey")
     )
@@ -51,30 +53,9 @@ def query() -> pd.DataFrame:
         )
         .agg(col6=("l_quantity", "sum"))
         .reset_index()
-        .sort_values(["o_totalprice", "o_orderdate"], ascending=[False, True])
+        .pipe(top_k, 100, ["o_totalprice", "o_orderdate"], ascending=[False, True])
         .rename(columns={"o_orderdate": "o_orderdat"})
         .astype({"col6": "float64"})
-        .head(100)
     )
 
     return final_result
-
-
-def bench_q18():
-    t0 = pyperf.perf_counter()
-    query()
-    return pyperf.perf_counter() - t0
-
-
-if __name__ == "__main__":
-    client = Client()
-    print(client.scheduler_info)
-    runner = pyperf.Runner()
-    runner.argparser.set_defaults(
-        quiet=False, loops=1, values=1, processes=1, warmups=0
-    )
-    runner.bench_func("dask-q18", bench_q18)
-    # result = query()
-    #
-    # file_name = "q" + str(Q_NUM) + ".out"
-    # export_df(result, file_name)
@@ -1,26 +1,33 @@
-import pyperf
-import pandas as pd
-
-from dask.distributed import Client
+from dask import dataframe as dd
 from tpch.utils import (
     get_line_item_ds,
     get_part_ds,
-    export_df,
 )
+from tpch.ops import one_row
 
 Q_NUM = 19
 
 
 def get_ds():
-    lineitem = get_line_item_ds("dask")
-    part = get_part_ds("dask")
+    lineitem = get_line_item_ds(
+        "dask",
+        columns=[
+            "l_partkey",
+            "l_quantity",
+            "l_extendedprice",
+            "l_discount",
+            "l_shipinstruct",
+            "l_shipmode",
+        ],
+    )
+    part = get_part_ds(
+        "dask", columns=["p_partkey", "p_brand", "p_size", "p_container"]
+    )
 
     return lineitem, part
 
 
-def query() -> pd.DataFrame:
-    lineitem, part = get_ds()
-
+def query(lineitem, part) -> dd.DataFrame:
     merged = part.merge(lineitem, left_on="p_partkey", right_on="l_partkey")
 
     base_cond = (merged["l_shipmode"].isin(["AIR", "AIR REG"])) & (
@@ -59,26 +66,6 @@ def query() -> pd.DataFrame:
 
     # Calculate the revenue
     revenue = filtered["l_extendedprice"] * (1 - filtered["l_discount"])
-    total_revenue = revenue.sum().compute()
-
-    return pd.DataFrame({"revenue": [total_revenue]})
+    total_revenue = revenue.sum()
 
-
-def bench_q19():
-    t0 = pyperf.perf_counter()
-    query()
-    return pyperf.perf_counter() - t0
-
-
-if __name__ == "__main__":
-    client = Client()
-    print(client.scheduler_info)
-    runner = pyperf.Runner()
-    runner.argparser.set_defaults(
-        quiet=False, loops=1, values=1, processes=1, warmups=0
-    )
-    runner.bench_func("dask-q19", bench_q19)
-    # result = query()
-    #
-    # file_name = "q" + str(Q_NUM) + ".out"
-    # export_df(result, file_name)
+    return one_row(revenue=total_revenue)
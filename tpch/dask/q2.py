@@ -1,43 +1,68 @@
-import pyperf
 import tpch.utils as utils
 
 from dask import dataframe as dd
-from dask.distributed import Client
+from tpch.ops import group_broadcast, like, shared, top_k
+from tpch.planner import join
 
 Q_NUM = 2
 
 
 def get_ds():
-    region_ds = utils.get_region_ds("dask")
-    nation_ds = utils.get_nation_ds("dask")
-    supplier_ds = utils.get_supplier_ds("dask")
-    part_ds = utils.get_part_ds("dask")
-    part_supp_ds = utils.get_part_supp_ds("dask")
+    region_ds = utils.get_region_ds("dask", columns=["r_regionkey", "r_name"])
+    nation_ds = utils.get_nation_ds(
+        "dask", columns=["n_nationkey", "n_name", "n_regionkey"]
+    )
+    supplier_ds = utils.get_supplier_ds(
+        "dask",
+        columns=[
+            "s_suppkey",
+            "s_name",
+            "s_address",
+            "s_nationkey",
+            "s_phone",
+            "s_acctbal",
+            "s_comment",
+        ],
+    )
+    part_ds = utils.get_part_ds(
+        "dask", columns=["p_partkey", "p_mfgr", "p_type", "p_size"]
+    )
+    part_supp_ds = utils.get_part_supp_ds(
+        "dask", columns=["ps_partkey", "ps_suppkey", "ps_supplycost"]
+    )
 
     return region_ds, nation_ds, supplier_ds, part_ds, part_supp_ds
 
 
-def query() -> dd.DataFrame:
-    region_ds, nation_ds, supplier_ds, part_ds, part_supp_ds = get_ds()
-
+def query(region_ds, nation_ds, supplier_ds, part_ds, part_supp_ds) -> dd.DataFrame:
     var1 = 15
     var2 = "BRASS"
     var3 = "EUROPE"
 
-    jn = (
-        part_ds.merge(part_supp_ds, left_on="p_partkey", right_on="ps_partkey")
-        .merge(supplier_ds, left_on="ps_suppkey", right_on="s_suppkey")
-        .merge(nation_ds, left_on="s_nationkey", right_on="n_nationkey")
-        .merge(region_ds, left_on="n_regionkey", right_on="r_regionkey")
+    jn = join(
+        {
+            "part": part_ds,
+            "partsupp": part_supp_ds,
+            "supplier": supplier_ds,
+            "nation": nation_ds,
+            "region": region_ds,
+        },
+        joins=[
+            ("part", "p_partkey", "partsupp", "ps_partkey"),
+            ("partsupp", "ps_suppkey", "supplier", "s_suppkey"),
+            ("supplier", "s_nationkey", "nation", "n_nationkey"),
+            ("nation", "n_regionkey", "region", "r_regionkey"),
+        ],
+        filters={
+            "part": lambda df: (df["p_size"] == var1) & like(df["p_type"], f"%{var2}"),
+            "region": lambda df: df["r_name"] == var3,
+        },
     )
 
-    jn = jn[jn["p_size"] == var1]
-    jn = jn[jn["p_type"].str.endswith(var2)]
-    jn = jn[jn["r_name"] == var3]
-
-    gb = jn.groupby("p_partkey")
-    agg = gb["ps_supplycost"].min().reset_index()
-    jn2 = agg.merge(jn, on=["p_partkey", "ps_supplycost"])
+    # Read by both the group-by and the lookup of its groups
+    jn = shared(jn)
+    jn = group_broadcast(jn, "p_partkey", "ps_supplycost", "min", "min_cost")
+    jn2 = jn[jn["ps_supplycost"] == jn["min_cost"]]
 
     sel = jn2.loc[
         :,
@@ -53,30 +78,11 @@ def query() -> dd.DataFrame:
         ],
     ]
 
-    sort = sel.sort_values(
+    result_df = top_k(
+        sel,
+        100,
         by=["s_acctbal", "n_name", "s_name", "p_partkey"],
         ascending=[False, True, True, True],
     )
-    result_df = sort.head(100)
 
     return result_df  # type: ignore[no-any-return]
-
-
-def bench_q2():
-    t0 = pyperf.perf_counter()
-    query()
-    return pyperf.perf_counter() - t0
-
-
-if __name__ == "__main__":
-    client = Client()
-    print(client.scheduler_info)
-    runner = pyperf.Runner()
-    runner.argparser.set_defaults(
-        quiet=False, loops=1, values=1, processes=1, warmups=0
-    )
-    runner.bench_func("dask-q2", bench_q2)
-    # result = query()
-    #
-    # file_name = "q" + str(Q_NUM) + ".out"
-    # export_df(result, file_name)
@@ -1,33 +1,39 @@
-import pyperf
-import pandas as pd
-
+from dask import dataframe as dd
 from datetime import date
-from dask.distributed import Client
 from tpch.utils import (
     get_line_item_ds,
     get_nation_ds,
     get_supplier_ds,
     get_part_supp_ds,
     get_part_ds,
-    export_df,
 )
+from tpch.ops import like, semi_join
 
 Q_NUM = 20
 
 
 def get_ds():
-    lineitem = get_line_item_ds("dask")
-    nation = get_nation_ds("dask")
-    supplier = get_supplier_ds("dask")
-    partsupp = get_part_supp_ds("dask")
-    part = get_part_ds("dask")
+    lineitem = get_line_item_ds(
+        "dask",
+        columns=["l_partkey", "l_suppkey", "l_quantity", "l_shipdate"],
+        filters=[
+            ("l_shipdate", ">=", date(1994, 1, 1)),
+            ("l_shipdate", "<", date(1995, 1, 1)),
+        ],
+    )
+    nation = get_nation_ds("dask", columns=["n_nationkey", "n_name"])
+    supplier = get_supplier_ds(
+        "dask", columns=["s_suppkey", "s_name", "s_address", "s_nationkey"]
+    )
+    partsupp = get_part_supp_ds(
+        "dask", columns=["ps_partkey", "ps_suppkey", "ps_availqty"]
+    )
+    part = get_part_ds("dask", columns=["p_partkey", "p_name"])
 
     return lineitem, nation, supplier, partsupp, part
 
 
-def query() -> pd.DataFrame:
-    lineitem, nation, supplier, partsupp, part = get_ds()
-
+def query(lineitem, nation, supplier, partsupp, part) -> dd.DataFrame:
     var1 = date(1994, 1, 1)
     var2 = date(1995, 1, 1)
     var3 = "CANADA"
@@ -43,50 +49,32 @@ def query() -> pd.DataFrame:
         .agg(sum_quantity=("l_quantity", "sum"))
         .reset_index()
         .assign(sum_quantity=lambda df: df["sum_quantity"] * 0.5)
-        .compute()
     )
 
     # Filter
-    filtered_parts = part[part["p_name"].str.startswith(var4)]
-    nation_supplier = (
-        nation[nation["n_name"] == var3]
-        .merge(supplier, left_on="n_nationkey", right_on="s_nationkey")
-        .compute()
+    filtered_parts = part[like(part["p_name"], f"{var4}%")]
+    nation_supplier = nation[nation["n_name"] == var3].merge(
+        supplier, left_on="n_nationkey", right_on="s_nationkey"
     )
 
-    parts_partsupp = filtered_parts.merge(
-        partsupp, left_on="p_partkey", right_on="ps_partkey"
-    ).compute()
-
-    result = (
-        parts_partsupp.merge(
-            agg_lineitem,
-            left_on=["ps_partkey", "ps_suppkey"],
-            right_on=["l_partkey", "l_suppkey"],
-        )[lambda df: df["ps_availqty"] > df["sum_quantity"]]
-        .drop_duplicates(subset=["ps_suppkey"])
-        .merge(nation_supplier, left_on="ps_suppkey", right_on="s_suppkey")
-        .sort_values("s_name")[["s_name", "s_address"]]
+    forest_partsupp = semi_join(
+        partsupp, filtered_parts, left_on="ps_partkey", right_on="p_partkey"
     )
 
-    return result
-
-
-def bench_q20():
-    t0 = pyperf.perf_counter()
-    query()
-    return pyperf.perf_counter() - t0
+    partsupp_quantity = forest_partsupp.merge(
+        agg_lineitem,
+        left_on=["ps_partkey", "ps_suppkey"],
+        right_on=["l_partkey", "l_suppkey"],
+    )
+    available_partsupp = partsupp_quantity[
+        partsupp_quantity["ps_availqty"] > partsupp_quantity["sum_quantity"]
+    ]
 
+    result = semi_join(
+        nation_supplier,
+        available_partsupp,
+        left_on="s_suppkey",
+        right_on="ps_suppkey",
+    ).sort_values("s_name")[["s_name", "s_address"]]
 
-if __name__ == "__main__":
-    client = Client()
-    print(client.scheduler_info)
-    runner = pyperf.Runner()
-    runner.argparser.set_defaults(
-        quiet=False, loops=1, values=1, processes=1, warmups=0
-    )
-    runner.bench_func("dask-q20", bench_q20)
-    # result = query()
-    #
-    # file_name = "q" + str(Q_NUM) + ".out"
-    # export_df(result, file_name)
+    return result
@@ -1,92 +1,81 @@
-import pyperf
-import pandas as pd
+from dask import dataframe as dd
 
-from dask.distributed import Client
 from tpch.utils import (
     get_line_item_ds,
     get_orders_ds,
     get_nation_ds,
     get_supplier_ds,
-    export_df,
 )
+from tpch.ops import prefilter, semi_join, shared, top_k
 
 Q_NUM = 21
 
 
 def get_ds():
-    lineitem = get_line_item_ds("dask")
-    orders = get_orders_ds("dask")
-    nation = get_nation_ds("dask")
-    supplier = get_supplier_ds("dask")
+    lineitem = get_line_item_ds(
+        "dask", columns=["l_orderkey", "l_suppkey", "l_commitdate", "l_receiptdate"]
+    )
+    orders = get_orders_ds("dask", columns=["o_orderkey", "o_orderstatus"])
+    nation = get_nation_ds("dask", columns=["n_nationkey", "n_name"])
+    supplier = get_supplier_ds("dask", columns=["s_suppkey", "s_name", "s_nationkey"])
 
     return lineitem, orders, nation, supplier
 
 
-def query() -> pd.DataFrame:
-    lineitem, orders, nation, supplier = get_ds()
-
+def query(lineitem, orders, nation, supplier) -> dd.DataFrame:
     var1 = "SAUDI ARABIA"
 
     # Filter
     filtered_nation = nation[nation["n_name"] == var1]
     filtered_orders = orders[orders["o_orderstatus"] == "F"]
-    late_delivery = lineitem[lineitem["l_receiptdate"] > lineitem["l_commitdate"]]
-
-    # Find orders with multiple suppliers
-    multi_supp_orders = (
-        lineitem.groupby("l_orderkey")
-        .l_suppkey.nunique()
-        .to_frame(name="n_supp_by_order")
-        .reset_index()
-        .persist()  # Mark for caching without computing immediately
+    # Only the lines of the F orders are grouped. They are persisted, as both
+    # the group-by and the late lines read them.
+    lineitem = shared(
+        prefilter(
+            lineitem, filtered_orders, left_on="l_orderkey", right_on="o_orderkey"
+        )
+    )
+    is_late = lineitem["l_receiptdate"] > lineitem["l_commitdate"]
+    late_delivery = lineitem[is_late]
+    suppliers = semi_join(
+        supplier, filtered_nation, left_on="s_nationkey", right_on="n_nationkey"
     )
 
-    multi_supp_filtered = multi_supp_orders[multi_supp_orders["n_supp_by_order"] > 1]
-
-    q1 = multi_supp_filtered.merge(late_delivery, on="l_orderkey").persist()
-
-    q1_agg = (
-        q1.groupby("l_orderkey")
-        .l_suppkey.nunique()
-        .to_frame(name="n_supp_by_order_left")
+    # Find orders with multiple suppliers, of which a single one was late, in
+    # one group-by: an order has several (late) suppliers when their smallest
+    # and largest keys differ
+    supp_range = (
+        lineitem.assign(late_suppkey=lineitem["l_suppkey"].where(is_late))
+        .groupby("l_orderkey")
+        .agg(
+            min_supp=("l_suppkey", "min"),
+            max_supp=("l_suppkey", "max"),
+            min_late_supp=("late_suppkey", "min"),
+            max_late_supp=("late_suppkey", "max"),
+        )
         .reset_index()
     )
-
-    result = (
-        q1_agg.merge(q1, on="l_orderkey")
-        .merge(supplier.compute(), left_on="l_suppkey", right_on="s_suppkey")
-        .merge(filtered_nation.compute(), left_on="s_nationkey", right_on="n_nationkey")
-        .merge(filtered_orders.compute(), left_on="l_orderkey", right_on="o_orderkey")
+    waiting_orders = supp_range[
+        (supp_range["min_supp"] != supp_range["max_supp"])
+        & (supp_range["min_late_supp"] == supp_range["max_late_supp"])
+    ]
+
+    # Only the keys of the orders are sent to the partitions of the late lines
+    waiting = semi_join(
+        late_delivery, suppliers, left_on="l_suppkey", right_on="s_suppkey"
+    )
+    waiting = semi_join(
+        waiting, filtered_orders, left_on="l_orderkey", right_on="o_orderkey"
     )
+    waiting = semi_join(waiting, waiting_orders, on="l_orderkey")
 
-    # Apply the filter, group, and sort
+    # Group and sort
     result = (
-        result[result["n_supp_by_order_left"] == 1]
+        waiting.merge(suppliers, left_on="l_suppkey", right_on="s_suppkey")
         .groupby("s_name")
         .agg(numwait=("l_suppkey", "count"))
         .reset_index()
-        .sort_values(["numwait", "s_name"], ascending=[False, True])
-        .head(100)
+        .pipe(top_k, 100, ["numwait", "s_name"], ascending=[False, True])
     )
 
     return result
-
-
-def bench_q21():
-    t0 = pyperf.perf_counter()
-    query()
-    return pyperf.perf_counter() - t0
-
-
-if __name__ == "__main__":
-    client = Client()
-    print(client.scheduler_info)
-    runner = pyperf.Runner()
-    runner.argparser.set_defaults(
-        quiet=False, loops=1, values=1, processes=1, warmups=0
-    )
-    runner.bench_func("dask-q21", bench_q21)
-    # result = query()
-    #
-    # file_name = "q" + str(Q_NUM) + ".out"
-    # export_df(result, file_name)
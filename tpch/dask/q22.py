@@ -1,26 +1,22 @@
-import pyperf
-import pandas as pd
+from dask import dataframe as dd
 
-from dask.distributed import Client
 from tpch.utils import (
     get_customer_ds,
     get_orders_ds,
-    export_df,
 )
+from tpch.ops import anti_join
 
 Q_NUM = 22
 
 
 def get_ds():
-    customer = get_customer_ds("dask")
-    orders = get_orders_ds("dask")
+    customer = get_customer_ds("dask", columns=["c_custkey", "c_phone", "c_acctbal"])
+    orders = get_orders_ds("dask", columns=["o_custkey"])
 
     return customer, orders
 
 
-def query() -> pd.DataFrame:
-    customer, orders = get_ds()
-
+def query(customer, orders) -> dd.DataFrame:
     # Extract country code and filter by specific codes
     filtered_customers = customer.assign(
         cntrycode=customer["c_phone"].str.slice(0, 2)
@@ -30,20 +26,11 @@ def query() -> pd.DataFrame:
 
     positive_balance = filtered_customers[filtered_customers["c_acctbal"] > 0.0]
 
-    avg_balance = positive_balance["c_acctbal"].mean().compute()
-
-    # Get unique customer keys from orders
-    orders_unique_customers = orders[["o_custkey"]].drop_duplicates()
+    avg_balance = positive_balance["c_acctbal"].mean()
 
-    # Perform left join
+    # Customers without orders
     result = (
-        filtered_customers.merge(
-            orders_unique_customers,
-            left_on="c_custkey",
-            right_on="o_custkey",
-            how="left",
-        )
-        .pipe(lambda df: df[df["o_custkey"].isna()])
+        anti_join(filtered_customers, orders, left_on="c_custkey", right_on="o_custkey")
         .pipe(lambda df: df[df["c_acctbal"] > avg_balance])
         .groupby("cntrycode")
         .agg(numcust=("c_acctbal", "count"), totacctbal=("c_acctbal", "sum"))
@@ -51,24 +38,4 @@ def query() -> pd.DataFrame:
         .sort_values("cntrycode")
     )
 
-    return result.compute()
-
-
-def bench_q22():
-    t0 = pyperf.perf_counter()
-    query()
-    return pyperf.perf_counter() - t0
-
-
-if __name__ == "__main__":
-    client = Client()
-    print(client.scheduler_info)
-    runner = pyperf.Runner()
-    runner.argparser.set_defaults(
-        quiet=False, loops=1, values=1, processes=1, warmups=0
-    )
-    runner.bench_func("dask-q22", bench_q22)
-    # result = query()
-    #
-    # file_name = "q" + str(Q_NUM) + ".out"
-    # export_df(result, file_name)
+    return result
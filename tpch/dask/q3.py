@@ -1,29 +1,36 @@
-import pyperf
-
 from datetime import date
 from dask import dataframe as dd
-from dask.distributed import Client
 from tpch.utils import (
     get_customer_ds,
     get_line_item_ds,
     get_orders_ds,
-    export_df,
 )
+from tpch.ops import top_k
 
 Q_NUM = 3
 
 
 def get_ds():
-    customer_ds = get_customer_ds("dask")
-    line_item_ds = get_line_item_ds("dask")
-    orders_ds = get_orders_ds("dask")
+    customer_ds = get_customer_ds(
+        "dask",
+        columns=["c_custkey", "c_mktsegment"],
+        filters=[("c_mktsegment", "==", "BUILDING")],
+    )
+    line_item_ds = get_line_item_ds(
+        "dask",
+        columns=["l_orderkey", "l_extendedprice", "l_discount", "l_shipdate"],
+        filters=[("l_shipdate", ">", date(1995, 3, 15))],
+    )
+    orders_ds = get_orders_ds(
+        "dask",
+        columns=["o_orderkey", "o_custkey", "o_orderdate", "o_shippriority"],
+        filters=[("o_orderdate", "<", date(1995, 3, 15))],
+    )
 
     return customer_ds, line_item_ds, orders_ds
 
 
-def query() -> dd.DataFrame:
-    customer_ds, line_item_ds, orders_ds = get_ds()
-
+def query(customer_ds, line_item_ds, orders_ds) -> dd.DataFrame:
     var1 = "BUILDING"
     var2 = date(1995, 3, 15)
 
@@ -42,27 +49,6 @@ def query() -> dd.DataFrame:
     sel = agg.loc[:, ["o_orderkey", "revenue", "o_orderdate", "o_shippriority"]]
     sel = sel.rename(columns={"o_orderkey": "l_orderkey"})
 
-    sorted = sel.sort_values(by=["revenue", "o_orderdate"], ascending=[False, True])
-    result_df = sorted.head(10)
+    result_df = top_k(sel, 10, ["revenue", "o_orderdate"], ascending=[False, True])
 
     return result_df  # type: ignore[no-any-return]
-
-
-def bench_q3():
-    t0 = pyperf.perf_counter()
-    query()
-    return pyperf.perf_counter() - t0
-
-
-if __name__ == "__main__":
-    client = Client()
-    print(client.scheduler_info)
-    runner = pyperf.Runner()
-    runner.argparser.set_defaults(
-        quiet=False, loops=1, values=1, processes=1, warmups=0
-    )
-    runner.bench_func("dask-q3", bench_q3)
-    # result = query()
-    #
-    # file_name = "q" + str(Q_NUM) + ".out"
-    # export_df(result, file_name)
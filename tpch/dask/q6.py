@@ -1,26 +1,31 @@
-import pyperf
-import pandas as pd
-
 from datetime import date
 from dask import dataframe as dd
-from dask.distributed import Client
 from tpch.utils import (
     get_line_item_ds,
-    export_df,
 )
+from tpch.ops import one_row
 
 Q_NUM = 6
 
 
 def get_ds():
-    line_item_ds = get_line_item_ds("dask")
+    line_item_ds = get_line_item_ds(
+        "dask",
+        columns=["l_quantity", "l_extendedprice", "l_discount", "l_shipdate"],
+        filters=[
+            ("l_shipdate", ">=", date(1994, 1, 1)),
+            ("l_shipdate", "<", date(1995, 1, 1)),
+            ("l_discount", ">=", 0.05),
+            ("l_discount", "<=", 0.07),
+            ("l_quantity", "<", 24),
+        ],
+        clustered=True,
+    )
 
     return line_item_ds
 
 
-def query() -> dd.DataFrame:
-    line_item_ds = get_ds()
-
+def query(line_item_ds) -> dd.DataFrame:
     var1 = date(1994, 1, 1)
     var2 = date(1995, 1, 1)
     var3 = 0.05
@@ -32,27 +37,6 @@ def query() -> dd.DataFrame:
     ]
     filt = filt[(filt["l_discount"] >= var3) & (filt["l_discount"] <= var4)]
     filt = filt[filt["l_quantity"] < var5]
-    result_value = (filt["l_extendedprice"] * filt["l_discount"]).sum().compute()
-    result_df = pd.DataFrame({"revenue": [result_value]})
-
-    return result_df
+    result_value = (filt["l_extendedprice"] * filt["l_discount"]).sum()
 
-
-def bench_q6():
-    t0 = pyperf.perf_counter()
-    query()
-    return pyperf.perf_counter() - t0
-
-
-if __name__ == "__main__":
-    client = Client()
-    print(client.scheduler_info)
-    runner = pyperf.Runner()
-    runner.argparser.set_defaults(
-        quiet=False, loops=1, values=1, processes=1, warmups=0
-    )
-    runner.bench_func("dask-q6", bench_q6)
-    # result = query()
-    #
-    # file_name = "q" + str(Q_NUM) + ".out"
-    # export_df(result, file_name)
+    return one_row(revenue=result_value)
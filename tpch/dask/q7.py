@@ -1,27 +1,36 @@
-import pyperf
 import pandas as pd
 import tpch.utils as utils
 
 from datetime import date
 from dask import dataframe as dd
-from dask.distributed import Client
 
 Q_NUM = 7
 
 
 def get_ds():
-    nation_ds = utils.get_nation_ds("dask")
-    customer_ds = utils.get_customer_ds("dask")
-    line_item_ds = utils.get_line_item_ds("dask")
-    orders_ds = utils.get_orders_ds("dask")
-    supplier_ds = utils.get_supplier_ds("dask")
+    nation_ds = utils.get_nation_ds("dask", columns=["n_nationkey", "n_name"])
+    customer_ds = utils.get_customer_ds("dask", columns=["c_custkey", "c_nationkey"])
+    line_item_ds = utils.get_line_item_ds(
+        "dask",
+        columns=[
+            "l_orderkey",
+            "l_suppkey",
+            "l_extendedprice",
+            "l_discount",
+            "l_shipdate",
+        ],
+        filters=[
+            ("l_shipdate", ">=", date(1995, 1, 1)),
+            ("l_shipdate", "<=", date(1996, 12, 31)),
+        ],
+    )
+    orders_ds = utils.get_orders_ds("dask", columns=["o_orderkey", "o_custkey"])
+    supplier_ds = utils.get_supplier_ds("dask", columns=["s_suppkey", "s_nationkey"])
 
     return nation_ds, customer_ds, line_item_ds, orders_ds, supplier_ds
 
 
-def query() -> dd.DataFrame:
-    nation_ds, customer_ds, line_item_ds, orders_ds, supplier_ds = get_ds()
-
+def query(nation_ds, customer_ds, line_item_ds, orders_ds, supplier_ds) -> dd.DataFrame:
     var1 = "FRANCE"
     var2 = "GERMANY"
     var3 = date(1995, 1, 1)
@@ -31,21 +40,31 @@ def query() -> dd.DataFrame:
     n2 = nation_ds[(nation_ds["n_name"] == var2)]
 
     # Part 1
-    jn1 = customer_ds.merge(n1, left_on="c_nationkey", right_on="n_nationkey")
+    jn1 = customer_ds.merge(
+        n1, left_on="c_nationkey", right_on="n_nationkey", broadcast=True
+    )
     jn2 = jn1.merge(orders_ds, left_on="c_custkey", right_on="o_custkey")
     jn2 = jn2.rename(columns={"n_name": "cust_nation"})
-    jn3 = jn2.merge(line_item_ds, left_on="o_orderkey", right_on="l_orderkey")
-    jn4 = jn3.merge(supplier_ds, left_on="l_suppkey", right_on="s_suppkey")
-    jn5 = jn4.merge(n2, left_on="s_nationkey", right_on="n_nationkey")
+    # Only the lines of the suppliers of the other nation are shuffled
+    jn3 = supplier_ds.merge(n2, left_on="s_nationkey", right_on="n_nationkey")
+    jn4 = line_item_ds.merge(
+        jn3, left_on="l_suppkey", right_on="s_suppkey", broadcast=True
+    )
+    jn5 = jn2.merge(jn4, left_on="o_orderkey", right_on="l_orderkey")
     df1 = jn5.rename(columns={"n_name": "supp_nation"})
 
     # Part 2
-    jn1 = customer_ds.merge(n2, left_on="c_nationkey", right_on="n_nationkey")
+    jn1 = customer_ds.merge(
+        n2, left_on="c_nationkey", right_on="n_nationkey", broadcast=True
+    )
     jn2 = jn1.merge(orders_ds, left_on="c_custkey", right_on="o_custkey")
     jn2 = jn2.rename(columns={"n_name": "cust_nation"})
-    jn3 = jn2.merge(line_item_ds, left_on="o_orderkey", right_on="l_orderkey")
-    jn4 = jn3.merge(supplier_ds, left_on="l_suppkey", right_on="s_suppkey")
-    jn5 = jn4.merge(n1, left_on="s_nationkey", right_on="n_nationkey")
+    # Only the lines of the suppliers of the other nation are shuffled
+    jn3 = supplier_ds.merge(n1, left_on="s_nationkey", right_on="n_nationkey")
+    jn4 = line_item_ds.merge(
+        jn3, left_on="l_suppkey", right_on="s_suppkey", broadcast=True
+    )
+    jn5 = jn2.merge(jn4, left_on="o_orderkey", right_on="l_orderkey")
     df2 = jn5.rename(columns={"n_name": "supp_nation"})
 
     # Combine
@@ -60,24 +79,4 @@ def query() -> dd.DataFrame:
 
     result_df = agg.sort_values(by=["supp_nation", "cust_nation", "l_year"])
 
-    return result_df.compute()  # type: ignore[no-any-return]
-
-
-def bench_q7():
-    t0 = pyperf.perf_counter()
-    query()
-    return pyperf.perf_counter() - t0
-
-
-if __name__ == "__main__":
-    client = Client()
-    print(client.scheduler_info)
-    runner = pyperf.Runner()
-    runner.argparser.set_defaults(
-        quiet=False, loops=1, values=1, processes=1, warmups=0
-    )
-    runner.bench_func("dask-q7", bench_q7)
-    # result = query()
-    #
-    # file_name = "q" + str(Q_NUM) + ".out"
-    # export_df(result, file_name)
+    return result_df  # type: ignore[no-any-return]
@@ -1,28 +1,47 @@
-import pyperf
 import tpch.utils as utils
 
 from datetime import date
 from dask import dataframe as dd
-from dask.distributed import Client
+from tpch.planner import join
 
 Q_NUM = 8
 
 
 def get_ds():
-    customer = utils.get_customer_ds("dask")
-    orders = utils.get_orders_ds("dask")
-    lineitem = utils.get_line_item_ds("dask")
-    part = utils.get_part_ds("dask")
-    supplier = utils.get_supplier_ds("dask")
-    nation = utils.get_nation_ds("dask")
-    region = utils.get_region_ds("dask")
+    customer = utils.get_customer_ds("dask", columns=["c_custkey", "c_nationkey"])
+    orders = utils.get_orders_ds(
+        "dask",
+        columns=["o_orderkey", "o_custkey", "o_orderdate"],
+        filters=[
+            ("o_orderdate", ">=", date(1995, 1, 1)),
+            ("o_orderdate", "<=", date(1996, 12, 31)),
+        ],
+    )
+    lineitem = utils.get_line_item_ds(
+        "dask",
+        columns=[
+            "l_orderkey",
+            "l_partkey",
+            "l_suppkey",
+            "l_extendedprice",
+            "l_discount",
+        ],
+    )
+    part = utils.get_part_ds(
+        "dask",
+        columns=["p_partkey", "p_type"],
+        filters=[("p_type", "==", "ECONOMY ANODIZED STEEL")],
+    )
+    supplier = utils.get_supplier_ds("dask", columns=["s_suppkey", "s_nationkey"])
+    nation = utils.get_nation_ds(
+        "dask", columns=["n_nationkey", "n_name", "n_regionkey"]
+    )
+    region = utils.get_region_ds("dask", columns=["r_regionkey", "r_name"])
 
     return customer, orders, lineitem, part, supplier, nation, region
 
 
-def query() -> dd.DataFrame:
-    customer, orders, lineitem, part, supplier, nation, region = get_ds()
-
+def query(customer, orders, lineitem, part, supplier, nation, region) -> dd.DataFrame:
     var1 = "BRAZIL"
     var2 = "AMERICA"
     var3 = "ECONOMY ANODIZED STEEL"
@@ -32,33 +51,33 @@ def query() -> dd.DataFrame:
     n1 = nation[["n_nationkey", "n_regionkey"]]
     n2 = nation[["n_nationkey", "n_name"]]
 
-    # Chain of merges and filters
-    part_lineitem = part.merge(lineitem, left_on="p_partkey", right_on="l_partkey")
-    with_supplier = part_lineitem.merge(
-        supplier, left_on="l_suppkey", right_on="s_suppkey"
-    )
-    with_orders = with_supplier.merge(
-        orders, left_on="l_orderkey", right_on="o_orderkey"
-    )
-    with_customer = with_orders.merge(
-        customer, left_on="o_custkey", right_on="c_custkey"
-    )
-    with_nation1 = with_customer.merge(
-        n1, left_on="c_nationkey", right_on="n_nationkey"
-    )
-    with_region = with_nation1.merge(
-        region, left_on="n_regionkey", right_on="r_regionkey"
-    )
-
-    # Apply filters
-    filtered_by_region = with_region[with_region["r_name"] == var2]
-    with_nation2 = filtered_by_region.merge(
-        n2, left_on="s_nationkey", right_on="n_nationkey"
+    filtered_by_type = join(
+        {
+            "part": part,
+            "lineitem": lineitem,
+            "supplier": supplier,
+            "orders": orders,
+            "customer": customer,
+            "n1": n1,
+            "region": region,
+            "n2": n2,
+        },
+        joins=[
+            ("part", "p_partkey", "lineitem", "l_partkey"),
+            ("lineitem", "l_suppkey", "supplier", "s_suppkey"),
+            ("lineitem", "l_orderkey", "orders", "o_orderkey"),
+            ("orders", "o_custkey", "customer", "c_custkey"),
+            ("customer", "c_nationkey", "n1", "n_nationkey"),
+            ("n1", "n_regionkey", "region", "r_regionkey"),
+            ("supplier", "s_nationkey", "n2", "n_nationkey"),
+        ],
+        filters={
+            "part": lambda df: df["p_type"] == var3,
+            "orders": lambda df: (df["o_orderdate"] >= var4)
+            & (df["o_orderdate"] <= var5),
+            "region": lambda df: df["r_name"] == var2,
+        },
     )
-    filtered_by_date = with_nation2[
-        (with_nation2["o_orderdate"] <= var5) & (with_nation2["o_orderdate"] >= var4)
-    ]
-    filtered_by_type = filtered_by_date[filtered_by_date["p_type"] == var3]
 
     # Create computed columns
     filtered_by_type["volume"] = filtered_by_type["l_extendedprice"] * (
@@ -75,27 +94,6 @@ def query() -> dd.DataFrame:
 
     # Calculate final result and round
     agg["mkt_share"] = agg["case_volume"] / agg["volume"]
-    final_result = agg[["o_year", "mkt_share"]].round(2)
-
-    # Compute the final Dask dataframe to get a pandas dataframe
-    return final_result.compute()
+    final_result = agg[["o_year", "mkt_share"]].round(2).sort_values("o_year")
 
-
-def bench_q8():
-    t0 = pyperf.perf_counter()
-    query()
-    return pyperf.perf_counter() - t0
-
-
-if __name__ == "__main__":
-    client = Client()
-    print(client.scheduler_info)
-    runner = pyperf.Runner()
-    runner.argparser.set_defaults(
-        quiet=False, loops=1, values=1, processes=1, warmups=0
-    )
-    runner.bench_func("dask-q8", bench_q8)
-    # result = query()
-    #
-    # file_name = "q" + str(Q_NUM) + ".out"
-    # export_df(result, file_name)
+    return final_result
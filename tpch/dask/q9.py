@@ -1,47 +1,70 @@
-import pyperf
 import tpch.utils as utils
 
 from dask import dataframe as dd
-from dask.distributed import Client
+from tpch.ops import like, prefilter
+from tpch.planner import join
 
 Q_NUM = 9
 
 
 def get_ds():
-    part = utils.get_part_ds("dask")
-    supplier = utils.get_supplier_ds("dask")
-    lineitem = utils.get_line_item_ds("dask")
-    partsupp = utils.get_part_supp_ds("dask")
-    orders = utils.get_orders_ds("dask")
-    nation = utils.get_nation_ds("dask")
+    part = utils.get_part_ds("dask", columns=["p_partkey", "p_name"])
+    supplier = utils.get_supplier_ds("dask", columns=["s_suppkey", "s_nationkey"])
+    lineitem = utils.get_line_item_ds(
+        "dask",
+        columns=[
+            "l_orderkey",
+            "l_partkey",
+            "l_suppkey",
+            "l_quantity",
+            "l_extendedprice",
+            "l_discount",
+        ],
+    )
+    partsupp = utils.get_part_supp_ds(
+        "dask", columns=["ps_partkey", "ps_suppkey", "ps_supplycost"]
+    )
+    orders = utils.get_orders_ds("dask", columns=["o_orderkey", "o_orderdate"])
+    nation = utils.get_nation_ds("dask", columns=["n_nationkey", "n_name"])
 
     return part, supplier, lineitem, partsupp, orders, nation
 
 
-def query() -> dd.DataFrame:
-    part, supplier, lineitem, partsupp, orders, nation = get_ds()
+def query(part, supplier, lineitem, partsupp, orders, nation) -> dd.DataFrame:
+    def is_green(df):
+        return like(df["p_name"], "%green%")
 
-    # Chain of merges
-    part_partsupp = part.merge(partsupp, left_on="p_partkey", right_on="ps_partkey")
-    with_supplier = part_partsupp.merge(
-        supplier, left_on="ps_suppkey", right_on="s_suppkey"
-    )
-    with_lineitem = with_supplier.merge(
-        lineitem,
-        left_on=["p_partkey", "ps_suppkey"],
-        right_on=["l_partkey", "l_suppkey"],
+    green_parts = part[is_green(part)]
+    # Only the lines of green parts are joined
+    green_lineitem = prefilter(
+        lineitem, green_parts, left_on="l_partkey", right_on="p_partkey"
     )
-    with_orders = with_lineitem.merge(
-        orders, left_on="l_orderkey", right_on="o_orderkey"
-    )
-    with_nation = with_orders.merge(
-        nation, left_on="s_nationkey", right_on="n_nationkey"
+
+    filtered_data = join(
+        {
+            "part": part,
+            "partsupp": partsupp,
+            "supplier": supplier,
+            "lineitem": green_lineitem,
+            "orders": orders,
+            "nation": nation,
+        },
+        joins=[
+            ("part", "p_partkey", "partsupp", "ps_partkey"),
+            ("partsupp", "ps_suppkey", "supplier", "s_suppkey"),
+            (
+                "partsupp",
+                ["ps_partkey", "ps_suppkey"],
+                "lineitem",
+                ["l_partkey", "l_suppkey"],
+            ),
+            ("lineitem", "l_orderkey", "orders", "o_orderkey"),
+            ("supplier", "s_nationkey", "nation", "n_nationkey"),
+        ],
+        filters={"part": is_green},
     )
 
-    # Filter and compute derived columns
-    filtered_data = with_nation[
-        with_nation["p_name"].str.contains("green", regex=False)
-    ]
+    # Compute derived columns
     filtered_data["o_year"] = filtered_data["o_orderdate"].dt.year
     filtered_data["amount"] = filtered_data["l_extendedprice"] * (
         1 - filtered_data["l_discount"]
@@ -58,24 +81,4 @@ def query() -> dd.DataFrame:
         by=["nation", "o_year"], ascending=[True, False]
     ).reset_index(drop=True)
 
-    return sorted_result.compute()
-
-
-def bench_q9():
-    t0 = pyperf.perf_counter()
-    query()
-    return pyperf.perf_counter() - t0
-
-
-if __name__ == "__main__":
-    client = Client()
-    print(client.scheduler_info)
-    runner = pyperf.Runner()
-    runner.argparser.set_defaults(
-        quiet=False, loops=1, values=1, processes=1, warmups=0
-    )
-    runner.bench_func("dask-q9", bench_q9)
-    # result = query()
-    #
-    # file_name = "q" + str(Q_NUM) + ".out"
-    # export_df(result, file_name)
+    return sorted_result
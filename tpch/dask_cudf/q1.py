@@ -1,25 +1,31 @@
-import pyperf
 import dask_cudf
 import numpy as np
 
 from datetime import date
-from dask.distributed import Client
 from tpch.utils import (
     get_line_item_ds,
-    export_df,
 )
 
 Q_NUM = 1
 
 
 def get_ds():
-    lineitem = get_line_item_ds("cudask")
+    lineitem = get_line_item_ds(
+        "cudask",
+        columns=[
+            "l_quantity",
+            "l_extendedprice",
+            "l_discount",
+            "l_tax",
+            "l_returnflag",
+            "l_linestatus",
+            "l_shipdate",
+        ],
+    )
     return lineitem
 
 
-def query():
-    lineitem = get_ds()
-
+def query(lineitem):
     # Convert target date to string format that dask_cudf can compare with
     target_date = np.datetime64(date(1998, 9, 2))
 
@@ -56,24 +62,4 @@ def query():
 
     q_final = result.reset_index().sort_values(["l_returnflag", "l_linestatus"])
 
-    return q_final.compute()
-
-
-def bench_q1():
-    t0 = pyperf.perf_counter()
-    query()
-    return pyperf.perf_counter() - t0
-
-
-if __name__ == "__main__":
-    client = Client()
-    print(client.scheduler_info)
-    runner = pyperf.Runner()
-    runner.argparser.set_defaults(
-        quiet=False, loops=1, values=1, processes=1, warmups=0
-    )
-    runner.bench_func("dask_cudf-q1", bench_q1)
-    # result = query()
-    #
-    # file_name = "q" + str(Q_NUM) + ".out"
-    # export_df(result, file_name, is_cudf=True)
+    return q_final
@@ -1,28 +1,32 @@
-import pyperf
 import dask_cudf
 import numpy as np
 
 from datetime import date
-from dask.distributed import Client
 from tpch.utils import (
     get_line_item_ds,
     get_orders_ds,
-    export_df,
 )
 
 Q_NUM = 12
 
 
 def get_ds():
-    lineitem = get_line_item_ds("cudask")
-    orders = get_orders_ds("cudask")
+    lineitem = get_line_item_ds(
+        "cudask",
+        columns=[
+            "l_orderkey",
+            "l_shipdate",
+            "l_commitdate",
+            "l_receiptdate",
+            "l_shipmode",
+        ],
+    )
+    orders = get_orders_ds("cudask", columns=["o_orderkey", "o_orderpriority"])
 
     return lineitem, orders
 
 
-def query():
-    lineitem, orders = get_ds()
-
+def query(lineitem, orders):
     var1 = "MAIL"
     var2 = "SHIP"
     var3 = np.datetime64(date(1994, 1, 1))
@@ -55,28 +59,7 @@ def query():
         .agg({"high_line_count": "sum", "low_line_count": "sum"})
         .reset_index()
         .sort_values("l_shipmode")
-        .compute()
         .astype({"high_line_count": int, "low_line_count": int})
     )
 
     return q_final
-
-
-def bench_q12():
-    t0 = pyperf.perf_counter()
-    query()
-    return pyperf.perf_counter() - t0
-
-
-if __name__ == "__main__":
-    client = Client()
-    print(client.scheduler_info)
-    runner = pyperf.Runner()
-    runner.argparser.set_defaults(
-        quiet=False, loops=1, values=1, processes=1, warmups=0
-    )
-    runner.bench_func("dask_cudf-q12", bench_q12)
-    # result = query()
-    #
-    # file_name = "q" + str(Q_NUM) + ".out"
-    # export_df(result, file_name, is_cudf=True)
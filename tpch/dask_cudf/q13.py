@@ -1,26 +1,23 @@
-import pyperf
 import dask_cudf
 
-from dask.distributed import Client
 from tpch.utils import (
     get_customer_ds,
     get_orders_ds,
-    export_df,
 )
 
 Q_NUM = 13
 
 
 def get_ds():
-    customer = get_customer_ds(mode="cudask")
-    orders = get_orders_ds(mode="cudask")
+    customer = get_customer_ds(mode="cudask", columns=["c_custkey"])
+    orders = get_orders_ds(
+        mode="cudask", columns=["o_orderkey", "o_custkey", "o_comment"]
+    )
 
     return customer, orders
 
 
-def query():
-    customer, orders = get_ds()
-
+def query(customer, orders):
     var1 = "special"
     var2 = "requests"
 
@@ -44,24 +41,4 @@ def query():
         .reset_index(drop=True)
     )
 
-    return q_final.compute()
-
-
-def bench_q13():
-    t0 = pyperf.perf_counter()
-    query()
-    return pyperf.perf_counter() - t0
-
-
-if __name__ == "__main__":
-    client = Client()
-    print(client.scheduler_info)
-    runner = pyperf.Runner()
-    runner.argparser.set_defaults(
-        quiet=False, loops=1, values=1, processes=1, warmups=0
-    )
-    runner.bench_func("dask_cudf-q13", bench_q13)
-    # result = query()
-    #
-    # file_name = "q" + str(Q_NUM) + ".out"
-    # export_df(result, file_name, is_cudf=True)
+    return q_final
@@ -1,29 +1,32 @@
-import pyperf
 import dask_cudf
-import pandas as pd
 import numpy as np
 
 from datetime import date
-from dask.distributed import Client
 from tpch.utils import (
     get_line_item_ds,
     get_part_ds,
-    export_df,
 )
+from tpch.ops import one_row
 
 Q_NUM = 14
 
 
 def get_ds():
-    lineitem = get_line_item_ds(mode="cudask")
-    part = get_part_ds(mode="cudask")
+    lineitem = get_line_item_ds(
+        mode="cudask",
+        columns=["l_partkey", "l_extendedprice", "l_discount", "l_shipdate"],
+        filters=[
+            ("l_shipdate", ">=", date(1995, 9, 1)),
+            ("l_shipdate", "<", date(1995, 10, 1)),
+        ],
+        clustered=True,
+    )
+    part = get_part_ds(mode="cudask", columns=["p_partkey", "p_type"])
 
     return lineitem, part
 
 
-def query():
-    lineitem, part = get_ds()
-
+def query(lineitem, part):
     var1 = np.datetime64(date(1995, 9, 1))
     var2 = np.datetime64(date(1995, 10, 1))
 
@@ -38,34 +41,12 @@ def query():
         discounted_price=lambda df: df["l_extendedprice"] * (1 - df["l_discount"]),
     )
 
-    result_df = filtered_df.compute()
-
-    result_df["promo_price"] = result_df["discounted_price"].where(
-        result_df["p_type"].str.startswith("PROMO"), 0
+    filtered_df["promo_price"] = filtered_df["discounted_price"].where(
+        filtered_df["p_type"].str.startswith("PROMO"), 0
     )
 
-    sums = result_df[["discounted_price", "promo_price"]].sum()
-    promo_revenue = 100.00 * sums["promo_price"] / sums["discounted_price"]
-
-    q_final = pd.DataFrame({"promo_revenue": [round(promo_revenue, 2)]})
-    return q_final
+    promo_price = filtered_df["promo_price"].sum()
+    discounted_price = filtered_df["discounted_price"].sum()
+    promo_revenue = 100.00 * promo_price / discounted_price
 
-
-def bench_q14():
-    t0 = pyperf.perf_counter()
-    query()
-    return pyperf.perf_counter() - t0
-
-
-if __name__ == "__main__":
-    client = Client()
-    print(client.scheduler_info)
-    runner = pyperf.Runner()
-    runner.argparser.set_defaults(
-        quiet=False, loops=1, values=1, processes=1, warmups=0
-    )
-    runner.bench_func("dask_cudf-q14", bench_q14)
-    # result = query()
-    #
-    # file_name = "q" + str(Q_NUM) + ".out"
-    # export_df(result, file_name, is_cudf=False)
+    return one_row(promo_revenue=promo_revenue).round(2)
@@ -1,28 +1,33 @@
-import pyperf
 import dask_cudf
 import numpy as np
 
 from datetime import date
-from dask.distributed import Client
 from tpch.utils import (
     get_supplier_ds,
     get_line_item_ds,
-    export_df,
 )
 
 Q_NUM = 15
 
 
 def get_ds():
-    supplier = get_supplier_ds(mode="cudask")
-    lineitem = get_line_item_ds(mode="cudask")
+    supplier = get_supplier_ds(
+        mode="cudask", columns=["s_suppkey", "s_name", "s_address", "s_phone"]
+    )
+    lineitem = get_line_item_ds(
+        mode="cudask",
+        columns=["l_suppkey", "l_extendedprice", "l_discount", "l_shipdate"],
+        filters=[
+            ("l_shipdate", ">=", date(1996, 1, 1)),
+            ("l_shipdate", "<", date(1996, 4, 1)),
+        ],
+        clustered=True,
+    )
 
     return supplier, lineitem
 
 
-def query():
-    supplier, lineitem = get_ds()
-
+def query(supplier, lineitem):
     var1 = np.datetime64(date(1996, 1, 1))
     var2 = np.datetime64(date(1996, 4, 1))
 
@@ -35,12 +40,10 @@ def query():
         .agg({"total_revenue": "sum"})
         .reset_index()
     )
-    revenue = revenue.compute()
-
     max_revenue = revenue["total_revenue"].max()
     max_revenue_suppliers = revenue[revenue["total_revenue"] == max_revenue]
 
-    supplier_df = supplier[["s_suppkey", "s_name", "s_address", "s_phone"]].compute()
+    supplier_df = supplier[["s_suppkey", "s_name", "s_address", "s_phone"]]
 
     q_final = (
         supplier_df.merge(
@@ -54,23 +57,3 @@ def query():
     )
 
     return q_final
-
-
-def bench_q15():
-    t0 = pyperf.perf_counter()
-    query()
-    return pyperf.perf_counter() - t0
-
-
-if __name__ == "__main__":
-    client = Client()
-    print(client.scheduler_info)
-    runner = pyperf.Runner()
-    runner.argparser.set_defaults(
-        quiet=False, loops=1, values=1, processes=1, warmups=0
-    )
-    runner.bench_func("dask_cudf-q15", bench_q15)
-    # result = query()
-    #
-    # file_name = "q" + str(Q_NUM) + ".out"
-    # export_df(result, file_name, is_cudf=True)
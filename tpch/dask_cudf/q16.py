@@ -1,28 +1,25 @@
-import pyperf
 import dask_cudf
 
-from dask.distributed import Client
 from tpch.utils import (
     get_supplier_ds,
     get_part_supp_ds,
     get_part_ds,
-    export_df,
 )
 
 Q_NUM = 16
 
 
 def get_ds():
-    supplier = get_supplier_ds(mode="cudask")
-    partsupp = get_part_supp_ds(mode="cudask")
-    part = get_part_ds(mode="cudask")
+    supplier = get_supplier_ds(mode="cudask", columns=["s_suppkey", "s_comment"])
+    partsupp = get_part_supp_ds(mode="cudask", columns=["ps_partkey", "ps_suppkey"])
+    part = get_part_ds(
+        mode="cudask", columns=["p_partkey", "p_brand", "p_type", "p_size"]
+    )
 
     return supplier, partsupp, part
 
 
-def query():
-    supplier, partsupp, part = get_ds()
-
+def query(supplier, partsupp, part):
     var1 = "Brand#45"
 
     complaint_suppliers = supplier[
@@ -58,24 +55,4 @@ def query():
         .reset_index(drop=True)
     )
 
-    return q_final.compute()
-
-
-def bench_q16():
-    t0 = pyperf.perf_counter()
-    query()
-    return pyperf.perf_counter() - t0
-
-
-if __name__ == "__main__":
-    client = Client()
-    print(client.scheduler_info)
-    runner = pyperf.Runner()
-    runner.argparser.set_defaults(
-        quiet=False, loops=1, values=1, processes=1, warmups=0
-    )
-    runner.bench_func("dask_cudf-q16", bench_q16)
-    # result = query()
-    #
-    # file_name = "q" + str(Q_NUM) + ".out"
-    # export_df(result, file_name, is_cudf=True)
+    return q_final
@@ -1,29 +1,28 @@
-import pyperf
 import dask_cudf
 import cudf
 
-from dask.distributed import Client
 from tpch.utils import (
     get_line_item_ds,
     get_customer_ds,
     get_orders_ds,
-    export_df,
 )
+from tpch.ops import top_k
 
 Q_NUM = 18
 
 
 def get_ds():
-    lineitem = get_line_item_ds(mode="cudask")
-    customer = get_customer_ds(mode="cudask")
-    orders = get_orders_ds(mode="cudask")
+    lineitem = get_line_item_ds(mode="cudask", columns=["l_orderkey", "l_quantity"])
+    customer = get_customer_ds(mode="cudask", columns=["c_custkey", "c_name"])
+    orders = get_orders_ds(
+        mode="cudask",
+        columns=["o_orderkey", "o_custkey", "o_totalprice", "o_orderdate"],
+    )
 
     return lineitem, customer, orders
 
 
-def query():
-    lineitem, customer, orders = get_ds()
-
+def query(lineitem, customer, orders):
     var1 = 300
 
     lineitem_needed = lineitem[["l_orderkey", "l_quantity"]]
@@ -52,30 +51,9 @@ def query():
         .agg({"l_quantity": "sum"})
         .reset_index()
         .rename(columns={"l_quantity": "col6", "o_orderdate": "o_orderdat"})
-        .sort_values(["o_totalprice", "o_orderdat"], ascending=[False, True])
+        .pipe(top_k, 100, ["o_totalprice", "o_orderdat"], ascending=[False, True])
         .astype({"col6": "float64"})
-        .head(100)
         .reset_index(drop=True)
     )
 
     return q_final
-
-
-def bench_q18():
-    t0 = pyperf.perf_counter()
-    query()
-    return pyperf.perf_counter() - t0
-
-
-if __name__ == "__main__":
-    client = Client()
-    print(client.scheduler_info)
-    runner = pyperf.Runner()
-    runner.argparser.set_defaults(
-        quiet=False, loops=1, values=1, processes=1, warmups=0
-    )
-    runner.bench_func("dask_cudf-q18", bench_q18)
-    # result = query()
-    #
-    # file_name = "q" + str(Q_NUM) + ".out"
-    # export_df(result, file_name, is_cudf=True)
@@ -1,27 +1,34 @@
-import pyperf
 import dask_cudf
-import pandas as pd
 
-from dask.distributed import Client
 from tpch.utils import (
     get_line_item_ds,
     get_part_ds,
-    export_df,
 )
+from tpch.ops import one_row
 
 Q_NUM = 19
 
 
 def get_ds():
-    lineitem = get_line_item_ds(mode="cudask")
-    part = get_part_ds(mode="cudask")
+    lineitem = get_line_item_ds(
+        mode="cudask",
+        columns=[
+            "l_partkey",
+            "l_quantity",
+            "l_extendedprice",
+            "l_discount",
+            "l_shipinstruct",
+            "l_shipmode",
+        ],
+    )
+    part = get_part_ds(
+        mode="cudask", columns=["p_partkey", "p_brand", "p_size", "p_container"]
+    )
 
     return lineitem, part
 
 
-def query():
-    lineitem, part = get_ds()
-
+def query(lineitem, part):
     part_cols = part[["p_partkey", "p_brand", "p_container", "p_size"]]
     lineitem_cols = lineitem[
         [
@@ -75,28 +82,6 @@ def query():
         1 - filtered[combined_mask]["l_discount"]
     )
 
-    total_revenue = revenue_calc.sum().compute()
-
-    q_final = pd.DataFrame({"revenue": [total_revenue]})
-
-    return q_final
-
+    total_revenue = revenue_calc.sum()
 
-def bench_q19():
-    t0 = pyperf.perf_counter()
-    query()
-    return pyperf.perf_counter() - t0
-
-
-if __name__ == "__main__":
-    client = Client()
-    print(client.scheduler_info)
-    runner = pyperf.Runner()
-    runner.argparser.set_defaults(
-        quiet=False, loops=1, values=1, processes=1, warmups=0
-    )
-    runner.bench_func("dask_cudf-q19", bench_q19)
-    # result = query()
-    #
-    # file_name = "q" + str(Q_NUM) + ".out"
-    # export_df(result, file_name, is_cudf=False)
+    return one_row(revenue=total_revenue)
@@ -1,48 +1,69 @@
-import pyperf
 import dask_cudf
 import tpch.utils as utils
-
-from dask.distributed import Client
+from tpch.ops import group_broadcast, shared, top_k
+from tpch.planner import join
 
 Q_NUM = 2
 
 
 def get_ds():
-    region = utils.get_region_ds("cudask")
-    nation = utils.get_nation_ds("cudask")
-    supplier = utils.get_supplier_ds("cudask")
-    part = utils.get_part_ds("cudask")
-    part_supp = utils.get_part_supp_ds("cudask")
+    region = utils.get_region_ds("cudask", columns=["r_regionkey", "r_name"])
+    nation = utils.get_nation_ds(
+        "cudask", columns=["n_nationkey", "n_name", "n_regionkey"]
+    )
+    supplier = utils.get_supplier_ds(
+        "cudask",
+        columns=[
+            "s_suppkey",
+            "s_name",
+            "s_address",
+            "s_nationkey",
+            "s_phone",
+            "s_acctbal",
+            "s_comment",
+        ],
+    )
+    part = utils.get_part_ds(
+        "cudask", columns=["p_partkey", "p_mfgr", "p_type", "p_size"]
+    )
+    part_supp = utils.get_part_supp_ds(
+        "cudask", columns=["ps_partkey", "ps_suppkey", "ps_supplycost"]
+    )
 
     return region, nation, supplier, part, part_supp
 
 
-def query():
-    region, nation, supplier, part, part_supp = get_ds()
-
+def query(region, nation, supplier, part, part_supp):
     var1 = 15
     var2 = "BRASS"
     var3 = "EUROPE"
 
-    q1 = (
-        part.merge(part_supp, left_on="p_partkey", right_on="ps_partkey")
-        .merge(supplier, left_on="ps_suppkey", right_on="s_suppkey")
-        .merge(nation, left_on="s_nationkey", right_on="n_nationkey")
-        .merge(region, left_on="n_regionkey", right_on="r_regionkey")
-        .pipe(
-            lambda df: df[
-                (df["p_size"] == var1)
-                & (df["p_type"].str.endswith(var2))
-                & (df["r_name"] == var3)
-            ]
-        )
+    q1 = join(
+        {
+            "part": part,
+            "partsupp": part_supp,
+            "supplier": supplier,
+            "nation": nation,
+            "region": region,
+        },
+        joins=[
+            ("part", "p_partkey", "partsupp", "ps_partkey"),
+            ("partsupp", "ps_suppkey", "supplier", "s_suppkey"),
+            ("supplier", "s_nationkey", "nation", "n_nationkey"),
+            ("nation", "n_regionkey", "region", "r_regionkey"),
+        ],
+        filters={
+            "part": lambda df: (df["p_size"] == var1) & df["p_type"].str.endswith(var2),
+            "region": lambda df: df["r_name"] == var3,
+        },
     )
 
+    # Read by both the group-by and the lookup of its groups
+    q1 = shared(q1)
+
     q_final = (
-        q1.groupby("p_partkey")
-        .agg({"ps_supplycost": "min"})
-        .reset_index()
-        .merge(q1, on=["p_partkey", "ps_supplycost"])[
+        q1.pipe(group_broadcast, "p_partkey", "ps_supplycost", "min", "min_cost")
+        .pipe(lambda df: df[df["ps_supplycost"] == df["min_cost"]])[
             [
                 "s_acctbal",
                 "s_name",
@@ -54,31 +75,12 @@ def query():
                 "s_comment",
             ]
         ]
-        .sort_values(
+        .pipe(
+            top_k,
+            100,
             by=["s_acctbal", "n_name", "s_name", "p_partkey"],
             ascending=[False, True, True, True],
         )
-        .head(100)
     )
 
     return q_final
-
-
-def bench_q2():
-    t0 = pyperf.perf_counter()
-    query()
-    return pyperf.perf_counter() - t0
-
-
-if __name__ == "__main__":
-    client = Client()
-    print(client.scheduler_info)
-    runner = pyperf.Runner()
-    runner.argparser.set_defaults(
-        quiet=False, loops=1, values=1, processes=1, warmups=0
-    )
-    runner.bench_func("dask_cudf-q2", bench_q2)
-    # result = query()
-    #
-    # file_name = "q" + str(Q_NUM) + ".out"
-    # utils.export_df(result, file_name, is_cudf=True)
@@ -1,27 +1,30 @@
-import pyperf
 import dask_cudf
 import numpy as np
 import tpch.utils as utils
 
 from datetime import date
-from dask.distributed import Client
+from tpch.ops import semi_join
 
 Q_NUM = 20
 
 
 def get_ds():
-    lineitem = utils.get_line_item_ds(mode="cudask")
-    nation = utils.get_nation_ds(mode="cudask")
-    supplier = utils.get_supplier_ds(mode="cudask")
-    partsupp = utils.get_part_supp_ds(mode="cudask")
-    part = utils.get_part_ds(mode="cudask")
+    lineitem = utils.get_line_item_ds(
+        mode="cudask", columns=["l_partkey", "l_suppkey", "l_quantity", "l_shipdate"]
+    )
+    nation = utils.get_nation_ds(mode="cudask", columns=["n_nationkey", "n_name"])
+    supplier = utils.get_supplier_ds(
+        mode="cudask", columns=["s_suppkey", "s_name", "s_address", "s_nationkey"]
+    )
+    partsupp = utils.get_part_supp_ds(
+        mode="cudask", columns=["ps_partkey", "ps_suppkey", "ps_availqty"]
+    )
+    part = utils.get_part_ds(mode="cudask", columns=["p_partkey", "p_name"])
 
     return lineitem, nation, supplier, partsupp, part
 
 
-def query():
-    lineitem, nation, supplier, partsupp, part = get_ds()
-
+def query(lineitem, nation, supplier, partsupp, part):
     var1 = np.datetime64(date(1994, 1, 1))
     var2 = np.datetime64(date(1995, 1, 1))
     var3 = "CANADA"
@@ -44,42 +47,23 @@ def query():
         right_on="n_nationkey",
     )
 
-    result = (
-        part[part["p_name"].str.startswith(var4)][["p_partkey"]]
-        .merge(
+    available = (
+        semi_join(
             partsupp[["ps_partkey", "ps_suppkey", "ps_availqty"]],
-            left_on="p_partkey",
-            right_on="ps_partkey",
+            part[part["p_name"].str.startswith(var4)],
+            left_on="ps_partkey",
+            right_on="p_partkey",
         )
         .merge(
             q1,
             left_on=["ps_suppkey", "ps_partkey"],
             right_on=["l_suppkey", "l_partkey"],
         )
-        .loc[lambda df: df["ps_availqty"] > df["sum_quantity"]][["ps_suppkey"]]
-        .drop_duplicates()
-        .merge(q2, left_on="ps_suppkey", right_on="s_suppkey")[["s_name", "s_address"]]
-        .sort_values("s_name")
+        .loc[lambda df: df["ps_availqty"] > df["sum_quantity"]]
     )
 
-    return result.compute()
+    result = semi_join(q2, available, left_on="s_suppkey", right_on="ps_suppkey")[
+        ["s_name", "s_address"]
+    ].sort_values("s_name")
 
-
-def bench_q20():
-    t0 = pyperf.perf_counter()
-    query()
-    return pyperf.perf_counter() - t0
-
-
-if __name__ == "__main__":
-    client = Client()
-    print(client.scheduler_info)
-    runner = pyperf.Runner()
-    runner.argparser.set_defaults(
-        quiet=False, loops=1, values=1, processes=1, warmups=0
-    )
-    runner.bench_func("dask_cudf-q20", bench_q20)
-    # result = query()
-    #
-    # file_name = "q" + str(Q_NUM) + ".out"
-    # utils.export_df(result, file_name, is_cudf=True)
+    return result
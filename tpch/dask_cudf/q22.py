@@ -1,26 +1,24 @@
-import pyperf
 import dask_cudf
 
-from dask.distributed import Client
 from tpch.utils import (
     get_customer_ds,
     get_orders_ds,
-    export_df,
 )
+from tpch.ops import anti_join
 
 Q_NUM = 22
 
 
 def get_ds():
-    customer = get_customer_ds(mode="cudask")
-    orders = get_orders_ds(mode="cudask")
+    customer = get_customer_ds(
+        mode="cudask", columns=["c_custkey", "c_phone", "c_acctbal"]
+    )
+    orders = get_orders_ds(mode="cudask", columns=["o_custkey"])
 
     return customer, orders
 
 
-def query():
-    customer, orders = get_ds()
-
+def query(customer, orders):
     cntry_codes = ["13", "31", "23", "29", "30", "18", "17"]
 
     customer_filtered = (
@@ -29,19 +27,13 @@ def query():
         .loc[lambda df: df["cntrycode"].isin(cntry_codes)]
     )
 
-    avg_acctbal = (
-        customer_filtered.loc[lambda df: df["c_acctbal"] > 0.0]["c_acctbal"]
-        .mean()
-        .compute()
-    )
-
-    orders_custkeys = orders[["o_custkey"]].drop_duplicates()
+    avg_acctbal = customer_filtered.loc[lambda df: df["c_acctbal"] > 0.0][
+        "c_acctbal"
+    ].mean()
 
     q_final = (
-        customer_filtered.merge(
-            orders_custkeys, left_on="c_custkey", right_on="o_custkey", how="left"
-        )
-        .loc[lambda df: df["o_custkey"].isna() & (df["c_acctbal"] > avg_acctbal)]
+        anti_join(customer_filtered, orders, left_on="c_custkey", right_on="o_custkey")
+        .loc[lambda df: df["c_acctbal"] > avg_acctbal]
         .groupby("cntrycode")
         .agg({"c_acctbal": ["count", "sum"]})
         .reset_index()
@@ -51,24 +43,4 @@ def query():
 
     result = q_final.sort_values("cntrycode")
 
-    return result.compute()
-
-
-def bench_q22():
-    t0 = pyperf.perf_counter()
-    query()
-    return pyperf.perf_counter() - t0
-
-
-if __name__ == "__main__":
-    client = Client()
-    print(client.scheduler_info)
-    runner = pyperf.Runner()
-    runner.argparser.set_defaults(
-        quiet=False, loops=1, values=1, processes=1, warmups=0
-    )
-    runner.bench_func("dask_cudf-q22", bench_q22)
-    # result = query()
-    #
-    # file_name = "q" + str(Q_NUM) + ".out"
-    # export_df(result, file_name, is_cudf=True)
+    return result
@@ -1,26 +1,29 @@
-import pyperf
 import dask_cudf
-import pandas as pd
 import numpy as np
 
 from datetime import date
-from dask.distributed import Client
 from tpch.utils import (
     get_line_item_ds,
-    export_df,
 )
+from tpch.ops import one_row
 
 Q_NUM = 6
 
 
 def get_ds():
-    lineitem = get_line_item_ds("cudask")
+    lineitem = get_line_item_ds(
+        "cudask",
+        columns=["l_quantity", "l_extendedprice", "l_discount", "l_shipdate"],
+        filters=[
+            ("l_shipdate", ">=", date(1994, 1, 1)),
+            ("l_shipdate", "<", date(1995, 1, 1)),
+        ],
+        clustered=True,
+    )
     return lineitem
 
 
-def query():
-    lineitem = get_ds()
-
+def query(lineitem):
     var1 = np.datetime64(date(1994, 1, 1))
     var2 = np.datetime64(date(1995, 1, 1))
     var3 = 0.05
@@ -35,26 +38,6 @@ def query():
         & (lineitem["l_quantity"] < var5)
     ]
 
-    result = (filtered["l_extendedprice"] * filtered["l_discount"]).sum().compute()
-
-    return pd.DataFrame({"revenue": [result]})
-
+    result = (filtered["l_extendedprice"] * filtered["l_discount"]).sum()
 
-def bench_q6():
-    t0 = pyperf.perf_counter()
-    query()
-    return pyperf.perf_counter() - t0
-
-
-if __name__ == "__main__":
-    client = Client()
-    print(client.scheduler_info)
-    runner = pyperf.Runner()
-    runner.argparser.set_defaults(
-        quiet=False, loops=1, values=1, processes=1, warmups=0
-    )
-    runner.bench_func("dask_cudf-q6", bench_q6)
-    # result = query()
-    #
-    # file_name = "q" + str(Q_NUM) + ".out"
-    # export_df(result, file_name, is_cudf=False)
+    return one_row(revenue=result)
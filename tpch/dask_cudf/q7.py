@@ -1,27 +1,32 @@
-import pyperf
 import dask_cudf
 import numpy as np
 import tpch.utils as utils
 
 from datetime import date
-from dask.distributed import Client
 
 Q_NUM = 7
 
 
 def get_ds():
-    customer = utils.get_customer_ds("cudask")
-    lineitem = utils.get_line_item_ds("cudask")
-    nation = utils.get_nation_ds("cudask")
-    orders = utils.get_orders_ds("cudask")
-    supplier = utils.get_supplier_ds("cudask")
+    customer = utils.get_customer_ds("cudask", columns=["c_custkey", "c_nationkey"])
+    lineitem = utils.get_line_item_ds(
+        "cudask",
+        columns=[
+            "l_orderkey",
+            "l_suppkey",
+            "l_extendedprice",
+            "l_discount",
+            "l_shipdate",
+        ],
+    )
+    nation = utils.get_nation_ds("cudask", columns=["n_nationkey", "n_name"])
+    orders = utils.get_orders_ds("cudask", columns=["o_orderkey", "o_custkey"])
+    supplier = utils.get_supplier_ds("cudask", columns=["s_suppkey", "s_nationkey"])
 
     return customer, lineitem, nation, orders, supplier
 
 
-def query():
-    customer, lineitem, nation, orders, supplier = get_ds()
-
+def query(customer, lineitem, nation, orders, supplier):
     var1 = "FRANCE"
     var2 = "GERMANY"
     var3 = np.datetime64(date(1995, 1, 1))
@@ -65,24 +70,4 @@ def query():
         .sort_values(["supp_nation", "cust_nation", "l_year"])
     )
 
-    return q_final.compute()
-
-
-def bench_q7():
-    t0 = pyperf.perf_counter()
-    query()
-    return pyperf.perf_counter() - t0
-
-
-if __name__ == "__main__":
-    client = Client()
-    print(client.scheduler_info)
-    runner = pyperf.Runner()
-    runner.argparser.set_defaults(
-        quiet=False, loops=1, values=1, processes=1, warmups=0
-    )
-    runner.bench_func("dask_cudf-q7", bench_q7)
-    # result = query()
-    #
-    # file_name = "q" + str(Q_NUM) + ".out"
-    # utils.export_df(result, file_name, is_cudf=True)
+    return q_final
@@ -1,26 +1,34 @@
-import pyperf
 import dask_cudf
 import tpch.utils as utils
-
-from dask.distributed import Client
+from tpch.planner import join
 
 Q_NUM = 9
 
 
 def get_ds():
-    part = utils.get_part_ds("cudask")
-    supplier = utils.get_supplier_ds("cudask")
-    lineitem = utils.get_line_item_ds("cudask")
-    partsupp = utils.get_part_supp_ds("cudask")
-    orders = utils.get_orders_ds("cudask")
-    nation = utils.get_nation_ds("cudask")
+    part = utils.get_part_ds("cudask", columns=["p_partkey", "p_name"])
+    supplier = utils.get_supplier_ds("cudask", columns=["s_suppkey", "s_nationkey"])
+    lineitem = utils.get_line_item_ds(
+        "cudask",
+        columns=[
+            "l_orderkey",
+            "l_partkey",
+            "l_suppkey",
+            "l_quantity",
+            "l_extendedprice",
+            "l_discount",
+        ],
+    )
+    partsupp = utils.get_part_supp_ds(
+        "cudask", columns=["ps_partkey", "ps_suppkey", "ps_supplycost"]
+    )
+    orders = utils.get_orders_ds("cudask", columns=["o_orderkey", "o_orderdate"])
+    nation = utils.get_nation_ds("cudask", columns=["n_nationkey", "n_name"])
 
     return part, supplier, lineitem, partsupp, orders, nation
 
 
-def query():
-    part, supplier, lineitem, partsupp, orders, nation = get_ds()
-
+def query(part, supplier, lineitem, partsupp, orders, nation):
     filtered_part = part[part["p_name"].str.contains("green")][["p_partkey", "p_name"]]
 
     slim_partsupp = partsupp[["ps_partkey", "ps_suppkey", "ps_supplycost"]]
@@ -38,17 +46,31 @@ def query():
     slim_orders = orders[["o_orderkey", "o_orderdate"]]
     slim_nation = nation[["n_nationkey", "n_name"]]
 
+    joined = join(
+        {
+            "part": filtered_part,
+            "partsupp": slim_partsupp,
+            "supplier": slim_supplier,
+            "lineitem": slim_lineitem,
+            "orders": slim_orders,
+            "nation": slim_nation,
+        },
+        joins=[
+            ("part", "p_partkey", "partsupp", "ps_partkey"),
+            ("partsupp", "ps_suppkey", "supplier", "s_suppkey"),
+            (
+                "partsupp",
+                ["ps_partkey", "ps_suppkey"],
+                "lineitem",
+                ["l_partkey", "l_suppkey"],
+            ),
+            ("lineitem", "l_orderkey", "orders", "o_orderkey"),
+            ("supplier", "s_nationkey", "nation", "n_nationkey"),
+        ],
+    )
+
     q_final = (
-        filtered_part.merge(slim_partsupp, left_on="p_partkey", right_on="ps_partkey")
-        .merge(slim_supplier, left_on="ps_suppkey", right_on="s_suppkey")
-        .merge(
-            slim_lineitem,
-            left_on=["p_partkey", "ps_suppkey"],
-            right_on=["l_partkey", "l_suppkey"],
-        )
-        .merge(slim_orders, left_on="l_orderkey", right_on="o_orderkey")
-        .merge(slim_nation, left_on="s_nationkey", right_on="n_nationkey")
-        .assign(
+        joined.assign(
             o_year=lambda df: df["o_orderdate"].dt.year,
             amount=lambda df: df["l_extendedprice"] * (1 - df["l_discount"])
             - (df["ps_supplycost"] * df["l_quantity"]),
@@ -61,24 +83,4 @@ def query():
         .sort_values(by=["nation", "o_year"], ascending=[True, False])
     )
 
-    return q_final.compute()
-
-
-def bench_q9():
-    t0 = pyperf.perf_counter()
-    query()
-    return pyperf.perf_counter() - t0
-
-
-if __name__ == "__main__":
-    client = Client()
-    print(client.scheduler_info)
-    runner = pyperf.Runner()
-    runner.argparser.set_defaults(
-        quiet=False, loops=1, values=1, processes=1, warmups=0
-    )
-    runner.bench_func("dask_cudf-q9", bench_q9)
-    # result = query()
-    #
-    # file_name = "q" + str(Q_NUM) + ".out"
-    # utils.export_df(result, file_name, is_cudf=True)
+    return q_final
@@ -0,0 +1,690 @@
+"""Deterministic, vectorized TPC-H data generator.
+
+Produces all eight TPC-H tables at any scale factor following the dbgen
+distributions and key relationships (sparse order keys, the partsupp supplier
+formula, customers whose key is a multiple of three never ordering, dates and
+flags derived from the order date, ...). Every chunk of rows is generated from
+its own seed, so the output does not depend on the number of processes.
+
+Usage: python -m tpch.dbgen --scale-factor 1 [--format parquet] [--processes 8]
+"""
+
+import argparse
+import os
+
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as csv
+import pyarrow.parquet as pq
+
+from tpch import utils
+
+TABLES = [
+    "region",
+    "nation",
+    "supplier",
+    "part",
+    "partsupp",
+    "customer",
+    "orders",
+    "lineitem",
+]
+
+# Rows per scale factor of the scaled tables
+SUPPLIER_BASE = 10_000
+PART_BASE = 200_000
+CUSTOMER_BASE = 150_000
+ORDERS_BASE = 1_500_000
+
+# Rows (of the base table of each task) generated per chunk
+CHUNK_SIZE = 100_000
+
+START_DATE = np.datetime64("1992-01-01", "D")
+CURRENT_DATE = np.datetime64("1995-06-17", "D")
+END_DATE = np.datetime64("1998-12-31", "D")
+ORDER_DATE_SPAN = int((END_DATE - 151 - START_DATE).astype(np.int64))
+
+REGIONS = ["AFRICA", "AMERICA", "ASIA", "EUROPE", "MIDDLE EAST"]
+NATIONS = [
+    ("ALGERIA", 0),
+    ("ARGENTINA", 1),
+    ("BRAZIL", 1),
+    ("CANADA", 1),
+    ("EGYPT", 4),
+    ("ETHIOPIA", 0),
+    ("FRANCE", 3),
+    ("GERMANY", 3),
+    ("INDIA", 2),
+    ("INDONESIA", 2),
+    ("IRAN", 4),
+    ("IRAQ", 4),
+    ("JAPAN", 2),
+    ("JORDAN", 4),
+    ("KENYA", 0),
+    ("MOROCCO", 0),
+    ("MOZAMBIQUE", 0),
+    ("PERU", 1),
+    ("CHINA", 2),
+    ("ROMANIA", 3),
+    ("SAUDI ARABIA", 4),
+    ("VIETNAM", 2),
+    ("RUSSIA", 3),
+    ("UNITED KINGDOM", 3),
+    ("UNITED STATES", 1),
+]
+
+COLORS = (
+    "almond antique aquamarine azure beige bisque black blanched blue blush "
+    "brown burlywood burnished chartreuse chiffon chocolate coral cornflower "
+    "cornsilk cream cyan dark deep dim dodger drab firebrick floral forest "
+    "frosted gainsboro ghost goldenrod green grey honeydew hot indian ivory "
+    "khaki lace lavender lawn lemon light lime linen magenta maroon medium "
+    "metallic midnight mint misty moccasin navajo navy olive orange orchid pale "
+    "papaya peach peru pink plum powder puff purple red rose rosy royal saddle "
+    "salmon sandy seashell sienna sky slate smoke snow spring steel tan thistle "
+    "tomato turquoise violet wheat white yellow"
+).split()
+TYPE_SYLLABLES = [
+    ["STANDARD", "SMALL", "MEDIUM", "LARGE", "ECONOMY", "PROMO"],
+    ["ANODIZED", "BURNISHED", "PLATED", "POLISHED", "BRUSHED"],
+    ["TIN", "NICKEL", "BRASS", "STEEL", "COPPER"],
+]
+CONTAINER_SYLLABLES = [
+    ["SM", "LG", "MED", "JUMBO", "WRAP"],
+    ["CASE", "BOX", "BAG", "JAR", "PKG", "PACK", "CAN", "DRUM"],
+]
+SEGMENTS = ["AUTOMOBILE", "BUILDING", "FURNITURE", "MACHINERY", "HOUSEHOLD"]
+PRIORITIES = ["1-URGENT", "2-HIGH", "3-MEDIUM", "4-NOT SPECIFIED", "5-LOW"]
+INSTRUCTIONS = ["DELIVER IN PERSON", "COLLECT COD", "NONE", "TAKE BACK RETURN"]
+MODES = ["REG AIR", "AIR", "RAIL", "SHIP", "TRUCK", "MAIL", "FOB"]
+
+# Word lists of the dbgen text grammar used for all comment columns
+NOUNS = (
+    "packages requests accounts deposits foxes ideas theodolites pinto_beans "
+    "instructions dependencies excuses platelets asymptotes courts dolphins "
+    "multipliers sauternes warthogs frets dinos attainments somas Tiresias "
+    "patterns forges braids hockey_players frays warhorses dugouts notornis "
+    "epitaphs pearls tithes waters orbits gifts sheaves depths sentiments "
+    "decoys realms pains grouches escapades"
+).split()
+VERBS = (
+    "sleep wake are cajole haggle nag use boost affix detect integrate "
+    "maintain nod was lose sublate solve thrash promise engage hinder print "
+    "x-ray breach eat grow impress mold poach serve run dazzle snooze doze "
+    "unwind kindle play hang believe doubt"
+).split()
+ADJECTIVES = (
+    "special pending unusual express furious sly careful blithe quick fluffy "
+    "slow quiet ruthless thin close dogged daring brave stealthy permanent "
+    "enticing idle busy regular final ironic even bold silent"
+).split()
+ADVERBS = (
+    "sometimes always never furiously slyly carefully blithely quickly "
+    "fluffily slowly quietly ruthlessly thinly closely doggedly daringly "
+    "bravely stealthily permanently enticingly idly busily regularly finally "
+    "ironically evenly boldly silently"
+).split()
+PREPOSITIONS = (
+    "about above according_to across after against along alongside_of among "
+    "around at atop before behind beneath beside besides between beyond by "
+    "despite during except for from in_place_of inside instead_of into near "
+    "of on outside over past since through throughout to toward under until "
+    "up upon without with within"
+).split()
+AUXILIARIES = (
+    "do may might shall will would can could should ought_to must "
+    "will_have_to shall_have_to could_have_to should_have_to must_have_to "
+    "need_to try_to"
+).split()
+TERMINATORS = [".", ";", ":", "?", "!", "--"]
+
+TEXT_POOL_SIZE = 4 * 1024 * 1024
+TEXT_POOL_SEED = 933588178
+# Comments are consecutive runs of the text pool starting at a random offset
+# every TEXT_BLOCK rows, which keeps them random without a per-row gather.
+TEXT_BLOCK = 1024
+
+ALPHANUMERIC = np.frombuffer(
+    b"0123456789abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ ,", np.uint8
+)
+
+_text_pool = None
+
+
+def table_size(table_name: str, scale_factor: float) -> int:
+    """Number of rows of the base table at the given scale factor."""
+    base = {
+        "supplier": SUPPLIER_BASE,
+        "part": PART_BASE,
+        "customer": CUSTOMER_BASE,
+        "orders": ORDERS_BASE,
+    }
+    return max(1, int(base[table_name] * scale_factor))
+
+
+def get_text_pool() -> np.ndarray:
+    """Return the shared pool of grammar text that comments are cut from."""
+    global _text_pool
+    if _text_pool is None:
+        # Drawing in bulk is far cheaper than one generator call per word
+        draws = iter(np.random.default_rng(TEXT_POOL_SEED).random(1 << 22).tolist())
+
+        def choice(n):
+            return int(next(draws) * n)
+
+        def pick(words):
+            return words[choice(len(words))].replace("_", " ")
+
+        def noun_phrase():
+            form = choice(4)
+            if form == 0:
+                return pick(NOUNS)
+            if form == 1:
+                return f"{pick(ADJECTIVES)} {pick(NOUNS)}"
+            if form == 2:
+                return f"{pick(ADJECTIVES)}, {pick(ADJECTIVES)} {pick(NOUNS)}"
+            return f"{pick(ADVERBS)} {pick(ADJECTIVES)} {pick(NOUNS)}"
+
+        def verb_phrase():
+            form = choice(4)
+            if form == 0:
+                return pick(VERBS)
+            if form == 1:
+                return f"{pick(AUXILIARIES)} {pick(VERBS)}"
+            if form == 2:
+                return f"{pick(VERBS)} {pick(ADVERBS)}"
+            return f"{pick(AUXILIARIES)} {pick(VERBS)} {pick(ADVERBS)}"
+
+        def prepositional_phrase():
+            return f"{pick(PREPOSITIONS)} the {noun_phrase()}"
+
+        sentences = []
+        size = 0
+        while size < TEXT_POOL_SIZE:
+            form = choice(5)
+            if form == 0:
+                parts = [noun_phrase(), verb_phrase()]
+            elif form == 1:
+                parts = [noun_phrase(), verb_phrase(), prepositional_phrase()]
+            elif form == 2:
+                parts = [noun_phrase(), verb_phrase(), noun_phrase()]
+            elif form == 3:
+                parts = [
+                    noun_phrase(),
+                    prepositional_phrase(),
+                    verb_phrase(),
+                    noun_phrase(),
+                ]
+            else:
+                parts = [
+                    noun_phrase(),
+                    prepositional_phrase(),
+                    verb_phrase(),
+                    prepositional_phrase(),
+                ]
+            sentence = " ".join(parts) + pick(TERMINATORS) + " "
+            sentences.append(sentence)
+            size += len(sentence)
+
+        _text_pool = np.frombuffer("".join(sentences).encode(), np.uint8)
+    return _text_pool
+
+
+def _strings_from_buffer(lengths: np.ndarray, data: np.ndarray) -> pa.Array:
+    """Build a string array from row lengths and their concatenated bytes."""
+    offsets = np.zeros(len(lengths) + 1, dtype=np.int32)
+    np.cumsum(lengths, out=offsets[1:])
+    return pa.StringArray.from_buffers(
+        len(lengths), pa.py_buffer(offsets), pa.py_buffer(data)
+    )
+
+
+def _comments(rng, n: int, min_len: int, max_len: int) -> pa.Array:
+    pool = get_text_pool()
+    lengths = rng.integers(min_len, max_len + 1, n)
+    offsets = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(lengths, out=offsets[1:])
+    data = np.empty(offsets[-1], dtype=np.uint8)
+    for start in range(0, n, TEXT_BLOCK):
+        lo, hi = offsets[start], offsets[min(start + TEXT_BLOCK, n)]
+        pos = rng.integers(0, len(pool) - (hi - lo))
+        data[lo:hi] = pool[pos : pos + (hi - lo)]
+    return _strings_from_buffer(lengths, data)
+
+
+def _random_strings(rng, n: int, min_len: int, max_len: int) -> pa.Array:
+    lengths = rng.integers(min_len, max_len + 1, n)
+    data = ALPHANUMERIC[rng.integers(0, len(ALPHANUMERIC), lengths.sum())]
+    return _strings_from_buffer(lengths, data)
+
+
+def _pick(rng, values: list, n: int) -> pa.Array:
+    return pa.array(values).take(rng.integers(0, len(values), n))
+
+
+def _padded(numbers: np.ndarray, width: int) -> pa.Array:
+    return pc.utf8_lpad(pc.cast(pa.array(numbers), pa.string()), width, "0")
+
+
+def _keyed_names(prefix: str, keys: np.ndarray) -> pa.Array:
+    return pc.binary_join_element_wise(prefix, _padded(keys, 9), "")
+
+
+def _phones(rng, nation_keys: np.ndarray) -> pa.Array:
+    n = len(nation_keys)
+    return pc.binary_join_element_wise(
+        _padded(nation_keys + 10, 2),
+        _padded(rng.integers(100, 1000, n), 3),
+        _padded(rng.integers(100, 1000, n), 3),
+        _padded(rng.integers(1000, 10000, n), 4),
+        "-",
+    )
+
+
+def _money(rng, n: int, low: float, high: float) -> np.ndarray:
+    cents = rng.integers(round(low * 100), round(high * 100) + 1, n)
+    return cents / 100
+
+
+def _dates(days: np.ndarray) -> pa.Array:
+    return pa.array(START_DATE + days.astype("timedelta64[D]"))
+
+
+def retail_price(part_keys: np.ndarray) -> np.ndarray:
+    """P_RETAILPRICE as a function of P_PARTKEY."""
+    return (90000 + (part_keys // 10) % 20001 + 100 * (part_keys % 1000)) / 100
+
+
+def part_supplier(part_keys: np.ndarray, i, scale_factor: float) -> np.ndarray:
+    """Key of the i-th (0-3) supplier of each part, as used by partsupp."""
+    n_supp = table_size("supplier", scale_factor)
+    return (part_keys + i * (n_supp // 4 + (part_keys - 1) // n_supp)) % n_supp + 1
+
+
+def order_keys(index: np.ndarray) -> np.ndarray:
+    """Sparse order keys: only the first 8 of every 32 keys are used."""
+    return (index // 8) * 32 + index % 8 + 1
+
+
+def gen_region(rng, scale_factor, start, stop):
+    return {
+        "region": pa.table(
+            {
+                "r_regionkey": np.arange(len(REGIONS), dtype=np.int64),
+                "r_name": REGIONS,
+                "r_comment": _comments(rng, len(REGIONS), 31, 115),
+            }
+        )
+    }
+
+
+def gen_nation(rng, scale_factor, start, stop):
+    return {
+        "nation": pa.table(
+            {
+                "n_nationkey": np.arange(len(NATIONS), dtype=np.int64),
+                "n_name": [name for name, _ in NATIONS],
+                "n_regionkey": np.array([key for _, key in NATIONS], dtype=np.int64),
+                "n_comment": _comments(rng, len(NATIONS), 31, 114),
+            }
+        )
+    }
+
+
+def gen_supplier(rng, scale_factor, start, stop):
+    keys = np.arange(start + 1, stop + 1, dtype=np.int64)
+    n = len(keys)
+    nation_keys = rng.integers(0, len(NATIONS), n)
+
+    # About 5 per 10,000 suppliers get complaints, as many get recommendations
+    comments = _comments(rng, n, 25, 100).to_pylist()
+    special = np.flatnonzero(rng.random(n) < 10 / SUPPLIER_BASE)
+    for row, complaint in zip(special, rng.random(len(special)) < 0.5):
+        words = comments[row].split(" ")
+        cut = rng.integers(0, len(words) + 1)
+        tail = "Complaints" if complaint else "Recommends"
+        comments[row] = " ".join(words[:cut] + ["Customer", tail] + words[cut:])
+
+    return {
+        "supplier": pa.table(
+            {
+                "s_suppkey": keys,
+                "s_name": _keyed_names("Supplier#", keys),
+                "s_address": _random_strings(rng, n, 10, 40),
+                "s_nationkey": nation_keys,
+                "s_phone": _phones(rng, nation_keys),
+                "s_acctbal": _money(rng, n, -999.99, 9999.99),
+                "s_comment": comments,
+            }
+        )
+    }
+
+
+def gen_part(rng, scale_factor, start, stop):
+    keys = np.arange(start + 1, stop + 1, dtype=np.int64)
+    n = len(keys)
+
+    # Five distinct colors per part name
+    words = np.argpartition(rng.random((n, len(COLORS))), 5, axis=1)[:, :5]
+    colors = pa.array(COLORS)
+    name = pc.binary_join_element_wise(
+        *(colors.take(words[:, i]) for i in range(5)), " "
+    )
+
+    mfgr = rng.integers(1, 6, n)
+    brand = mfgr * 10 + rng.integers(1, 6, n)
+    part_type = pc.binary_join_element_wise(
+        *(_pick(rng, syllables, n) for syllables in TYPE_SYLLABLES), " "
+    )
+    container = pc.binary_join_element_wise(
+        *(_pick(rng, syllables, n) for syllables in CONTAINER_SYLLABLES), " "
+    )
+
+    part = pa.table(
+        {
+            "p_partkey": keys,
+            "p_name": name,
+            "p_mfgr": pc.binary_join_element_wise(
+                "Manufacturer#", pc.cast(pa.array(mfgr), pa.string()), ""
+            ),
+            "p_brand": pc.binary_join_element_wise(
+                "Brand#", pc.cast(pa.array(brand), pa.string()), ""
+            ),
+            "p_type": part_type,
+            "p_size": rng.integers(1, 51, n),
+            "p_container": container,
+            "p_retailprice": retail_price(keys),
+            "p_comment": _comments(rng, n, 5, 22),
+        }
+    )
+
+    ps_partkey = np.repeat(keys, 4)
+    partsupp = pa.table(
+        {
+            "ps_partkey": ps_partkey,
+            "ps_suppkey": part_supplier(
+                ps_partkey, np.tile(np.arange(4), n), scale_factor
+            ),
+            "ps_availqty": rng.integers(1, 10000, 4 * n),
+            "ps_supplycost": _money(rng, 4 * n, 1.0, 1000.0),
+            "ps_comment": _comments(rng, 4 * n, 49, 198),
+        }
+    )
+
+    return {"part": part, "partsupp": partsupp}
+
+
+def gen_customer(rng, scale_factor, start, stop):
+    keys = np.arange(start + 1, stop + 1, dtype=np.int64)
+    n = len(keys)
+    nation_keys = rng.integers(0, len(NATIONS), n)
+
+    return {
+        "customer": pa.table(
+            {
+                "c_custkey": keys,
+                "c_name": _keyed_names("Customer#", keys),
+                "c_address": _random_strings(rng, n, 10, 40),
+                "c_nationkey": nation_keys,
+                "c_phone": _phones(rng, nation_keys),
+                "c_acctbal": _money(rng, n, -999.99, 9999.99),
+                "c_mktsegment": _pick(rng, SEGMENTS, n),
+                "c_comment": _comments(rng, n, 29, 116),
+            }
+        )
+    }
+
+
+def gen_orders(rng, scale_factor, start, stop):
+    keys = order_keys(np.arange(start, stop, dtype=np.int64))
+    n = len(keys)
+
+    # Customers whose key is a multiple of three never place orders
+    n_cust = table_size("customer", scale_factor)
+    r = rng.integers(0, max(1, n_cust - n_cust // 3), n)
+    cust_keys = r + r // 2 + 1
+    order_days = rng.integers(0, ORDER_DATE_SPAN + 1, n)
+
+    lines = rng.integers(1, 8, n)
+    starts = np.zeros(n, dtype=np.int64)
+    np.cumsum(lines[:-1], out=starts[1:])
+    total = int(lines.sum())
+
+    l_orderkey = np.repeat(keys, lines)
+    l_order_days = np.repeat(order_days, lines)
+    l_linenumber = np.arange(total) - np.repeat(starts, lines) + 1
+
+    part_keys = rng.integers(1, table_size("part", scale_factor) + 1, total)
+    supp_keys = part_supplier(part_keys, rng.integers(0, 4, total), scale_factor)
+    quantity = rng.integers(1, 51, total).astype(np.float64)
+    extended_price = np.round(quantity * retail_price(part_keys), 2)
+    discount = rng.integers(0, 11, total) / 100
+    tax = rng.integers(0, 9, total) / 100
+
+    ship_days = l_order_days + rng.integers(1, 122, total)
+    commit_days = l_order_days + rng.integers(30, 91, total)
+    receipt_days = ship_days + rng.integers(1, 31, total)
+    current_days = int((CURRENT_DATE - START_DATE).astype(np.int64))
+
+    returned = rng.random(total) < 0.5
+    return_flag = np.where(receipt_days <= current_days, np.where(returned, 0, 1), 2)
+    shipped = ship_days <= current_days
+
+    # F when every line has shipped, O when none has, P otherwise
+    n_shipped = np.add.reduceat(shipped.astype(np.int64), starts)
+    status = np.where(n_shipped == lines, 0, np.where(n_shipped == 0, 1, 2))
+    charge = extended_price * (1 + tax) * (1 - discount)
+    total_price = np.round(np.add.reduceat(charge, starts), 2)
+
+    n_clerk = max(1, int(1000 * scale_factor))
+    orders = pa.table(
+        {
+            "o_orderkey": keys,
+            "o_custkey": cust_keys,
+            "o_orderstatus": pa.array(["F", "O", "P"]).take(status),
+            "o_totalprice": total_price,
+            "o_orderdate": _dates(order_days),
+            "o_orderpriority": _pick(rng, PRIORITIES, n),
+            "o_clerk": _keyed_names("Clerk#", rng.integers(1, n_clerk + 1, n)),
+            "o_shippriority": np.zeros(n, dtype=np.int64),
+            "o_comment": _comments(rng, n, 19, 78),
+        }
+    )
+
+    lineitem = pa.table(
+        {
+            "l_orderkey": l_orderkey,
+            "l_partkey": part_keys,
+            "l_suppkey": supp_keys,
+            "l_linenumber": l_linenumber,
+            "l_quantity": quantity,
+            "l_extendedprice": extended_price,
+            "l_discount": discount,
+            "l_tax": tax,
+            "l_returnflag": pa.array(["R", "A", "N"]).take(return_flag),
+            "l_linestatus": pa.array(["O", "F"]).take(shipped.astype(np.int64)),
+            "l_shipdate": _dates(ship_days),
+            "l_commitdate": _dates(commit_days),
+            "l_receiptdate": _dates(receipt_days),
+            "l_shipinstruct": _pick(rng, INSTRUCTIONS, total),
+            "l_shipmode": _pick(rng, MODES, total),
+            "l_comment": _comments(rng, total, 10, 43),
+        }
+    )
+
+    return {"orders": orders, "lineitem": lineitem}
+
+
+# Each task generates chunks of its base table and the tables derived from it
+GENERATORS = {
+    "region": (gen_region, ["region"]),
+    "nation": (gen_nation, ["nation"]),
+    "supplier": (gen_supplier, ["supplier"]),
+    "part": (gen_part, ["part", "partsupp"]),
+    "customer": (gen_customer, ["customer"]),
+    "orders": (gen_orders, ["orders", "lineitem"]),
+}
+
+
+def _generate_chunk(task, scale_factor, seed, chunk, start, stop):
+    func, _ = GENERATORS[task]
+    rng = np.random.default_rng([seed, list(GENERATORS).index(task), chunk])
+    return func(rng, scale_factor, start, stop)
+
+
+def _chunks(task, scale_factor, chunk_size):
+    if task in ("region", "nation"):
+        return [(0, 0, 0)]
+    n = table_size(task, scale_factor)
+    return [
+        (i, start, min(start + chunk_size, n))
+        for i, start in enumerate(range(0, n, chunk_size))
+    ]
+
+
+class _TblWriter:
+    """Writes pipe-delimited rows with dbgen's trailing delimiter."""
+
+    def __init__(self, path: str, schema: pa.Schema):
+        self.schema = schema.append(pa.field("", pa.string()))
+        self.writer = csv.CSVWriter(
+            path,
+            self.schema,
+            write_options=csv.WriteOptions(
+                include_header=False, delimiter="|", quoting_style="none"
+            ),
+        )
+
+    def write_table(self, table: pa.Table) -> None:
+        self.writer.write_table(
+            table.append_column("", pa.nulls(table.num_rows, pa.string()))
+        )
+
+    def close(self) -> None:
+        self.writer.close()
+
+
+def generate(
+    scale_factor: float,
+    output_path: str = None,
+    fmt: str = "tbl",
+    tables: list = None,
+    processes: int = None,
+    seed: int = 0,
+    chunk_size: int = CHUNK_SIZE,
+) -> str:
+    """Generate the requested tables into output_path and return the path."""
+    if output_path is None:
+        output_path = utils.get_scale_factor_path(scale_factor)
+    tables = tables or TABLES
+    os.makedirs(output_path, exist_ok=True)
+
+    tasks = [
+        (task, chunk, start, stop)
+        for task, (_, produced) in GENERATORS.items()
+        if any(table in tables for table in produced)
+        for chunk, start, stop in _chunks(task, scale_factor, chunk_size)
+    ]
+
+    writers = {}
+    processes = processes or os.cpu_count()
+    # Forked workers inherit the text pool instead of each building their own
+    get_text_pool()
+    with ProcessPoolExecutor(max_workers=processes) as executor:
+        # Chunks are written in order; bounding the in-flight window keeps
+        # memory proportional to the chunk size rather than the table size.
+        pending = deque()
+        tasks = iter(tasks)
+        for task in tasks:
+            pending.append(
+                executor.submit(_generate_chunk, task[0], scale_factor, seed, *task[1:])
+            )
+            if len(pending) < 2 * processes:
+                continue
+            _write_chunk(pending.popleft().result(), tables, writers, output_path, fmt)
+        while pending:
+            _write_chunk(pending.popleft().result(), tables, writers, output_path, fmt)
+
+    for writer in writers.values():
+        writer.close()
+
+    return output_path
+
+
+def _write_chunk(chunk: dict, tables: list, writers: dict, output_path: str, fmt):
+    for table_name, table in chunk.items():
+        if table_name not in tables:
+            continue
+        if table_name not in writers:
+            path = os.path.join(output_path, f"{table_name}.{fmt}")
+            if fmt == "parquet":
+                writers[table_name] = pq.ParquetWriter(path, table.schema)
+            else:
+                writers[table_name] = _TblWriter(path, table.schema)
+        writers[table_name].write_table(table)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate TPC-H tables")
+    parser.add_argument(
+        "-s",
+        "--scale-factor",
+        type=float,
+        default=1.0,
+        help="Scale factor (default: 1)",
+    )
+    parser.add_argument(
+        "-o",
+        "--output",
+        default=None,
+        help="Output directory (default: ./TPC-H/sf<scale factor>/tables)",
+    )
+    parser.add_argument(
+        "-f",
+        "--format",
+        choices=["tbl", "parquet"],
+        default="tbl",
+        help="Output format (default: tbl)",
+    )
+    parser.add_argument(
+        "-t",
+        "--tables",
+        nargs="+",
+        choices=TABLES,
+        default=None,
+        help="Tables to generate (default: all)",
+    )
+    parser.add_argument(
+        "-j",
+        "--processes",
+        type=int,
+        default=None,
+        help="Number of worker processes (default: number of CPUs)",
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Random seed")
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=CHUNK_SIZE,
+        help="Base-table rows generated per chunk",
+    )
+    args = parser.parse_args()
+
+    path = generate(
+        args.scale_factor,
+        output_path=args.output,
+        fmt=args.format,
+        tables=args.tables,
+        processes=args.processes,
+        seed=args.seed,
+        chunk_size=args.chunk_size,
+    )
+    print(f"Generated TPC-H SF{args.scale_factor:g} tables in {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,214 @@
+"""Numba kernels of the pandas_numba backend, and their inputs.
+
+The kernels run over plain NumPy arrays: the columns they read are converted
+once, categoricals to their codes and dates to days since the epoch.
+
+Joins and group-bys of integer keys go through a table of the keys of one
+side. Keys whose range is small enough are addressed directly by their offset
+from the smallest key, others are hashed into a power of two slots and probed
+linearly. Joins give the positions of the matching rows of both sides, so that
+the queries only take the columns they need, and only of those rows.
+"""
+
+from datetime import date
+
+import numba
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+EPOCH = date(1970, 1, 1)
+# Key ranges of up to this many slots per key are addressed directly, as the
+# order keys (8 out of every 32 values) are
+DENSE_SLOTS_PER_KEY = 4
+HASH_MULTIPLIER = np.uint64(0x9E3779B97F4A7C15)
+
+
+def to_numpy(values: pd.Series) -> np.ndarray:
+    """Get the values of a column as an array a kernel can read."""
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        return values.cat.codes.to_numpy()
+
+    array = pa.array(values)
+    if pa.types.is_date32(array.type):
+        array = array.cast(pa.int32())
+    # Arrow columns come in chunks, joined in a single array
+    return array.to_numpy()
+
+
+def days(day: date) -> int:
+    """Get a date as days since the epoch, as to_numpy gives dates."""
+    return (day - EPOCH).days
+
+
+def _layout(keys: np.ndarray) -> tuple:
+    """Get the smallest key, the number of slots and whether they are direct."""
+    if not len(keys):
+        return 0, 1, True
+    low, high = int(keys.min()), int(keys.max())
+    if high - low < DENSE_SLOTS_PER_KEY * len(keys):
+        return low, high - low + 1, True
+    # At least twice as many slots as keys, so that probes stay short
+    return low, 1 << (2 * len(keys) - 1).bit_length(), False
+
+
+@numba.njit(cache=True)
+def _find_slot(key, low, dense, slot_keys):
+    """Get the slot of a key, or the empty slot it would take."""
+    if dense:
+        return key - low
+    # Empty slots hold a key below the smallest one
+    mask = len(slot_keys) - 1
+    slot = np.int64((np.uint64(key) * HASH_MULTIPLIER) >> np.uint64(32)) & mask
+    while slot_keys[slot] != key and slot_keys[slot] != low - 1:
+        slot = (slot + 1) & mask
+    return slot
+
+
+@numba.njit(cache=True)
+def _head(key, low, dense, heads, slot_keys):
+    """Get the first row of a key, -1 if it has none."""
+    if dense:
+        if not 0 <= key - low < len(heads):
+            return -1
+        return heads[key - low]
+    # The key marking empty slots, low - 1, is in none of them
+    if key < low:
+        return -1
+    slot = _find_slot(key, low, dense, slot_keys)
+    return heads[slot] if slot_keys[slot] == key else -1
+
+
+@numba.njit(cache=True)
+def _build(keys, low, size, dense):
+    """Chain the rows of every key, from the slot of the key."""
+    heads = np.full(size, -1, dtype=np.int64)
+    slot_keys = np.full(0 if dense else size, low - 1, dtype=keys.dtype)
+    nexts = np.empty(len(keys), dtype=np.int64)
+    # Rows are added from the last, so that every chain lists them in order
+    for row in range(len(keys) - 1, -1, -1):
+        slot = _find_slot(keys[row], low, dense, slot_keys)
+        if not dense:
+            slot_keys[slot] = keys[row]
+        nexts[row] = heads[slot]
+        heads[slot] = row
+    return heads, slot_keys, nexts
+
+
+@numba.njit(parallel=True, cache=True)
+def _probe(keys, low, dense, heads, slot_keys, nexts, num_blocks):
+    """Get the positions of the rows of keys and of the table rows they match.
+
+    The keys are split in num_blocks blocks, one per thread. Keys are looked
+    up and their matches counted first, so that every block then writes its
+    own part of the output, which lists the matches in the order of the keys.
+    """
+    num_rows = len(keys)
+    block_rows = (num_rows + num_blocks - 1) // num_blocks
+    firsts = np.empty(num_rows, dtype=np.int64)
+    counts = np.zeros(num_blocks + 1, dtype=np.int64)
+    for block in numba.prange(num_blocks):
+        for i in range(block * block_rows, min((block + 1) * block_rows, num_rows)):
+            row = firsts[i] = _head(keys[i], low, dense, heads, slot_keys)
+            while row != -1:
+                counts[block + 1] += 1
+                row = nexts[row]
+
+    offsets = np.cumsum(counts)
+    left_rows = np.empty(offsets[-1], dtype=np.int64)
+    right_rows = np.empty(offsets[-1], dtype=np.int64)
+    for block in numba.prange(num_blocks):
+        out = offsets[block]
+        for i in range(block * block_rows, min((block + 1) * block_rows, num_rows)):
+            row = firsts[i]
+            while row != -1:
+                left_rows[out] = i
+                right_rows[out] = row
+                out += 1
+                row = nexts[row]
+    return left_rows, right_rows
+
+
+@numba.njit(cache=True)
+def _build_set(keys, low, size, dense):
+    """Mark the slots of the keys, which only need to be found."""
+    present = np.zeros(size if dense else 0, dtype=np.bool_)
+    slot_keys = np.full(0 if dense else size, low - 1, dtype=keys.dtype)
+    for key in keys:
+        if dense:
+            present[key - low] = True
+        else:
+            slot_keys[_find_slot(key, low, dense, slot_keys)] = key
+    return present, slot_keys
+
+
+@numba.njit(parallel=True, cache=True)
+def _contains(values, low, dense, present, slot_keys):
+    found = np.empty(len(values), dtype=np.bool_)
+    for i in numba.prange(len(values)):
+        key = values[i]
+        if dense:
+            found[i] = 0 <= key - low < len(present) and present[key - low]
+        else:
+            # The key marking empty slots, low - 1, is in none of them
+            found[i] = (
+                key >= low and slot_keys[_find_slot(key, low, dense, slot_keys)] == key
+            )
+    return found
+
+
+@numba.njit(cache=True)
+def _group(keys, low, size, dense):
+    ids = np.full(size, -1, dtype=np.int64)
+    slot_keys = np.full(0 if dense else size, low - 1, dtype=keys.dtype)
+    groups = np.empty(len(keys), dtype=np.int64)
+    firsts = np.empty(len(keys), dtype=np.int64)
+    num_groups = 0
+    for row in range(len(keys)):
+        slot = _find_slot(keys[row], low, dense, slot_keys)
+        if ids[slot] == -1:
+            if not dense:
+                slot_keys[slot] = keys[row]
+            ids[slot] = num_groups
+            firsts[num_groups] = row
+            num_groups += 1
+        groups[row] = ids[slot]
+    return groups, firsts[:num_groups]
+
+
+def join(left: np.ndarray, right: np.ndarray) -> tuple:
+    """Join two arrays of integer keys, getting the positions of the matches.
+
+    The table is built from right, which should be the smaller side, and
+    probed in parallel with left. Returns the positions in left and in right
+    of every matching pair, in the order of left.
+    """
+    low, size, dense = _layout(right)
+    heads, slot_keys, nexts = _build(right, low, size, dense)
+    return _probe(left, low, dense, heads, slot_keys, nexts, numba.get_num_threads())
+
+
+def is_in(values: np.ndarray, keys: np.ndarray) -> np.ndarray:
+    """Test which values are among the integer keys, which may repeat."""
+    low, size, dense = _layout(keys)
+    present, slot_keys = _build_set(keys, low, size, dense)
+    return _contains(values, low, dense, present, slot_keys)
+
+
+def group_by(keys: np.ndarray) -> tuple:
+    """Number the groups of integer keys in the order they first appear.
+
+    Returns the group of every row, which group_sum aggregates, and the
+    position of the first row of every group.
+    """
+    low, size, dense = _layout(keys)
+    return _group(keys, low, size, dense)
+
+
+@numba.njit(cache=True)
+def group_sum(groups, values, num_groups):
+    """Sum values by the groups numbered by group_by."""
+    sums = np.zeros(num_groups)
+    for i in range(len(groups)):
+        sums[groups[i]] += values[i]
+    return sums
@@ -0,0 +1,336 @@
+import importlib
+import os
+import pkgutil
+import sys
+
+import pyperf
+
+from dask import is_dask_collection
+from tpch import utils, validate
+
+# Backend package name -> loader mode
+BACKENDS = {
+    "pandas": "pandas",
+    "dask": "dask",
+    "cudf": "cudf",
+    "dask_cudf": "cudask",
+    "pandas_chunked": "chunked",
+    "pandas_parallel": "partitioned",
+    "pandas_numba": "pandas",
+}
+QUERIES = list(range(1, 23))
+# Every query is timed in three separate steps
+STEPS = ["load", "compute", "materialize"]
+DASK_BACKENDS = ["dask", "dask_cudf"]
+
+# Tables loaded by this process, keyed by query module
+_loaded_tables = {}
+
+
+def load_tables(module) -> tuple:
+    tables = module.get_ds()
+    return tables if isinstance(tables, tuple) else (tables,)
+
+
+def get_tables(module) -> tuple:
+    """Load the tables of a query once per process."""
+    if module.__name__ not in _loaded_tables:
+        _loaded_tables[module.__name__] = load_tables(module)
+
+    # Shallow copies, so that columns added by a query do not leak into the
+    # next run. Chunked and partitioned tables are re-read by every run anyway.
+    return tuple(
+        (
+            table
+            if isinstance(table, (utils.TableChunks, utils.TablePartitions))
+            else table.copy(deep=False)
+        )
+        for table in _loaded_tables[module.__name__]
+    )
+
+
+def get_queries(backend: str) -> list:
+    """Get the queries implemented by a backend."""
+    package = importlib.import_module(f"tpch.{backend}")
+    return sorted(
+        int(module.name[1:])
+        for module in pkgutil.iter_modules(package.__path__)
+        if module.name.startswith("q")
+    )
+
+
+def materialize(result, how: str = "compute"):
+    """Execute lazy results and bring them to host memory as pandas.
+
+    With how="persist" dask results are only executed and kept on the workers.
+    """
+    if is_dask_collection(result):
+        if how == "persist":
+            from dask.distributed import wait
+
+            result = result.persist()
+            wait(result)
+            return result
+        result = result.compute()
+    if hasattr(result, "to_pandas"):
+        result = result.to_pandas()
+    return result
+
+
+def time_load(loops, module):
+    t0 = pyperf.perf_counter()
+    for _ in range(loops):
+        load_tables(module)
+    return pyperf.perf_counter() - t0
+
+
+def time_compute(loops, module):
+    elapsed = 0
+    for _ in range(loops):
+        tables = get_tables(module)
+        t0 = pyperf.perf_counter()
+        module.query(*tables)
+        elapsed += pyperf.perf_counter() - t0
+    return elapsed
+
+
+def time_materialize(loops, module, how="compute"):
+    elapsed = 0
+    for _ in range(loops):
+        result = module.query(*get_tables(module))
+        t0 = pyperf.perf_counter()
+        materialize(result, how)
+        elapsed += pyperf.perf_counter() - t0
+    return elapsed
+
+
+def get_graph_stats(module, how: str = "compute") -> dict:
+    """Run a dask query once, counting the tasks of its graph and those executed.
+
+    Executed tasks include the ones of intermediate results that the query
+    computes eagerly.
+    """
+    from dask.distributed import get_task_stream
+
+    with get_task_stream() as task_stream:
+        result = module.query(*get_tables(module))
+        graph_tasks = len(result.__dask_graph__()) if is_dask_collection(result) else 0
+        materialize(result, how)
+
+    return {"dask_graph_tasks": graph_tasks, "dask_tasks": len(task_stream.data)}
+
+
+TIMERS = {
+    "load": time_load,
+    "compute": time_compute,
+    "materialize": time_materialize,
+}
+
+
+def check_results(args) -> None:
+    """Run every query once to export, record or validate its result."""
+    failures = []
+    for q_num in args.queries:
+        module = importlib.import_module(f"tpch.{args.backend}.q{q_num}")
+        result = module.query(*load_tables(module))
+
+        if args.export:
+            # Exported as returned, cuDF and dask results are streamed to disk
+            extension = utils.EXPORT_FORMATS[args.export_format]
+            os.makedirs(utils.EXPORT_PATH, exist_ok=True)
+            utils.export_df(result, f"q{q_num}.{extension}", fmt=args.export_format)
+
+        if args.record_answers or args.validate:
+            result = materialize(result)
+
+        if args.record_answers:
+            path = validate.record_answer(result, q_num, args.answers_path)
+            print(f"Recorded the answer of q{q_num} in {path}")
+        elif args.validate:
+            error = validate.check_answer(
+                result, q_num, args.answers_path, rtol=args.rtol, atol=args.atol
+            )
+            if error:
+                failures.append(f"q{q_num}: {error}")
+
+    if failures:
+        sys.exit(
+            f"{args.backend} returned wrong answers, no timings reported:\n"
+            + "\n".join(failures)
+        )
+
+
+def add_cmdline_args(cmd, args):
+    """Forward the TPC-H options to the pyperf worker processes."""
+    cmd.append(args.backend)
+    cmd.extend(["--queries", *map(str, args.queries)])
+    # Workers do not inherit the environment, pass the resolved path instead
+    cmd.extend(["--data-path", args.data_path])
+    cmd.extend(["--steps", *args.steps])
+    cmd.extend(["--dask-materialize", args.dask_materialize])
+    cmd.extend(["--partitions", str(args.partitions)])
+
+
+def main():
+    runner = pyperf.Runner(
+        add_cmdline_args=add_cmdline_args,
+        # Workers are started the same way, so that tpch is importable
+        program_args=("-m", "tpch"),
+    )
+
+    runner.argparser.add_argument(
+        "backend",
+        nargs="?",
+        choices=list(BACKENDS),
+        default="pandas",
+        help="Backend to run the queries with (default: pandas)",
+    )
+    runner.argparser.add_argument(
+        "--queries",
+        type=int,
+        nargs="+",
+        choices=QUERIES,
+        default=None,
+        metavar="N",
+        help="Queries to run (default: all those of the backend)",
+    )
+    runner.argparser.add_argument(
+        "--steps",
+        nargs="+",
+        choices=STEPS,
+        default=STEPS,
+        help="Steps to time separately (default: all)",
+    )
+    runner.argparser.add_argument(
+        "--dask-materialize",
+        choices=["compute", "persist"],
+        default="compute",
+        help="Collect dask results to the client or only persist them on the "
+        "workers (default: compute)",
+    )
+    runner.argparser.add_argument(
+        "--partitions",
+        type=int,
+        default=utils.PARTITIONS,
+        help="Worker processes of pandas_parallel, and partitions of its tables "
+        "(default: the number of CPUs)",
+    )
+    runner.argparser.add_argument(
+        "-s",
+        "--scale-factor",
+        type=float,
+        default=None,
+        help="Read the tables generated by tpch.dbgen at this scale factor "
+        f"(default: {utils.ROOT_PATH})",
+    )
+    runner.argparser.add_argument(
+        "--data-path",
+        default=None,
+        help=f"Directory of the tables (default: {utils.ROOT_PATH})",
+    )
+    runner.argparser.add_argument(
+        "-r",
+        "--repetitions",
+        type=int,
+        default=None,
+        help="Timed runs per worker process (alias of --values)",
+    )
+    runner.argparser.add_argument(
+        "--export",
+        action="store_true",
+        help=f"Export the result of every query to {utils.EXPORT_PATH}",
+    )
+    runner.argparser.add_argument(
+        "--export-format",
+        choices=list(utils.EXPORT_FORMATS),
+        default="tbl",
+        help="Format of the exported results (default: tbl)",
+    )
+    runner.argparser.add_argument(
+        "--validate",
+        action="store_true",
+        help="Check the answers against the reference answers before timing",
+    )
+    runner.argparser.add_argument(
+        "--record-answers",
+        action="store_true",
+        help="Store the answers as the reference answers, without timing",
+    )
+    runner.argparser.add_argument(
+        "--answers-path",
+        default=None,
+        help="Directory of the reference answers (default: answers next to "
+        "the tables directory)",
+    )
+    runner.argparser.add_argument(
+        "--rtol",
+        type=float,
+        default=validate.RTOL,
+        help=f"Relative tolerance of numbers (default: {validate.RTOL})",
+    )
+    runner.argparser.add_argument(
+        "--atol",
+        type=float,
+        default=validate.ATOL,
+        help=f"Absolute tolerance of numbers (default: {validate.ATOL})",
+    )
+    args = runner.parse_args()
+
+    available = get_queries(args.backend)
+    if args.queries is None:
+        args.queries = available
+    missing = sorted(set(args.queries) - set(available))
+    if missing:
+        runner.argparser.error(f"{args.backend} does not implement queries {missing}")
+
+    if args.repetitions:
+        args.values = args.repetitions
+    if args.data_path is None and args.scale_factor is not None:
+        args.data_path = utils.get_scale_factor_path(args.scale_factor)
+    args.data_path = utils.ROOT_PATH = args.data_path or utils.ROOT_PATH
+    utils.PARTITIONS = args.partitions
+
+    # Results are checked once by the main process, before any worker starts
+    if not args.worker and (args.export or args.validate or args.record_answers):
+        check_results(args)
+        if args.record_answers:
+            return
+
+    if args.worker and args.backend in DASK_BACKENDS:
+        from dask.distributed import Client
+
+        client = Client()  # noqa: F841
+
+    # pyperf runs a single benchmark per worker process, numbered in the order
+    # they are registered
+    task = 0
+    for q_num in args.queries:
+        module = importlib.import_module(f"tpch.{args.backend}.q{q_num}")
+
+        for step in args.steps:
+            name = f"{args.backend}-q{q_num}-{step}"
+            if step != "materialize":
+                runner.bench_time_func(name, TIMERS[step], module)
+                task += 1
+                continue
+
+            metadata = None
+            if args.backend in DASK_BACKENDS:
+                metadata = {"dask_materialize": args.dask_materialize}
+                # Task counts come from an extra run, only done by the worker
+                # that times this benchmark
+                if args.worker and args.worker_task == task:
+                    metadata.update(get_graph_stats(module, args.dask_materialize))
+
+            runner.bench_time_func(
+                name,
+                time_materialize,
+                module,
+                args.dask_materialize,
+                metadata=metadata,
+            )
+            task += 1
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,333 @@
+"""Relational operators shared by the query implementations.
+
+They take pandas, cuDF, dask or dask_cudf DataFrames alike. Dask collections
+are handled partition by partition, so that the operators never shuffle.
+"""
+
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from dask import dataframe as dd
+from dask import delayed, is_dask_collection
+
+# Bits per key of the Bloom filters, and their hash functions: at most about
+# 2% of the values that are not keys still pass the filter
+BLOOM_BITS_PER_KEY = 10
+BLOOM_MULTIPLIERS = np.array(
+    [0x9E3779B97F4A7C15, 0xC2B2AE3D27D4EB4F, 0x165667B19E3779F9], dtype=np.uint64
+)
+# Rows of a string column matched at a time by each thread of like
+LIKE_CHUNK_ROWS = 1 << 18
+
+
+def top_k(df, n: int, by, ascending=True):
+    """Get the first n rows of df sorted by the given keys.
+
+    Same as df.sort_values(by, ascending=ascending).head(n), except that only
+    the candidate rows are sorted: those whose first key is not beyond its
+    n-th value. Dask takes the top n of every partition, then of their union.
+    """
+    if is_dask_collection(df):
+        return (
+            df.map_partitions(top_k, n, by, ascending)
+            .repartition(npartitions=1)
+            .map_partitions(top_k, n, by, ascending)
+        )
+
+    if n <= 0:
+        return df.head(0)
+
+    by = [by] if isinstance(by, str) else list(by)
+    ascending = [ascending] * len(by) if isinstance(ascending, bool) else ascending
+
+    first = df[by[0]]
+    if len(df) > n and pd.api.types.is_numeric_dtype(first.dtype):
+        # Partial selection of the first key, keeping the rows that tie with
+        # the n-th value for the other keys to order
+        selected = first.nsmallest(n) if ascending[0] else first.nlargest(n)
+        # Missing values sort last, they only matter when fewer than n are set,
+        # which the selection may pad with missing values
+        if len(selected) == n and pd.notna(selected.iloc[-1]):
+            bound = selected.iloc[-1]
+            df = df[first <= bound] if ascending[0] else df[first >= bound]
+
+    return df.sort_values(by, ascending=ascending).head(n)
+
+
+def shared(df):
+    """Make an intermediate result used more than once by a query computed once.
+
+    Dask would derive it again for every use, its optimizer giving each use its
+    own projection of the inputs: the collection is persisted instead, so that
+    every use reads the same partitions. Other frames are returned as is.
+    """
+    return df.persist() if is_dask_collection(df) else df
+
+
+def one_row(**columns):
+    """Make a frame of one row from the scalar results of a query, such as sums.
+
+    Dask scalars are kept lazy, each as a series of one row: the frame is
+    computed with them when the result is materialized.
+    """
+    if not any(is_dask_collection(value) for value in columns.values()):
+        return pd.DataFrame({name: [value] for name, value in columns.items()})
+
+    frames = [value.to_series().to_frame(name) for name, value in columns.items()]
+    return frames[0] if len(frames) == 1 else dd.concat(frames, axis=1)
+
+
+def _like_kernel(pattern: str):
+    """Get the Arrow kernel, and its pattern, matching strings like pattern."""
+    literal = pattern.strip("%")
+    if "%" not in literal and "_" not in literal:
+        prefix, suffix = pattern.startswith("%"), pattern.endswith("%")
+        if not (prefix or suffix):
+            return pc.equal, literal
+        if suffix and not prefix:
+            return pc.starts_with, literal
+        if prefix and not suffix:
+            return pc.ends_with, literal
+
+    # Other patterns, substrings included, are searched for by RE2, without
+    # the anchors and leading .* that match_like would give their regex
+    regex = ".*".join(re.escape(part).replace("_", ".") for part in pattern.split("%"))
+    regex = regex[2:] if pattern.startswith("%") else "^" + regex
+    regex = regex[:-2] if pattern.endswith("%") else regex + "$"
+    return pc.match_substring_regex, "(?s)" + regex
+
+
+def _match_chunk(strings, kernel, pattern: str) -> np.ndarray:
+    return kernel(strings, pattern).fill_null(False).to_numpy(zero_copy_only=False)
+
+
+def _match_like(strings, pattern: str) -> np.ndarray:
+    """Match an Arrow string array against a LIKE pattern, missing values not."""
+    kernel, pattern = _like_kernel(pattern)
+    threads = min(os.cpu_count(), -(-len(strings) // LIKE_CHUNK_ROWS))
+    if threads <= 1:
+        return _match_chunk(strings, kernel, pattern)
+
+    # The Arrow kernels release the GIL, so slices of the strings are matched
+    # in parallel
+    offsets = range(0, len(strings), LIKE_CHUNK_ROWS)
+    chunks = [strings.slice(offset, LIKE_CHUNK_ROWS) for offset in offsets]
+    with ThreadPoolExecutor(threads) as pool:
+        matches = pool.map(lambda chunk: _match_chunk(chunk, kernel, pattern), chunks)
+        return np.concatenate(list(matches))
+
+
+def _like(series, pattern: str):
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        # Only the categories are matched, their codes pick the rows
+        categories = pa.array(series.cat.categories, type=pa.string())
+        codes = series.cat.codes.to_numpy()
+        matches = np.append(_match_like(categories, pattern), False)
+        return pd.Series(matches[codes], index=series.index, name=series.name)
+
+    if isinstance(series.dtype, pd.ArrowDtype):
+        # The Arrow data of the column, without a copy
+        strings = series.array.__arrow_array__()
+    else:
+        strings = pa.array(series, type=pa.string(), from_pandas=True)
+    matches = _match_like(strings, pattern)
+    return pd.Series(matches, index=series.index, name=series.name)
+
+
+def like(series, pattern: str):
+    """Test which strings match a SQL LIKE pattern, as in WHERE col LIKE pattern.
+
+    % stands for any characters and _ for any one character. The strings are
+    always matched by the Arrow kernels, never one by one in Python: prefixes
+    and suffixes are compared as such, other patterns searched for by RE2. Long
+    columns are matched by several threads, categoricals by their categories.
+    Returns a boolean series, which dask computes partition by partition.
+    """
+    if is_dask_collection(series):
+        meta = pd.Series(dtype=bool, name=series.name)
+        return series.map_partitions(_like, pattern, meta=meta)
+
+    return _like(series, pattern)
+
+
+def _add_group_values(df, by: str, groups, name: str):
+    return df.assign(**{name: df[by].map(groups)})
+
+
+def group_broadcast(df, by: str, column: str, func: str, name: str):
+    """Add the aggregate of a column over the groups of by to every row.
+
+    Same as merging df back with df.groupby(by)[column].agg(func) on by, as
+    correlated subqueries are, without the merge. Dask sends the aggregates,
+    gathered in a single partition, to every partition of df to look them up.
+    """
+    if is_dask_collection(df):
+        groups = df.groupby(by)[column].agg(func).repartition(npartitions=1)
+        meta = _add_group_values(df._meta, by, groups._meta, name)
+        return df.map_partitions(_add_group_values, by, groups, name, meta=meta)
+
+    return df.assign(**{name: df.groupby(by)[column].transform(func)})
+
+
+def _is_in(values, keys):
+    """Test which values are among the keys, which may repeat."""
+    if (
+        isinstance(values, pd.Series)
+        and pd.api.types.is_integer_dtype(values.dtype)
+        and len(keys)
+        and not (values.hasnans or keys.hasnans)
+    ):
+        values = values.to_numpy()
+        keys = keys.to_numpy()
+        # Dense integer keys: look the values up in a bitmap over the range
+        # of the keys, rather than hashing or sorting them
+        if int(keys.max()) - int(keys.min()) <= 8 * (len(values) + len(keys)):
+            return np.isin(values, keys, kind="table")
+        return np.isin(values, np.unique(keys))
+    return values.isin(keys)
+
+
+def _keep_rows(df, column: str, keys, keep: bool):
+    is_in = _is_in(df[column], keys)
+    return df[is_in if keep else ~is_in]
+
+
+def _filter_by_keys(left, right, on, left_on, right_on, keep: bool):
+    left_on = left_on or on
+    right_on = right_on or on
+    keys = right[right_on]
+
+    if is_dask_collection(left):
+        # The keys are gathered in a single partition, which dask sends to
+        # every partition of left
+        if is_dask_collection(keys):
+            keys = keys.repartition(npartitions=1)
+        return left.map_partitions(_keep_rows, left_on, keys, keep, meta=left._meta)
+    if is_dask_collection(keys):
+        keys = keys.compute()
+
+    return _keep_rows(left, left_on, keys, keep)
+
+
+def semi_join(left, right, on: str = None, left_on: str = None, right_on: str = None):
+    """Get the rows of left whose key is in right, as in WHERE EXISTS.
+
+    Only the keys of right are collected: no row of left is repeated and none
+    of the columns of right is added.
+    """
+    return _filter_by_keys(left, right, on, left_on, right_on, keep=True)
+
+
+def anti_join(left, right, on: str = None, left_on: str = None, right_on: str = None):
+    """Get the rows of left whose key is not in right, as in WHERE NOT EXISTS."""
+    return _filter_by_keys(left, right, on, left_on, right_on, keep=False)
+
+
+def _gather_rows(df, table, left_on: str, right_on: str):
+    rows = table.set_index(right_on, drop=False).loc[df[left_on]]
+    df = df.reset_index(drop=True)
+    rows = rows.reset_index(drop=True)
+    return df.assign(**{col: rows[col] for col in rows.columns})
+
+
+def gather(df, table, on: str = None, left_on: str = None, right_on: str = None):
+    """Add the columns of table to the rows of df, looked up by their key.
+
+    Queries join and filter on the keys only, and gather the wide columns of
+    their result, such as names, addresses and comments, once the few rows
+    left are known. The key must be unique in table, every row of df keeps its
+    place. Dask gathers the rows of table with a key of df in a single
+    partition, sent to every partition of df.
+    """
+    left_on = left_on or on
+    right_on = right_on or on
+
+    if is_dask_collection(df):
+        rows = semi_join(table, df, left_on=right_on, right_on=left_on)
+        rows = rows.repartition(npartitions=1)
+        meta = _gather_rows(df._meta, rows._meta, left_on, right_on)
+        return df.map_partitions(_gather_rows, rows, left_on, right_on, meta=meta)
+    if is_dask_collection(table):
+        table = table.compute()
+
+    return _gather_rows(df, table, left_on, right_on)
+
+
+class KeyFilter:
+    """Probe integer values against a set of keys, without false negatives.
+
+    Keys dense enough to fit in twice the bits a Bloom filter would take are
+    kept exactly, in a bitmap over their range. Sparser keys go in a Bloom
+    filter, which lets a few values that are not keys through.
+    """
+
+    def __init__(self, keys):
+        keys = np.unique(np.asarray(keys))
+        self.low = int(keys[0]) if len(keys) else 0
+        self.high = int(keys[-1]) if len(keys) else -1
+        num_bits = 1 << int(max(len(keys), 1) * BLOOM_BITS_PER_KEY).bit_length()
+
+        self.exact = self.high - self.low < 2 * num_bits
+        if self.exact:
+            self.bits = np.zeros(max(self.high - self.low + 1, 1), dtype=bool)
+            self.bits[keys - self.low] = True
+        else:
+            self.shift = np.uint64(64 - num_bits.bit_length() + 1)
+            self.bits = np.zeros(num_bits, dtype=bool)
+            for multiplier in BLOOM_MULTIPLIERS:
+                self.bits[keys.astype(np.uint64) * multiplier >> self.shift] = True
+
+    def probe(self, values: np.ndarray) -> np.ndarray:
+        """Test which values may be keys."""
+        if self.exact:
+            offsets = values - self.low
+            hits = (offsets >= 0) & (offsets < len(self.bits))
+            hits[hits] = self.bits[offsets[hits]]
+            return hits
+
+        values = values.astype(np.uint64)
+        # Only the few values that pass the first hash function are tested
+        # against the next ones
+        rows = np.flatnonzero(self.bits[values * BLOOM_MULTIPLIERS[0] >> self.shift])
+        candidates = values[rows]
+        for multiplier in BLOOM_MULTIPLIERS[1:]:
+            passed = self.bits[candidates * multiplier >> self.shift]
+            rows, candidates = rows[passed], candidates[passed]
+        hits = np.zeros(len(values), dtype=bool)
+        hits[rows] = True
+        return hits
+
+
+def _probe_rows(df, column: str, key_filter: KeyFilter):
+    return df[key_filter.probe(df[column].to_numpy())]
+
+
+def prefilter(left, right, on: str = None, left_on: str = None, right_on: str = None):
+    """Drop most rows of left whose key is not in the much smaller right.
+
+    Meant to be followed by the join of left and right on the same keys: the
+    Bloom filter built from the keys of right may keep some rows that do not
+    join. Keys that are not integers, and cuDF frames, are semi-joined.
+    """
+    left_on = left_on or on
+    right_on = right_on or on
+    meta = left._meta if is_dask_collection(left) else left
+    if not (
+        isinstance(meta, pd.DataFrame)
+        and pd.api.types.is_integer_dtype(meta[left_on].dtype)
+    ):
+        return semi_join(left, right, left_on=left_on, right_on=right_on)
+
+    if is_dask_collection(left):
+        # The filter is built once from the keys of right, then sent to every
+        # partition of left instead of the keys
+        key_filter = delayed(KeyFilter)(right[right_on])
+        return left.map_partitions(_probe_rows, left_on, key_filter, meta=meta)
+
+    return _probe_rows(left, left_on, KeyFilter(right[right_on]))
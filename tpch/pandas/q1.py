@@ -1,26 +1,34 @@
-import pyperf
-
 from datetime import date
 from tpch.utils import (
     get_line_item_ds,
-    export_df,
 )
 
 Q_NUM = 1
 
 
 def get_ds():
-    lineitem = get_line_item_ds()
+    lineitem = get_line_item_ds(
+        columns=[
+            "l_quantity",
+            "l_extendedprice",
+            "l_discount",
+            "l_tax",
+            "l_returnflag",
+            "l_linestatus",
+            "l_shipdate",
+        ],
+        filters=[("l_shipdate", "<=", date(1998, 9, 2))],
+        clustered=True,
+    )
     return lineitem
 
 
-def query():
-    lineitem = get_ds()
+def query(lineitem):
     q_final = (
         lineitem[lineitem["l_shipdate"] <= date(1998, 9, 2)]
         .assign(disc_price=lambda df: df["l_extendedprice"] * (1 - df["l_discount"]))
         .assign(charge=lambda df: df["disc_price"] * (1 + df["l_tax"]))
-        .groupby(["l_returnflag", "l_linestatus"], as_index=False)
+        .groupby(["l_returnflag", "l_linestatus"], as_index=False, observed=True)
         .agg(
             sum_qty=("l_quantity", "sum"),
             sum_base_price=("l_extendedprice", "sum"),
@@ -35,21 +43,3 @@ def query():
     )
 
     return q_final
-
-
-def bench_q1():
-    t0 = pyperf.perf_counter()
-    query()
-    return pyperf.perf_counter() - t0
-
-
-if __name__ == "__main__":
-    runner = pyperf.Runner()
-    runner.argparser.set_defaults(
-        quiet=False, loops=1, values=1, processes=1, warmups=0
-    )
-    runner.bench_func("pandas-q1", bench_q1)
-    # result = query()
-    #
-    # file_name = "q" + str(Q_NUM) + ".out"
-    # export_df(result, file_name)
@@ -1,53 +1,61 @@
-import pyperf
-
 from datetime import date
 from tpch.utils import (
     get_customer_ds,
     get_orders_ds,
     get_line_item_ds,
     get_nation_ds,
-    export_df,
 )
+from tpch.ops import gather, top_k
 
 Q_NUM = 10
 
 
 def get_ds():
-    customer = get_customer_ds()
-    orders = get_orders_ds()
-    lineitem = get_line_item_ds()
-    nation = get_nation_ds()
+    customer = get_customer_ds(
+        columns=[
+            "c_custkey",
+            "c_name",
+            "c_address",
+            "c_nationkey",
+            "c_phone",
+            "c_acctbal",
+            "c_comment",
+        ]
+    )
+    orders = get_orders_ds(
+        columns=["o_orderkey", "o_custkey", "o_orderdate"],
+        filters=[
+            ("o_orderdate", ">=", date(1993, 10, 1)),
+            ("o_orderdate", "<", date(1994, 1, 1)),
+        ],
+    )
+    lineitem = get_line_item_ds(
+        columns=["l_orderkey", "l_extendedprice", "l_discount", "l_returnflag"],
+        filters=[("l_returnflag", "==", "R")],
+    )
+    nation = get_nation_ds(columns=["n_nationkey", "n_name"])
 
     return customer, orders, lineitem, nation
 
 
-def query():
-    customer, orders, lineitem, nation = get_ds()
-
+def query(customer, orders, lineitem, nation):
     var1 = date(1993, 10, 1)
     var2 = date(1994, 1, 1)
 
     result = (
-        customer.merge(orders, left_on="c_custkey", right_on="o_custkey")
-        .merge(lineitem, left_on="o_orderkey", right_on="l_orderkey")
-        .merge(nation, left_on="c_nationkey", right_on="n_nationkey")
-        .pipe(lambda df: df[(df["o_orderdate"] < var2) & (df["o_orderdate"] >= var1)])
-        .pipe(lambda df: df[df["l_returnflag"] == "R"])
-        .assign(volume=lambda df: df["l_extendedprice"] * (1 - df["l_discount"]))
-        .groupby(
-            [
-                "c_custkey",
-                "c_name",
-                "c_acctbal",
-                "c_phone",
-                "n_name",
-                "c_address",
-                "c_comment",
-            ],
-            as_index=False,
-            sort=False,
+        orders[(orders["o_orderdate"] < var2) & (orders["o_orderdate"] >= var1)]
+        .merge(
+            lineitem[lineitem["l_returnflag"] == "R"],
+            left_on="o_orderkey",
+            right_on="l_orderkey",
         )
-        .agg(revenue=("volume", "sum"))[
+        .assign(volume=lambda df: df["l_extendedprice"] * (1 - df["l_discount"]))
+        .groupby("o_custkey", as_index=False, sort=False)
+        .agg(revenue=("volume", "sum"))
+        .pipe(top_k, 20, by="revenue", ascending=False)
+        # Only the 20 customers left get their columns and nation
+        .pipe(gather, customer, left_on="o_custkey", right_on="c_custkey")
+        .pipe(gather, nation, left_on="c_nationkey", right_on="n_nationkey")[
             [
                 "c_custkey",
                 "c_name",
@@ -59,27 +67,6 @@ def query():
                 "c_comment",
             ]
         ]
-        .sort_values(by="revenue", ascending=False)
-        .reset_index(drop=True)
-        .head(20)
     )
 
     return result
-
-
-def bench_q10():
-    t0 = pyperf.perf_counter()
-    query()
-    return pyperf.perf_counter() - t0
-
-
-if __name__ == "__main__":
-    runner = pyperf.Runner()
-    runner.argparser.set_defaults(
-        quiet=False, loops=1, values=1, processes=1, warmups=0
-    )
-    runner.bench_func("pandas-q10", bench_q10)
-    # result = query()
-    #
-    # file_name = "q" + str(Q_NUM) + ".out"
-    # export_df(result, file_name)
@@ -1,26 +1,23 @@
-import pyperf
-
 from tpch.utils import (
     get_part_supp_ds,
     get_supplier_ds,
     get_nation_ds,
-    export_df,
 )
 
 Q_NUM = 11
 
 
 def get_ds():
-    partsupp = get_part_supp_ds()
-    supplier = get_supplier_ds()
-    nation = get_nation_ds()
+    partsupp = get_part_supp_ds(
+        columns=["ps_partkey", "ps_suppkey", "ps_availqty", "ps_supplycost"]
+    )
+    supplier = get_supplier_ds(columns=["s_suppkey", "s_nationkey"])
+    nation = get_nation_ds(columns=["n_nationkey", "n_name"])
 
     return partsupp, supplier, nation
 
 
-def query():
-    partsupp, supplier, nation = get_ds()
-
+def query(partsupp, supplier, nation):
     var1 = "GERMANY"
     # https://www.tpc.org/tpc_documents_current_versions/pdf/tpc-h_v3.0.1.pdf
     # FRACTION is chosen as 0.0001 / SF
@@ -42,21 +39,3 @@ def query():
     )
 
     return q_final
-
-
-def bench_q11():
-    t0 = pyperf.perf_counter()
-    query()
-    return pyperf.perf_counter() - t0
-
-
-if __name__ == "__main__":
-    runner = pyperf.Runner()
-    runner.argparser.set_defaults(
-        quiet=False, loops=1, values=1, processes=1, warmups=0
-    )
-    runner.bench_func("pandas-q11", bench_q11)
-    # result = query()
-    #
-    # file_name = "q" + str(Q_NUM) + ".out"
-    # export_df(result, file_name)
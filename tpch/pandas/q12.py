@@ -1,25 +1,33 @@
-import pyperf
-
 from datetime import date
 from tpch.utils import (
     get_line_item_ds,
     get_orders_ds,
-    export_df,
 )
 
 Q_NUM = 12
 
 
 def get_ds():
-    lineitem = get_line_item_ds()
-    orders = get_orders_ds()
+    lineitem = get_line_item_ds(
+        columns=[
+            "l_orderkey",
+            "l_shipdate",
+            "l_commitdate",
+            "l_receiptdate",
+            "l_shipmode",
+        ],
+        filters=[
+            ("l_receiptdate", ">=", date(1994, 1, 1)),
+            ("l_receiptdate", "<", date(1995, 1, 1)),
+            ("l_shipmode", "in", ["MAIL", "SHIP"]),
+        ],
+    )
+    orders = get_orders_ds(columns=["o_orderkey", "o_orderpriority"])
 
     return lineitem, orders
 
 
-def query():
-    lineitem, orders = get_ds()
-
+def query(lineitem, orders):
     var1 = "MAIL"
     var2 = "SHIP"
     var3 = date(1994, 1, 1)
@@ -38,26 +46,8 @@ def query():
             high_line_count=lambda df: df["o_orderpriority"].isin(high_priorities),
             low_line_count=lambda df: ~df["o_orderpriority"].isin(high_priorities),
         )
-        .groupby("l_shipmode", as_index=False, sort=True)
+        .groupby("l_shipmode", as_index=False, sort=True, observed=True)
         .agg({"high_line_count": "sum", "low_line_count": "sum"})
         .astype({"high_line_count": int, "low_line_count": int})
     )
     return q_final
-
-
-def bench_q12():
-    t0 = pyperf.perf_counter()
-    query()
-    return pyperf.perf_counter() - t0
-
-
-if __name__ == "__main__":
-    runner = pyperf.Runner()
-    runner.argparser.set_defaults(
-        quiet=False, loops=1, values=1, processes=1, warmups=0
-    )
-    runner.bench_func("pandas-q12", bench_q12)
-    # result = query()
-    #
-    # file_name = "q" + str(Q_NUM) + ".out"
-    # export_df(result, file_name)
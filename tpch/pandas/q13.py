@@ -1,28 +1,24 @@
-import pyperf
-
 from tpch.utils import (
     get_customer_ds,
     get_orders_ds,
-    export_df,
 )
+from tpch.ops import like
 
 Q_NUM = 13
 
 
 def get_ds():
-    customer = get_customer_ds()
-    orders = get_orders_ds()
+    customer = get_customer_ds(columns=["c_custkey"])
+    orders = get_orders_ds(columns=["o_orderkey", "o_custkey", "o_comment"])
 
     return customer, orders
 
 
-def query():
-    customer, orders = get_ds()
-
+def query(customer, orders):
     var1 = "special"
     var2 = "requests"
 
-    orders = orders[~orders["o_comment"].str.contains(f"{var1}.*{var2}", regex=True)]
+    orders = orders[~like(orders["o_comment"], f"%{var1}%{var2}%")]
 
     q_final = (
         customer.merge(orders, how="left", left_on="c_custkey", right_on="o_custkey")
@@ -35,21 +31,3 @@ def query():
     )
 
     return q_final
-
-
-def bench_q13():
-    t0 = pyperf.perf_counter()
-    query()
-    return pyperf.perf_counter() - t0
-
-
-if __name__ == "__main__":
-    runner = pyperf.Runner()
-    runner.argparser.set_defaults(
-        quiet=False, loops=1, values=1, processes=1, warmups=0
-    )
-    runner.bench_func("pandas-q13", bench_q13)
-    # result = query()
-    #
-    # file_name = "q" + str(Q_NUM) + ".out"
-    # export_df(result, file_name)
@@ -1,25 +1,28 @@
-import pyperf
-
 from datetime import date
 from tpch.utils import (
     get_line_item_ds,
     get_part_ds,
-    export_df,
 )
+from tpch.ops import like
 
 Q_NUM = 14
 
 
 def get_ds():
-    lineitem = get_line_item_ds()
-    part = get_part_ds()
+    lineitem = get_line_item_ds(
+        columns=["l_partkey", "l_extendedprice", "l_discount", "l_shipdate"],
+        filters=[
+            ("l_shipdate", ">=", date(1995, 9, 1)),
+            ("l_shipdate", "<", date(1995, 10, 1)),
+        ],
+        clustered=True,
+    )
+    part = get_part_ds(columns=["p_partkey", "p_type"])
 
     return lineitem, part
 
 
-def query():
-    lineitem, part = get_ds()
-
+def query(lineitem, part):
     var1 = date(1995, 9, 1)
     var2 = date(1995, 10, 1)
 
@@ -30,7 +33,7 @@ def query():
             lambda df: (
                 100.00
                 * (df["l_extendedprice"] * (1 - df["l_discount"]))
-                .where(df["p_type"].str.startswith("PROMO"))
+                .where(like(df["p_type"], "PROMO%"))
                 .agg(["sum"])
                 / (df["l_extendedprice"] * (1 - df["l_discount"])).agg(["sum"])
             )
@@ -40,21 +43,3 @@ def query():
     )
 
     return q_final
-
-
-def bench_q14():
-    t0 = pyperf.perf_counter()
-    query()
-    return pyperf.perf_counter() - t0
-
-
-if __name__ == "__main__":
-    runner = pyperf.Runner()
-    runner.argparser.set_defaults(
-        quiet=False, loops=1, values=1, processes=1, warmups=0
-    )
-    runner.bench_func("pandas-q14", bench_q14)
-    # result = query()
-    #
-    # file_name = "q" + str(Q_NUM) + ".out"
-    # export_df(result, file_name)
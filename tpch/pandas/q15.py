@@ -1,25 +1,27 @@
-import pyperf
-
 from datetime import date
 from tpch.utils import (
     get_supplier_ds,
     get_line_item_ds,
-    export_df,
 )
 
 Q_NUM = 15
 
 
 def get_ds():
-    supplier = get_supplier_ds()
-    lineitem = get_line_item_ds()
+    supplier = get_supplier_ds(columns=["s_suppkey", "s_name", "s_address", "s_phone"])
+    lineitem = get_line_item_ds(
+        columns=["l_suppkey", "l_extendedprice", "l_discount", "l_shipdate"],
+        filters=[
+            ("l_shipdate", ">=", date(1996, 1, 1)),
+            ("l_shipdate", "<", date(1996, 4, 1)),
+        ],
+        clustered=True,
+    )
 
     return supplier, lineitem
 
 
-def query():
-    supplier, lineitem = get_ds()
-
+def query(supplier, lineitem):
     var1 = date(1996, 1, 1)
     var2 = date(1996, 4, 1)
 
@@ -44,21 +46,3 @@ def query():
     )
 
     return q_final
-
-
-def bench_q15():
-    t0 = pyperf.perf_counter()
-    query()
-    return pyperf.perf_counter() - t0
-
-
-if __name__ == "__main__":
-    runner = pyperf.Runner()
-    runner.argparser.set_defaults(
-        quiet=False, loops=1, values=1, processes=1, warmups=0
-    )
-    runner.bench_func("pandas-q15", bench_q15)
-    # result = query()
-    #
-    # file_name = "q" + str(Q_NUM) + ".out"
-    # export_df(result, file_name)
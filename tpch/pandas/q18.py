@@ -1,26 +1,24 @@
-import pyperf
-
 from tpch.utils import (
     get_line_item_ds,
     get_customer_ds,
     get_orders_ds,
-    export_df,
 )
+from tpch.ops import prefilter, top_k
 
 Q_NUM = 18
 
 
 def get_ds():
-    lineitem = get_line_item_ds()
-    customer = get_customer_ds()
-    orders = get_orders_ds()
+    lineitem = get_line_item_ds(columns=["l_orderkey", "l_quantity"])
+    customer = get_customer_ds(columns=["c_custkey", "c_name"])
+    orders = get_orders_ds(
+        columns=["o_orderkey", "o_custkey", "o_totalprice", "o_orderdate"]
+    )
 
     return lineitem, customer, orders
 
 
-def query():
-    lineitem, customer, orders = get_ds()
-
+def query(lineitem, customer, orders):
     var1 = 300
 
     q1 = (
@@ -31,35 +29,21 @@ def query():
 
     q_final = (
         orders.merge(q1, left_on="o_orderkey", right_on="l_orderkey")
-        .merge(lineitem, left_on="o_orderkey", right_on="l_orderkey")
+        .merge(
+            # Only the lines of the few large orders are joined
+            lineitem.pipe(prefilter, q1, on="l_orderkey"),
+            left_on="o_orderkey",
+            right_on="l_orderkey",
+        )
         .merge(customer, left_on="o_custkey", right_on="c_custkey")
         .groupby(
             ["c_name", "c_custkey", "o_orderkey", "o_orderdate", "o_totalprice"],
             as_index=False,
         )
         .agg(col6=("l_quantity", "sum"))
-        .sort_values(["o_totalprice", "o_orderdate"], ascending=[False, True])
+        .pipe(top_k, 100, ["o_totalprice", "o_orderdate"], ascending=[False, True])
         .rename(columns={"o_orderdate": "o_orderdat"})
         .astype({"col6": "float64"})
-        .head(100)
     )
 
     return q_final
-
-
-def bench_q18():
-    t0 = pyperf.perf_counter()
-    query()
-    return pyperf.perf_counter() - t0
-
-
-if __name__ == "__main__":
-    runner = pyperf.Runner()
-    runner.argparser.set_defaults(
-        quiet=False, loops=1, values=1, processes=1, warmups=0
-    )
-    runner.bench_func("pandas-q18", bench_q18)
-    # result = query()
-    #
-    # file_name = "q" + str(Q_NUM) + ".out"
-    # export_df(result, file_name)
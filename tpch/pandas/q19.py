@@ -1,24 +1,28 @@
-import pyperf
-
 from tpch.utils import (
     get_line_item_ds,
     get_part_ds,
-    export_df,
 )
 
 Q_NUM = 19
 
 
 def get_ds():
-    lineitem = get_line_item_ds()
-    part = get_part_ds()
+    lineitem = get_line_item_ds(
+        columns=[
+            "l_partkey",
+            "l_quantity",
+            "l_extendedprice",
+            "l_discount",
+            "l_shipinstruct",
+            "l_shipmode",
+        ]
+    )
+    part = get_part_ds(columns=["p_partkey", "p_brand", "p_size", "p_container"])
 
     return lineitem, part
 
 
-def query():
-    lineitem, part = get_ds()
-
+def query(lineitem, part):
     q_final = (
         part.merge(lineitem, left_on="p_partkey", right_on="l_partkey")
         .pipe(lambda df: df[df["l_shipmode"].isin(["AIR", "AIR REG"])])
@@ -59,21 +63,3 @@ def query():
     )
 
     return q_final
-
-
-def bench_q19():
-    t0 = pyperf.perf_counter()
-    query()
-    return pyperf.perf_counter() - t0
-
-
-if __name__ == "__main__":
-    runner = pyperf.Runner()
-    runner.argparser.set_defaults(
-        quiet=False, loops=1, values=1, processes=1, warmups=0
-    )
-    runner.bench_func("pandas-q19", bench_q19)
-    # result = query()
-    #
-    # file_name = "q" + str(Q_NUM) + ".out"
-    # export_df(result, file_name)
@@ -1,24 +1,32 @@
-import pyperf
 import tpch.utils as utils
 
 from datetime import date
+from tpch.ops import like, semi_join
 
 Q_NUM = 20
 
 
 def get_ds():
-    lineitem = utils.get_line_item_ds()
-    nation = utils.get_nation_ds()
-    supplier = utils.get_supplier_ds()
-    partsupp = utils.get_part_supp_ds()
-    part = utils.get_part_ds()
+    lineitem = utils.get_line_item_ds(
+        columns=["l_partkey", "l_suppkey", "l_quantity", "l_shipdate"],
+        filters=[
+            ("l_shipdate", ">=", date(1994, 1, 1)),
+            ("l_shipdate", "<", date(1995, 1, 1)),
+        ],
+    )
+    nation = utils.get_nation_ds(columns=["n_nationkey", "n_name"])
+    supplier = utils.get_supplier_ds(
+        columns=["s_suppkey", "s_name", "s_address", "s_nationkey"]
+    )
+    partsupp = utils.get_part_supp_ds(
+        columns=["ps_partkey", "ps_suppkey", "ps_availqty"]
+    )
+    part = utils.get_part_ds(columns=["p_partkey", "p_name"])
 
     return lineitem, nation, supplier, partsupp, part
 
 
-def query():
-    lineitem, nation, supplier, partsupp, part = get_ds()
-
+def query(lineitem, nation, supplier, partsupp, part):
     var1 = date(1994, 1, 1)
     var2 = date(1995, 1, 1)
     var3 = "CANADA"
@@ -33,36 +41,22 @@ def query():
     q2 = nation[nation["n_name"] == var3]
     q3 = supplier.merge(q2, left_on="s_nationkey", right_on="n_nationkey")
 
-    ret = (
-        part[part["p_name"].str.startswith(var4)]
-        .drop_duplicates()
-        .merge(partsupp, left_on="p_partkey", right_on="ps_partkey")
+    q4 = (
+        partsupp.pipe(
+            semi_join,
+            part[like(part["p_name"], f"{var4}%")],
+            left_on="ps_partkey",
+            right_on="p_partkey",
+        )
         .merge(
             q1,
             left_on=["ps_suppkey", "ps_partkey"],
             right_on=["l_suppkey", "l_partkey"],
         )
         .pipe(lambda df: df[df["ps_availqty"] > df["sum_quantity"]])
-        .drop_duplicates(subset=["ps_suppkey"])
-        .merge(q3, left_on="ps_suppkey", right_on="s_suppkey")
-        .sort_values("s_name")[["s_name", "s_address"]]
     )
-    return ret
 
-
-def bench_q20():
-    t0 = pyperf.perf_counter()
-    query()
-    return pyperf.perf_counter() - t0
-
-
-if __name__ == "__main__":
-    runner = pyperf.Runner()
-    runner.argparser.set_defaults(
-        quiet=False, loops=1, values=1, processes=1, warmups=0
-    )
-    runner.bench_func("pandas-q20", bench_q20)
-    # result = query()
-    #
-    # file_name = "q" + str(Q_NUM) + ".out"
-    # export_df(result, file_name)
+    ret = q3.pipe(
+        semi_join, q4, left_on="s_suppkey", right_on="ps_suppkey"
+    ).sort_values("s_name")[["s_name", "s_address"]]
+    return ret
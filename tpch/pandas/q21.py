@@ -1,72 +1,67 @@
-import pyperf
-
 from tpch.utils import (
     get_line_item_ds,
     get_orders_ds,
     get_nation_ds,
     get_supplier_ds,
-    export_df,
 )
+from tpch.ops import prefilter, semi_join, top_k
 
 Q_NUM = 21
 
 
 def get_ds():
-    lineitem = get_line_item_ds()
-    orders = get_orders_ds()
-    nation = get_nation_ds()
-    supplier = get_supplier_ds()
+    lineitem = get_line_item_ds(
+        columns=["l_orderkey", "l_suppkey", "l_commitdate", "l_receiptdate"]
+    )
+    orders = get_orders_ds(columns=["o_orderkey", "o_orderstatus"])
+    nation = get_nation_ds(columns=["n_nationkey", "n_name"])
+    supplier = get_supplier_ds(columns=["s_suppkey", "s_name", "s_nationkey"])
 
     return lineitem, orders, nation, supplier
 
 
-def query():
-    lineitem, orders, nation, supplier = get_ds()
-
+def query(lineitem, orders, nation, supplier):
     var1 = "SAUDI ARABIA"
 
-    q1 = (
-        lineitem.groupby("l_orderkey", as_index=False)
-        .agg(n_supp_by_order=("l_suppkey", "nunique"))
-        .pipe(lambda df: df[df["n_supp_by_order"] > 1])
-        .merge(
-            lineitem[(lineitem["l_receiptdate"] > lineitem["l_commitdate"])],
-            on="l_orderkey",
+    f_orders = orders[orders["o_orderstatus"] == "F"]
+    # Only the lines of the F orders are grouped
+    lineitem = lineitem.pipe(
+        prefilter, f_orders, left_on="l_orderkey", right_on="o_orderkey"
+    )
+    is_late = lineitem["l_receiptdate"] > lineitem["l_commitdate"]
+    late_lines = lineitem[is_late]
+    # EXISTS a line of another supplier and NOT EXISTS a late line of another
+    # supplier, from a single group-by: an order has several (late) suppliers
+    # when their smallest and largest keys differ
+    supp_range = (
+        lineitem.assign(late_suppkey=lineitem["l_suppkey"].where(is_late))
+        .groupby("l_orderkey", as_index=False)
+        .agg(
+            min_supp=("l_suppkey", "min"),
+            max_supp=("l_suppkey", "max"),
+            min_late_supp=("late_suppkey", "min"),
+            max_late_supp=("late_suppkey", "max"),
         )
     )
+    waiting_orders = supp_range[
+        (supp_range["min_supp"] != supp_range["max_supp"])
+        & (supp_range["min_late_supp"] == supp_range["max_late_supp"])
+    ]
+    suppliers = supplier.pipe(
+        semi_join,
+        nation[nation["n_name"] == var1],
+        left_on="s_nationkey",
+        right_on="n_nationkey",
+    )
 
     q_final = (
-        q1.groupby("l_orderkey", as_index=False)
-        .agg(n_supp_by_order_left=("l_suppkey", "nunique"))
-        .merge(q1, on="l_orderkey")
-        .merge(supplier, left_on="l_suppkey", right_on="s_suppkey")
-        .merge(nation, left_on="s_nationkey", right_on="n_nationkey")
-        .merge(orders, left_on="l_orderkey", right_on="o_orderkey")
-        .pipe(lambda df: df[df["n_supp_by_order_left"] == 1])
-        .pipe(lambda df: df[df["n_name"] == var1])
-        .pipe(lambda df: df[df["o_orderstatus"] == "F"])
+        late_lines.pipe(semi_join, suppliers, left_on="l_suppkey", right_on="s_suppkey")
+        .pipe(semi_join, f_orders, left_on="l_orderkey", right_on="o_orderkey")
+        .pipe(semi_join, waiting_orders, on="l_orderkey")
+        .merge(suppliers, left_on="l_suppkey", right_on="s_suppkey")
         .groupby("s_name", as_index=False)
         .agg(numwait=("l_suppkey", "count"))
-        .sort_values(["numwait", "s_name"], ascending=[False, True])
-        .head(n=100)
+        .pipe(top_k, 100, ["numwait", "s_name"], ascending=[False, True])
     )
 
     return q_final
-
-
-def bench_q21():
-    t0 = pyperf.perf_counter()
-    query()
-    return pyperf.perf_counter() - t0
-
-
-if __name__ == "__main__":
-    runner = pyperf.Runner()
-    runner.argparser.set_defaults(
-        quiet=False, loops=1, values=1, processes=1, warmups=0
-    )
-    runner.bench_func("pandas-q21", bench_q21)
-    # result = query()
-    #
-    # file_name = "q" + str(Q_NUM) + ".out"
-    # export_df(result, file_name)
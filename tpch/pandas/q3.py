@@ -1,27 +1,32 @@
-import pyperf
-
 from datetime import date
 from tpch.utils import (
     get_customer_ds,
     get_orders_ds,
     get_line_item_ds,
-    export_df,
 )
+from tpch.ops import top_k
 
 Q_NUM = 3
 
 
 def get_ds():
-    customer = get_customer_ds()
-    orders = get_orders_ds()
-    lineitem = get_line_item_ds()
+    customer = get_customer_ds(
+        columns=["c_custkey", "c_mktsegment"],
+        filters=[("c_mktsegment", "==", "BUILDING")],
+    )
+    orders = get_orders_ds(
+        columns=["o_orderkey", "o_custkey", "o_orderdate", "o_shippriority"],
+        filters=[("o_orderdate", "<", date(1995, 3, 15))],
+    )
+    lineitem = get_line_item_ds(
+        columns=["l_orderkey", "l_extendedprice", "l_discount", "l_shipdate"],
+        filters=[("l_shipdate", ">", date(1995, 3, 15))],
+    )
 
     return customer, orders, lineitem
 
 
-def query():
-    customer, orders, lineitem = get_ds()
-
+def query(customer, orders, lineitem):
     var1 = "BUILDING"
     var2 = date(1995, 3, 15)
 
@@ -41,25 +46,6 @@ def query():
                 "o_shippriority",
             ]
         ]
-        .sort_values(["revenue", "o_orderdate"], ascending=[False, True])
-        .head(10)
+        .pipe(top_k, 10, ["revenue", "o_orderdate"], ascending=[False, True])
     )
     return q_final
-
-
-def bench_q3():
-    t0 = pyperf.perf_counter()
-    query()
-    return pyperf.perf_counter() - t0
-
-
-if __name__ == "__main__":
-    runner = pyperf.Runner()
-    runner.argparser.set_defaults(
-        quiet=False, loops=1, values=1, processes=1, warmups=0
-    )
-    runner.bench_func("pandas-q3", bench_q3)
-    # result = query()
-    #
-    # file_name = "q" + str(Q_NUM) + ".out"
-    # export_df(result, file_name)
@@ -1,69 +1,65 @@
-import pyperf
 import tpch.utils as utils
 
 from datetime import date
+from tpch.planner import join
 
 Q_NUM = 5
 
 
 def get_ds():
-    customer = utils.get_customer_ds()
-    orders = utils.get_orders_ds()
-    lineitem = utils.get_line_item_ds()
-    supplier = utils.get_supplier_ds()
-    nation = utils.get_nation_ds()
-    region = utils.get_region_ds()
+    customer = utils.get_customer_ds(columns=["c_custkey", "c_nationkey"])
+    orders = utils.get_orders_ds(
+        columns=["o_orderkey", "o_custkey", "o_orderdate"],
+        filters=[
+            ("o_orderdate", ">=", date(1994, 1, 1)),
+            ("o_orderdate", "<", date(1995, 1, 1)),
+        ],
+    )
+    lineitem = utils.get_line_item_ds(
+        columns=["l_orderkey", "l_suppkey", "l_extendedprice", "l_discount"]
+    )
+    supplier = utils.get_supplier_ds(columns=["s_suppkey", "s_nationkey"])
+    nation = utils.get_nation_ds(columns=["n_nationkey", "n_name", "n_regionkey"])
+    region = utils.get_region_ds(columns=["r_regionkey", "r_name"])
 
     return customer, orders, lineitem, supplier, nation, region
 
 
-def query():
-    customer, orders, lineitem, supplier, nation, region = get_ds()
-
+def query(customer, orders, lineitem, supplier, nation, region):
     var1 = "ASIA"
     var2 = date(1994, 1, 1)
     var3 = date(1995, 1, 1)
 
+    joined = join(
+        {
+            "customer": customer,
+            "orders": orders,
+            "lineitem": lineitem,
+            "supplier": supplier,
+            "nation": nation,
+            "region": region,
+        },
+        joins=[
+            ("region", "r_regionkey", "nation", "n_regionkey"),
+            ("nation", "n_nationkey", "customer", "c_nationkey"),
+            ("customer", "c_custkey", "orders", "o_custkey"),
+            ("orders", "o_orderkey", "lineitem", "l_orderkey"),
+            ("lineitem", "l_suppkey", "supplier", "s_suppkey"),
+            # The suppliers are of the nation of the customer
+            ("nation", "n_nationkey", "supplier", "s_nationkey"),
+        ],
+        filters={
+            "region": lambda df: df["r_name"] == var1,
+            "orders": lambda df: (df["o_orderdate"] >= var2)
+            & (df["o_orderdate"] < var3),
+        },
+    )
+
     q_final = (
-        region.merge(nation, left_on="r_regionkey", right_on="n_regionkey")
-        .merge(customer, left_on="n_nationkey", right_on="c_nationkey")
-        .merge(orders, left_on="c_custkey", right_on="o_custkey")
-        .merge(lineitem, left_on="o_orderkey", right_on="l_orderkey")
-        .merge(
-            supplier,
-            left_on=["l_suppkey", "n_nationkey"],
-            right_on=["s_suppkey", "s_nationkey"],
-        )
-        .pipe(lambda df: df[df["r_name"] == var1])
-        .pipe(
-            lambda df: df[
-                # df["o_orderdate"].between(from_date, to_date, inclusive="left")
-                (df["o_orderdate"] < var3)
-                & (df["o_orderdate"] >= var2)
-            ]
-        )
-        .assign(revenue=lambda df: df["l_extendedprice"] * (1 - df["l_discount"]))
-        .groupby("n_name", as_index=False)
+        joined.assign(revenue=lambda df: df["l_extendedprice"] * (1 - df["l_discount"]))
+        .groupby("n_name", as_index=False, observed=True)
         .agg({"revenue": "sum"})
         .sort_values("revenue", ascending=[False])
     )
 
     return q_final
-
-
-def bench_q5():
-    t0 = pyperf.perf_counter()
-    query()
-    return pyperf.perf_counter() - t0
-
-
-if __name__ == "__main__":
-    runner = pyperf.Runner()
-    runner.argparser.set_defaults(
-        quiet=False, loops=1, values=1, processes=1, warmups=0
-    )
-    runner.bench_func("pandas-q5", bench_q5)
-    # result = query()
-    #
-    # file_name = "q" + str(Q_NUM) + ".out"
-    # export_df(result, file_name)
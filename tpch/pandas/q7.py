@@ -1,4 +1,3 @@
-import pyperf
 import pandas as pd
 import tpch.utils as utils
 
@@ -8,18 +7,28 @@ Q_NUM = 7
 
 
 def get_ds():
-    customer = utils.get_customer_ds()
-    lineitem = utils.get_line_item_ds()
-    nation = utils.get_nation_ds()
-    orders = utils.get_orders_ds()
-    supplier = utils.get_supplier_ds()
+    customer = utils.get_customer_ds(columns=["c_custkey", "c_nationkey"])
+    lineitem = utils.get_line_item_ds(
+        columns=[
+            "l_orderkey",
+            "l_suppkey",
+            "l_extendedprice",
+            "l_discount",
+            "l_shipdate",
+        ],
+        filters=[
+            ("l_shipdate", ">=", date(1995, 1, 1)),
+            ("l_shipdate", "<=", date(1996, 12, 31)),
+        ],
+    )
+    nation = utils.get_nation_ds(columns=["n_nationkey", "n_name"])
+    orders = utils.get_orders_ds(columns=["o_orderkey", "o_custkey"])
+    supplier = utils.get_supplier_ds(columns=["s_suppkey", "s_nationkey"])
 
     return customer, lineitem, nation, orders, supplier
 
 
-def query():
-    customer, lineitem, nation, orders, supplier = get_ds()
-
+def query(customer, lineitem, nation, orders, supplier):
     var1 = "FRANCE"
     var2 = "GERMANY"
     var3 = date(1995, 1, 1)
@@ -57,26 +66,13 @@ def query():
         .pipe(lambda df: df[(df["l_shipdate"] >= var3) & (df["l_shipdate"] <= var4)])
         .assign(l_year=lambda df: df["l_shipdate"].dt.year)
         .assign(revenue=lambda df: df["l_extendedprice"] * (1 - df["l_discount"]))
-        .groupby(["supp_nation", "cust_nation", "l_year"], as_index=False, sort=True)
+        .groupby(
+            ["supp_nation", "cust_nation", "l_year"],
+            as_index=False,
+            sort=True,
+            observed=True,
+        )
         .agg({"revenue": "sum"})
     )
 
     return q_final
-
-
-def bench_q7():
-    t0 = pyperf.perf_counter()
-    query()
-    return pyperf.perf_counter() - t0
-
-
-if __name__ == "__main__":
-    runner = pyperf.Runner()
-    runner.argparser.set_defaults(
-        quiet=False, loops=1, values=1, processes=1, warmups=0
-    )
-    runner.bench_func("pandas-q7", bench_q7)
-    # result = query()
-    #
-    # file_name = "q" + str(Q_NUM) + ".out"
-    # export_df(result, file_name)
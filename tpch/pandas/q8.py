@@ -1,26 +1,41 @@
-import pyperf
 import tpch.utils as utils
 
 from datetime import date
+from tpch.planner import join
 
 Q_NUM = 8
 
 
 def get_ds():
-    customer = utils.get_customer_ds()
-    orders = utils.get_orders_ds()
-    lineitem = utils.get_line_item_ds()
-    part = utils.get_part_ds()
-    supplier = utils.get_supplier_ds()
-    nation = utils.get_nation_ds()
-    region = utils.get_region_ds()
+    customer = utils.get_customer_ds(columns=["c_custkey", "c_nationkey"])
+    orders = utils.get_orders_ds(
+        columns=["o_orderkey", "o_custkey", "o_orderdate"],
+        filters=[
+            ("o_orderdate", ">=", date(1995, 1, 1)),
+            ("o_orderdate", "<=", date(1996, 12, 31)),
+        ],
+    )
+    lineitem = utils.get_line_item_ds(
+        columns=[
+            "l_orderkey",
+            "l_partkey",
+            "l_suppkey",
+            "l_extendedprice",
+            "l_discount",
+        ]
+    )
+    part = utils.get_part_ds(
+        columns=["p_partkey", "p_type"],
+        filters=[("p_type", "==", "ECONOMY ANODIZED STEEL")],
+    )
+    supplier = utils.get_supplier_ds(columns=["s_suppkey", "s_nationkey"])
+    nation = utils.get_nation_ds(columns=["n_nationkey", "n_name", "n_regionkey"])
+    region = utils.get_region_ds(columns=["r_regionkey", "r_name"])
 
     return customer, orders, lineitem, part, supplier, nation, region
 
 
-def query():
-    customer, orders, lineitem, part, supplier, nation, region = get_ds()
-
+def query(customer, orders, lineitem, part, supplier, nation, region):
     var1 = "BRAZIL"
     var2 = "AMERICA"
     var3 = "ECONOMY ANODIZED STEEL"
@@ -30,18 +45,36 @@ def query():
     n1 = nation[["n_nationkey", "n_regionkey"]]
     n2 = nation[["n_nationkey", "n_name"]]
 
+    joined = join(
+        {
+            "part": part,
+            "lineitem": lineitem,
+            "supplier": supplier,
+            "orders": orders,
+            "customer": customer,
+            "n1": n1,
+            "region": region,
+            "n2": n2,
+        },
+        joins=[
+            ("part", "p_partkey", "lineitem", "l_partkey"),
+            ("lineitem", "l_suppkey", "supplier", "s_suppkey"),
+            ("lineitem", "l_orderkey", "orders", "o_orderkey"),
+            ("orders", "o_custkey", "customer", "c_custkey"),
+            ("customer", "c_nationkey", "n1", "n_nationkey"),
+            ("n1", "n_regionkey", "region", "r_regionkey"),
+            ("supplier", "s_nationkey", "n2", "n_nationkey"),
+        ],
+        filters={
+            "part": lambda df: df["p_type"] == var3,
+            "orders": lambda df: (df["o_orderdate"] >= var4)
+            & (df["o_orderdate"] <= var5),
+            "region": lambda df: df["r_name"] == var2,
+        },
+    )
+
     result = (
-        part.merge(lineitem, left_on="p_partkey", right_on="l_partkey")
-        .merge(supplier, left_on="l_suppkey", right_on="s_suppkey")
-        .merge(orders, left_on="l_orderkey", right_on="o_orderkey")
-        .merge(customer, left_on="o_custkey", right_on="c_custkey")
-        .merge(n1, left_on="c_nationkey", right_on="n_nationkey")
-        .merge(region, left_on="n_regionkey", right_on="r_regionkey")
-        .pipe(lambda df: df[df["r_name"] == var2])
-        .merge(n2, left_on="s_nationkey", right_on="n_nationkey")
-        .pipe(lambda df: df[(df["o_orderdate"] <= var5) & (df["o_orderdate"] >= var4)])
-        .pipe(lambda df: df[df["p_type"] == var3])
-        .assign(
+        joined.assign(
             volume=lambda df: df["l_extendedprice"] * (1 - df["l_discount"]),
             o_year=lambda df: df["o_orderdate"].dt.year,
             case_volume=lambda df: df["volume"].where(df["n_name"] == var1),
@@ -53,21 +86,3 @@ def query():
     )
 
     return result[["o_year", "mkt_share"]]
-
-
-def bench_q8():
-    t0 = pyperf.perf_counter()
-    query()
-    return pyperf.perf_counter() - t0
-
-
-if __name__ == "__main__":
-    runner = pyperf.Runner()
-    runner.argparser.set_defaults(
-        quiet=False, loops=1, values=1, processes=1, warmups=0
-    )
-    runner.bench_func("pandas-q8", bench_q8)
-    # result = query()
-    #
-    # file_name = "q" + str(Q_NUM) + ".out"
-    # export_df(result, file_name)
@@ -0,0 +1,73 @@
+import pandas as pd
+
+from datetime import date
+from tpch.utils import (
+    get_line_item_ds,
+)
+
+Q_NUM = 1
+
+
+def get_ds():
+    lineitem = get_line_item_ds(
+        "chunked",
+        columns=[
+            "l_quantity",
+            "l_extendedprice",
+            "l_discount",
+            "l_tax",
+            "l_returnflag",
+            "l_linestatus",
+            "l_shipdate",
+        ],
+        filters=[("l_shipdate", "<=", date(1998, 9, 2))],
+    )
+    return lineitem
+
+
+def query(lineitem):
+    keys = ["l_returnflag", "l_linestatus"]
+
+    # Sums and counts of every chunk, the averages are derived from them
+    partials = [
+        chunk[chunk["l_shipdate"] <= date(1998, 9, 2)]
+        .assign(disc_price=lambda df: df["l_extendedprice"] * (1 - df["l_discount"]))
+        .assign(charge=lambda df: df["disc_price"] * (1 + df["l_tax"]))
+        .groupby(keys, as_index=False, observed=True)
+        .agg(
+            sum_qty=("l_quantity", "sum"),
+            sum_base_price=("l_extendedprice", "sum"),
+            sum_disc_price=("disc_price", "sum"),
+            sum_charge=("charge", "sum"),
+            sum_disc=("l_discount", "sum"),
+            count_order=("l_returnflag", "count"),
+        )
+        for chunk in lineitem
+    ]
+
+    q_final = (
+        pd.concat(partials)
+        .groupby(keys, as_index=False, observed=True)
+        .sum()
+        .assign(
+            avg_qty=lambda df: df["sum_qty"] / df["count_order"],
+            avg_price=lambda df: df["sum_base_price"] / df["count_order"],
+            avg_disc=lambda df: df["sum_disc"] / df["count_order"],
+        )[
+            [
+                "l_returnflag",
+                "l_linestatus",
+                "sum_qty",
+                "sum_base_price",
+                "sum_disc_price",
+                "sum_charge",
+                "avg_qty",
+                "avg_price",
+                "avg_disc",
+                "count_order",
+            ]
+        ]
+        .sort_values(keys, ignore_index=True)
+    )
+
+    return q_final
@@ -0,0 +1,58 @@
+import pandas as pd
+
+from datetime import date
+from tpch.utils import (
+    get_line_item_ds,
+    get_part_ds,
+)
+from tpch.ops import like
+
+Q_NUM = 14
+
+
+def get_ds():
+    lineitem = get_line_item_ds(
+        "chunked",
+        columns=["l_partkey", "l_extendedprice", "l_discount", "l_shipdate"],
+        filters=[
+            ("l_shipdate", ">=", date(1995, 9, 1)),
+            ("l_shipdate", "<", date(1995, 10, 1)),
+        ],
+        clustered=True,
+    )
+    part = get_part_ds(columns=["p_partkey", "p_type"])
+
+    return lineitem, part
+
+
+def query(lineitem, part):
+    var1 = date(1995, 9, 1)
+    var2 = date(1995, 10, 1)
+
+    promo_parts = part.assign(is_promo=like(part["p_type"], "PROMO%"))[
+        ["p_partkey", "is_promo"]
+    ]
+
+    # Promo and total revenue of every chunk
+    partials = pd.DataFrame(
+        [
+            chunk.merge(promo_parts, left_on="l_partkey", right_on="p_partkey")
+            .pipe(lambda df: df[(df["l_shipdate"] < var2) & (df["l_shipdate"] >= var1)])
+            .assign(revenue=lambda df: df["l_extendedprice"] * (1 - df["l_discount"]))
+            .pipe(
+                lambda df: {
+                    "promo": df["revenue"].where(df["is_promo"]).sum(),
+                    "total": df["revenue"].sum(),
+                }
+            )
+            for chunk in lineitem
+        ],
+        columns=["promo", "total"],
+    ).sum()
+
+    q_final = pd.DataFrame(
+        {"promo_revenue": [round(100.00 * partials["promo"] / partials["total"], 2)]},
+        index=["sum"],
+    )
+
+    return q_final
@@ -0,0 +1,54 @@
+import pandas as pd
+
+from datetime import date
+from tpch.utils import (
+    get_supplier_ds,
+    get_line_item_ds,
+)
+
+Q_NUM = 15
+
+
+def get_ds():
+    supplier = get_supplier_ds(columns=["s_suppkey", "s_name", "s_address", "s_phone"])
+    lineitem = get_line_item_ds(
+        "chunked",
+        columns=["l_suppkey", "l_extendedprice", "l_discount", "l_shipdate"],
+        filters=[
+            ("l_shipdate", ">=", date(1996, 1, 1)),
+            ("l_shipdate", "<", date(1996, 4, 1)),
+        ],
+        clustered=True,
+    )
+
+    return supplier, lineitem
+
+
+def query(supplier, lineitem):
+    var1 = date(1996, 1, 1)
+    var2 = date(1996, 4, 1)
+
+    # Revenue per supplier of every chunk, at most one row per supplier each
+    partials = [
+        chunk[(chunk["l_shipdate"] >= var1) & (chunk["l_shipdate"] < var2)]
+        .assign(total_revenue=lambda df: df["l_extendedprice"] * (1 - df["l_discount"]))
+        .groupby("l_suppkey", as_index=False)
+        .agg({"total_revenue": "sum"})
+        for chunk in lineitem
+    ]
+    revenue = pd.concat(partials).groupby("l_suppkey", as_index=False).sum()
+
+    q_final = (
+        supplier.merge(
+            revenue,
+            left_on="s_suppkey",
+            right_on="l_suppkey",
+        )
+        .pipe(lambda df: df[df["total_revenue"] == df["total_revenue"].max()])
+        .assign(total_revenue=lambda df: df["total_revenue"].round(2))[
+            ["s_suppkey", "s_name", "s_address", "s_phone", "total_revenue"]
+        ]
+        .sort_values("s_suppkey", ignore_index=True)
+    )
+
+    return q_final
@@ -0,0 +1,47 @@
+import pandas as pd
+
+from datetime import date
+from tpch.utils import (
+    get_line_item_ds,
+)
+
+Q_NUM = 6
+
+
+def get_ds():
+    lineitem = get_line_item_ds(
+        "chunked",
+        columns=["l_quantity", "l_extendedprice", "l_discount", "l_shipdate"],
+        filters=[
+            ("l_shipdate", ">=", date(1994, 1, 1)),
+            ("l_shipdate", "<", date(1995, 1, 1)),
+            ("l_discount", ">=", 0.05),
+            ("l_discount", "<=", 0.07),
+            ("l_quantity", "<", 24),
+        ],
+        clustered=True,
+    )
+
+    return lineitem
+
+
+def query(lineitem):
+    var1 = date(1994, 1, 1)
+    var2 = date(1995, 1, 1)
+    var3 = 0.05
+    var4 = 0.07
+    var5 = 24
+
+    result = sum(
+        chunk[
+            (chunk["l_shipdate"] < var2)
+            & (chunk["l_shipdate"] >= var1)
+            & (chunk["l_discount"] <= var4)
+            & (chunk["l_discount"] >= var3)
+            & (chunk["l_quantity"] < var5)
+        ]
+        .pipe(lambda df: df["l_extendedprice"] * df["l_discount"])
+        .sum()
+        for chunk in lineitem
+    )
+    return pd.DataFrame({"revenue": [result]})
@@ -0,0 +1,113 @@
+import numba
+import numpy as np
+import pandas as pd
+
+from datetime import date
+from tpch.kernels import days, to_numpy
+from tpch.utils import (
+    get_line_item_ds,
+)
+
+Q_NUM = 1
+
+# Sums of every group, in the order of the columns of the result
+SUM_QTY, SUM_BASE_PRICE, SUM_DISC_PRICE, SUM_CHARGE, SUM_DISC = range(5)
+
+
+def get_ds():
+    lineitem = get_line_item_ds(
+        columns=[
+            "l_quantity",
+            "l_extendedprice",
+            "l_discount",
+            "l_tax",
+            "l_returnflag",
+            "l_linestatus",
+            "l_shipdate",
+        ],
+        filters=[("l_shipdate", "<=", date(1998, 9, 2))],
+        clustered=True,
+    )
+    return lineitem
+
+
+@numba.njit(parallel=True, cache=True)
+def aggregate(
+    quantity,
+    price,
+    discount,
+    tax,
+    returnflag,
+    linestatus,
+    shipdate,
+    var1,
+    statuses,
+    num_blocks,
+):
+    """Get the sums and counts of the groups of (returnflag, linestatus) codes.
+
+    The rows are split in num_blocks blocks, one per thread, each summed into
+    its own groups, which are added up at the end.
+    """
+    num_rows = len(quantity)
+    block_rows = (num_rows + num_blocks - 1) // num_blocks
+    num_groups = (returnflag.max() + 1) * statuses if num_rows else 0
+    sums = np.zeros((num_blocks, num_groups, 5))
+    counts = np.zeros((num_blocks, num_groups), dtype=np.int64)
+
+    for block in numba.prange(num_blocks):
+        for i in range(block * block_rows, min((block + 1) * block_rows, num_rows)):
+            if shipdate[i] <= var1:
+                group = returnflag[i] * statuses + linestatus[i]
+                disc_price = price[i] * (1 - discount[i])
+                sums[block, group, SUM_QTY] += quantity[i]
+                sums[block, group, SUM_BASE_PRICE] += price[i]
+                sums[block, group, SUM_DISC_PRICE] += disc_price
+                sums[block, group, SUM_CHARGE] += disc_price * (1 + tax[i])
+                sums[block, group, SUM_DISC] += discount[i]
+                counts[block, group] += 1
+
+    return sums.sum(axis=0), counts.sum(axis=0)
+
+
+def query(lineitem):
+    returnflag = lineitem["l_returnflag"].dtype
+    linestatus = lineitem["l_linestatus"].dtype
+    statuses = len(linestatus.categories)
+
+    sums, counts = aggregate(
+        to_numpy(lineitem["l_quantity"]),
+        to_numpy(lineitem["l_extendedprice"]),
+        to_numpy(lineitem["l_discount"]),
+        to_numpy(lineitem["l_tax"]),
+        to_numpy(lineitem["l_returnflag"]),
+        to_numpy(lineitem["l_linestatus"]),
+        to_numpy(lineitem["l_shipdate"]),
+        days(date(1998, 9, 2)),
+        statuses,
+        numba.get_num_threads(),
+    )
+
+    # Groups are numbered in the order of their codes, hence already sorted
+    groups = np.flatnonzero(counts)
+    sums, counts = sums[groups], counts[groups]
+    q_final = pd.DataFrame(
+        {
+            "l_returnflag": pd.Categorical.from_codes(
+                groups // statuses, dtype=returnflag
+            ),
+            "l_linestatus": pd.Categorical.from_codes(
+                groups % statuses, dtype=linestatus
+            ),
+            "sum_qty": sums[:, SUM_QTY],
+            "sum_base_price": sums[:, SUM_BASE_PRICE],
+            "sum_disc_price": sums[:, SUM_DISC_PRICE],
+            "sum_charge": sums[:, SUM_CHARGE],
+            "avg_qty": sums[:, SUM_QTY] / counts,
+            "avg_price": sums[:, SUM_BASE_PRICE] / counts,
+            "avg_disc": sums[:, SUM_DISC] / counts,
+            "count_order": counts,
+        }
+    )
+
+    return q_final
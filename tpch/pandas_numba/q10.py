@@ -0,0 +1,95 @@
+import pandas as pd
+
+from datetime import date
+from tpch.kernels import group_by, group_sum, join, to_numpy
+from tpch.ops import top_k
+from tpch.utils import (
+    get_customer_ds,
+    get_orders_ds,
+    get_line_item_ds,
+    get_nation_ds,
+)
+
+Q_NUM = 10
+
+
+def get_ds():
+    customer = get_customer_ds(
+        columns=[
+            "c_custkey",
+            "c_name",
+            "c_address",
+            "c_nationkey",
+            "c_phone",
+            "c_acctbal",
+            "c_comment",
+        ]
+    )
+    orders = get_orders_ds(
+        columns=["o_orderkey", "o_custkey", "o_orderdate"],
+        filters=[
+            ("o_orderdate", ">=", date(1993, 10, 1)),
+            ("o_orderdate", "<", date(1994, 1, 1)),
+        ],
+    )
+    lineitem = get_line_item_ds(
+        columns=["l_orderkey", "l_extendedprice", "l_discount", "l_returnflag"],
+        filters=[("l_returnflag", "==", "R")],
+    )
+    nation = get_nation_ds(columns=["n_nationkey", "n_name"])
+
+    return customer, orders, lineitem, nation
+
+
+def query(customer, orders, lineitem, nation):
+    var1 = date(1993, 10, 1)
+    var2 = date(1994, 1, 1)
+
+    orders = orders[(orders["o_orderdate"] < var2) & (orders["o_orderdate"] >= var1)]
+    lineitem = lineitem[lineitem["l_returnflag"] == "R"]
+
+    line_rows, order_rows = join(
+        to_numpy(lineitem["l_orderkey"]), to_numpy(orders["o_orderkey"])
+    )
+    volume = to_numpy(lineitem["l_extendedprice"])[line_rows] * (
+        1 - to_numpy(lineitem["l_discount"])[line_rows]
+    )
+    custkeys = to_numpy(orders["o_custkey"])[order_rows]
+    groups, firsts = group_by(custkeys)
+    top = pd.DataFrame(
+        {
+            "c_custkey": custkeys[firsts],
+            "revenue": group_sum(groups, volume, len(firsts)),
+        }
+    ).pipe(top_k, 20, by="revenue", ascending=False)
+
+    # Only the columns of the customers of the top groups are taken
+    top_rows, customer_rows = join(
+        to_numpy(top["c_custkey"]), to_numpy(customer["c_custkey"])
+    )
+    customer = customer.iloc[customer_rows]
+    customer_rows, nation_rows = join(
+        to_numpy(customer["c_nationkey"]), to_numpy(nation["n_nationkey"])
+    )
+
+    result = (
+        customer.iloc[customer_rows]
+        .assign(
+            revenue=top["revenue"].to_numpy()[top_rows][customer_rows],
+            n_name=nation["n_name"].to_numpy()[nation_rows],
+        )[
+            [
+                "c_custkey",
+                "c_name",
+                "revenue",
+                "c_acctbal",
+                "n_name",
+                "c_address",
+                "c_phone",
+                "c_comment",
+            ]
+        ]
+        .reset_index(drop=True)
+    )
+
+    return result
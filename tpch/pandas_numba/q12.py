@@ -0,0 +1,73 @@
+import numpy as np
+import pandas as pd
+
+from datetime import date
+from tpch.kernels import join, to_numpy
+from tpch.utils import (
+    get_line_item_ds,
+    get_orders_ds,
+)
+
+Q_NUM = 12
+
+
+def get_ds():
+    lineitem = get_line_item_ds(
+        columns=[
+            "l_orderkey",
+            "l_shipdate",
+            "l_commitdate",
+            "l_receiptdate",
+            "l_shipmode",
+        ],
+        filters=[
+            ("l_receiptdate", ">=", date(1994, 1, 1)),
+            ("l_receiptdate", "<", date(1995, 1, 1)),
+            ("l_shipmode", "in", ["MAIL", "SHIP"]),
+        ],
+    )
+    orders = get_orders_ds(columns=["o_orderkey", "o_orderpriority"])
+
+    return lineitem, orders
+
+
+def query(lineitem, orders):
+    var1 = "MAIL"
+    var2 = "SHIP"
+    var3 = date(1994, 1, 1)
+    var4 = date(1995, 1, 1)
+    high_priorities = ["1-URGENT", "2-HIGH"]
+
+    lineitem = lineitem[
+        lineitem["l_shipmode"].isin([var1, var2])
+        & (lineitem["l_commitdate"] < lineitem["l_receiptdate"])
+        & (lineitem["l_shipdate"] < lineitem["l_commitdate"])
+        & (lineitem["l_receiptdate"] >= var3)
+        & (lineitem["l_receiptdate"] < var4)
+    ]
+
+    # The orders probe the few lines left
+    order_rows, line_rows = join(
+        to_numpy(orders["o_orderkey"]), to_numpy(lineitem["l_orderkey"])
+    )
+    priority = orders["o_orderpriority"].dtype
+    is_high = np.isin(
+        to_numpy(orders["o_orderpriority"])[order_rows],
+        priority.categories.get_indexer(high_priorities),
+    )
+
+    shipmode = lineitem["l_shipmode"].dtype
+    shipmodes = to_numpy(lineitem["l_shipmode"])[line_rows]
+    num_shipmodes = len(shipmode.categories)
+    line_count = np.bincount(shipmodes, minlength=num_shipmodes)
+    high_line_count = np.bincount(shipmodes[is_high], minlength=num_shipmodes)
+    # Categories are sorted, and only the ship modes of some line are kept
+    codes = np.flatnonzero(line_count)
+    q_final = pd.DataFrame(
+        {
+            "l_shipmode": pd.Categorical.from_codes(codes, dtype=shipmode),
+            "high_line_count": high_line_count[codes],
+            "low_line_count": line_count[codes] - high_line_count[codes],
+        }
+    )
+    return q_final
@@ -0,0 +1,50 @@
+from tpch.kernels import group_by, group_sum, join, to_numpy
+from tpch.ops import top_k
+from tpch.utils import (
+    get_line_item_ds,
+    get_customer_ds,
+    get_orders_ds,
+)
+
+Q_NUM = 18
+
+
+def get_ds():
+    lineitem = get_line_item_ds(columns=["l_orderkey", "l_quantity"])
+    customer = get_customer_ds(columns=["c_custkey", "c_name"])
+    orders = get_orders_ds(
+        columns=["o_orderkey", "o_custkey", "o_totalprice", "o_orderdate"]
+    )
+
+    return lineitem, customer, orders
+
+
+def query(lineitem, customer, orders):
+    var1 = 300
+
+    orderkeys = to_numpy(lineitem["l_orderkey"])
+    groups, firsts = group_by(orderkeys)
+    sum_quantity = group_sum(groups, to_numpy(lineitem["l_quantity"]), len(firsts))
+    large = sum_quantity > var1
+
+    # The orders probe the few large ones, whose sums are the quantities
+    # of the result
+    order_rows, large_rows = join(
+        to_numpy(orders["o_orderkey"]), orderkeys[firsts][large]
+    )
+    orders = orders.iloc[order_rows].assign(col6=sum_quantity[large][large_rows])
+    order_rows, customer_rows = join(
+        to_numpy(orders["o_custkey"]), to_numpy(customer["c_custkey"])
+    )
+
+    q_final = (
+        orders.iloc[order_rows]
+        .assign(
+            c_name=customer["c_name"].to_numpy()[customer_rows],
+            c_custkey=to_numpy(customer["c_custkey"])[customer_rows],
+        )[["c_name", "c_custkey", "o_orderkey", "o_orderdate", "o_totalprice", "col6"]]
+        .pipe(top_k, 100, ["o_totalprice", "o_orderdate"], ascending=[False, True])
+        .rename(columns={"o_orderdate": "o_orderdat"})
+    )
+
+    return q_final
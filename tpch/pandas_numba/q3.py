@@ -0,0 +1,64 @@
+from datetime import date
+from tpch.kernels import group_by, group_sum, is_in, join, to_numpy
+from tpch.ops import top_k
+from tpch.utils import (
+    get_customer_ds,
+    get_orders_ds,
+    get_line_item_ds,
+)
+
+Q_NUM = 3
+
+
+def get_ds():
+    customer = get_customer_ds(
+        columns=["c_custkey", "c_mktsegment"],
+        filters=[("c_mktsegment", "==", "BUILDING")],
+    )
+    orders = get_orders_ds(
+        columns=["o_orderkey", "o_custkey", "o_orderdate", "o_shippriority"],
+        filters=[("o_orderdate", "<", date(1995, 3, 15))],
+    )
+    lineitem = get_line_item_ds(
+        columns=["l_orderkey", "l_extendedprice", "l_discount", "l_shipdate"],
+        filters=[("l_shipdate", ">", date(1995, 3, 15))],
+    )
+
+    return customer, orders, lineitem
+
+
+def query(customer, orders, lineitem):
+    var1 = "BUILDING"
+    var2 = date(1995, 3, 15)
+
+    customer = customer[customer["c_mktsegment"] == var1]
+    orders = orders[orders["o_orderdate"] < var2]
+    lineitem = lineitem[lineitem["l_shipdate"] > var2]
+
+    orders = orders[
+        is_in(to_numpy(orders["o_custkey"]), to_numpy(customer["c_custkey"]))
+    ]
+    line_rows, order_rows = join(
+        to_numpy(lineitem["l_orderkey"]), to_numpy(orders["o_orderkey"])
+    )
+    revenue = to_numpy(lineitem["l_extendedprice"])[line_rows] * (
+        1 - to_numpy(lineitem["l_discount"])[line_rows]
+    )
+    # Lines are grouped by the order they joined, whose columns are only taken
+    # once per group
+    groups, firsts = group_by(order_rows)
+
+    q_final = (
+        orders.iloc[order_rows[firsts]]
+        .assign(revenue=group_sum(groups, revenue, len(firsts)))
+        .rename(columns={"o_orderkey": "l_orderkey"})[
+            [
+                "l_orderkey",
+                "revenue",
+                "o_orderdate",
+                "o_shippriority",
+            ]
+        ]
+        .pipe(top_k, 10, ["revenue", "o_orderdate"], ascending=[False, True])
+    )
+    return q_final
@@ -0,0 +1,51 @@
+import numpy as np
+import pandas as pd
+
+from datetime import date
+from tpch.kernels import is_in, to_numpy
+from tpch.utils import (
+    get_line_item_ds,
+    get_orders_ds,
+)
+
+Q_NUM = 4
+
+
+def get_ds():
+    lineitem = get_line_item_ds(columns=["l_orderkey", "l_commitdate", "l_receiptdate"])
+    orders = get_orders_ds(
+        columns=["o_orderkey", "o_orderdate", "o_orderpriority"],
+        filters=[
+            ("o_orderdate", ">=", date(1993, 7, 1)),
+            ("o_orderdate", "<", date(1993, 10, 1)),
+        ],
+    )
+
+    return lineitem, orders
+
+
+def query(lineitem, orders):
+    var1 = date(1993, 7, 1)
+    var2 = date(1993, 10, 1)
+
+    late = to_numpy(lineitem["l_commitdate"]) < to_numpy(lineitem["l_receiptdate"])
+    orders = orders[(orders["o_orderdate"] < var2) & (orders["o_orderdate"] >= var1)]
+
+    has_late_line = is_in(
+        to_numpy(orders["o_orderkey"]), to_numpy(lineitem["l_orderkey"])[late]
+    )
+
+    priority = orders["o_orderpriority"].dtype
+    order_count = np.bincount(
+        to_numpy(orders["o_orderpriority"])[has_late_line],
+        minlength=len(priority.categories),
+    )
+    # Categories are sorted, and only the priorities of some order are kept
+    codes = np.flatnonzero(order_count)
+    q_final = pd.DataFrame(
+        {
+            "o_orderpriority": pd.Categorical.from_codes(codes, dtype=priority),
+            "order_count": order_count[codes],
+        }
+    )
+    return q_final
@@ -0,0 +1,64 @@
+import numba
+import pandas as pd
+
+from datetime import date
+from tpch.kernels import days, to_numpy
+from tpch.utils import (
+    get_line_item_ds,
+)
+
+Q_NUM = 6
+
+
+def get_ds():
+    lineitem = get_line_item_ds(
+        columns=["l_quantity", "l_extendedprice", "l_discount", "l_shipdate"],
+        filters=[
+            ("l_shipdate", ">=", date(1994, 1, 1)),
+            ("l_shipdate", "<", date(1995, 1, 1)),
+            ("l_discount", ">=", 0.05),
+            ("l_discount", "<=", 0.07),
+            ("l_quantity", "<", 24),
+        ],
+        clustered=True,
+    )
+
+    return lineitem
+
+
+@numba.njit(parallel=True, cache=True)
+def revenue(quantity, price, discount, shipdate, var1, var2, var3, var4, var5):
+    # Rows are filtered and summed in the same pass, each thread summing its
+    # own share of them
+    total = 0.0
+    for i in numba.prange(len(price)):
+        if (
+            shipdate[i] < var2
+            and shipdate[i] >= var1
+            and discount[i] <= var4
+            and discount[i] >= var3
+            and quantity[i] < var5
+        ):
+            total += price[i] * discount[i]
+    return total
+
+
+def query(lineitem):
+    var1 = days(date(1994, 1, 1))
+    var2 = days(date(1995, 1, 1))
+    var3 = 0.05
+    var4 = 0.07
+    var5 = 24
+
+    result = revenue(
+        to_numpy(lineitem["l_quantity"]),
+        to_numpy(lineitem["l_extendedprice"]),
+        to_numpy(lineitem["l_discount"]),
+        to_numpy(lineitem["l_shipdate"]),
+        var1,
+        var2,
+        var3,
+        var4,
+        var5,
+    )
+    return pd.DataFrame({"revenue": [result]})
@@ -0,0 +1,66 @@
+import pandas as pd
+
+from datetime import date
+from tpch.utils import (
+    get_line_item_ds,
+    get_orders_ds,
+    map_partitions,
+)
+
+Q_NUM = 12
+
+
+def get_ds():
+    lineitem = get_line_item_ds(
+        "partitioned",
+        columns=[
+            "l_orderkey",
+            "l_shipdate",
+            "l_commitdate",
+            "l_receiptdate",
+            "l_shipmode",
+        ],
+        filters=[
+            ("l_receiptdate", ">=", date(1994, 1, 1)),
+            ("l_receiptdate", "<", date(1995, 1, 1)),
+            ("l_shipmode", "in", ["MAIL", "SHIP"]),
+        ],
+    )
+    orders = get_orders_ds("partitioned", columns=["o_orderkey", "o_orderpriority"])
+
+    return lineitem, orders
+
+
+def partial(lineitem, orders):
+    var1 = "MAIL"
+    var2 = "SHIP"
+    var3 = date(1994, 1, 1)
+    var4 = date(1995, 1, 1)
+    high_priorities = ["1-URGENT", "2-HIGH"]
+
+    # Both tables are partitioned on the order key, so the join is local
+    return (
+        orders.merge(lineitem, left_on="o_orderkey", right_on="l_orderkey")
+        .pipe(lambda df: df[df["l_shipmode"].isin([var1, var2])])
+        .pipe(lambda df: df[df["l_commitdate"] < df["l_receiptdate"]])
+        .pipe(lambda df: df[df["l_shipdate"] < df["l_commitdate"]])
+        .pipe(
+            lambda df: df[(df["l_receiptdate"] >= var3) & (df["l_receiptdate"] < var4)]
+        )
+        .assign(
+            high_line_count=lambda df: df["o_orderpriority"].isin(high_priorities),
+            low_line_count=lambda df: ~df["o_orderpriority"].isin(high_priorities),
+        )
+        .groupby("l_shipmode", as_index=False, observed=True)
+        .agg({"high_line_count": "sum", "low_line_count": "sum"})
+    )
+
+
+def query(lineitem, orders):
+    q_final = (
+        pd.concat(map_partitions(partial, lineitem, orders))
+        .groupby("l_shipmode", as_index=False, sort=True, observed=True)
+        .sum()
+        .astype({"high_line_count": int, "low_line_count": int})
+    )
+    return q_final
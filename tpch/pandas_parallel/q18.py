@@ -0,0 +1,48 @@
+import pandas as pd
+
+from tpch.utils import (
+    get_line_item_ds,
+    get_customer_ds,
+    get_orders_ds,
+    map_partitions,
+)
+from tpch.ops import top_k
+
+Q_NUM = 18
+
+
+def get_ds():
+    lineitem = get_line_item_ds("partitioned", columns=["l_orderkey", "l_quantity"])
+    customer = get_customer_ds(columns=["c_custkey", "c_name"])
+    orders = get_orders_ds(
+        "partitioned",
+        columns=["o_orderkey", "o_custkey", "o_totalprice", "o_orderdate"],
+    )
+
+    return lineitem, customer, orders
+
+
+def partial(lineitem, orders):
+    var1 = 300
+
+    # The quantities of an order are all summed in the partition holding it
+    return (
+        lineitem.groupby("l_orderkey", as_index=False)
+        .agg(col6=("l_quantity", "sum"))
+        .pipe(lambda df: df[df["col6"] > var1])
+        .merge(orders, left_on="l_orderkey", right_on="o_orderkey")
+    )
+
+
+def query(lineitem, customer, orders):
+    q_final = (
+        pd.concat(map_partitions(partial, lineitem, orders))
+        .merge(customer, left_on="o_custkey", right_on="c_custkey")[
+            ["c_name", "c_custkey", "o_orderkey", "o_orderdate", "o_totalprice", "col6"]
+        ]
+        .pipe(top_k, 100, ["o_totalprice", "o_orderdate"], ascending=[False, True])
+        .rename(columns={"o_orderdate": "o_orderdat"})
+        .astype({"col6": "float64"})
+    )
+
+    return q_final
@@ -0,0 +1,87 @@
+import pandas as pd
+
+from tpch.utils import (
+    get_line_item_ds,
+    get_orders_ds,
+    get_nation_ds,
+    get_supplier_ds,
+    map_partitions,
+)
+from tpch.ops import semi_join, top_k
+
+Q_NUM = 21
+
+
+def get_ds():
+    lineitem = get_line_item_ds(
+        "partitioned",
+        columns=["l_orderkey", "l_suppkey", "l_commitdate", "l_receiptdate"],
+    )
+    orders = get_orders_ds(
+        "partitioned",
+        columns=["o_orderkey", "o_orderstatus"],
+        filters=[("o_orderstatus", "==", "F")],
+    )
+    nation = get_nation_ds(columns=["n_nationkey", "n_name"])
+    supplier = get_supplier_ds(columns=["s_suppkey", "s_name", "s_nationkey"])
+
+    return lineitem, orders, nation, supplier
+
+
+def partial(lineitem, orders, suppliers):
+    # The lines of an order are all in one partition, so the suppliers of an
+    # order are counted locally
+    is_late = lineitem["l_receiptdate"] > lineitem["l_commitdate"]
+    late_lines = lineitem[is_late]
+    # EXISTS a line of another supplier and NOT EXISTS a late line of another
+    # supplier, from a single group-by: an order has several (late) suppliers
+    # when their smallest and largest keys differ
+    supp_range = (
+        lineitem.assign(late_suppkey=lineitem["l_suppkey"].where(is_late))
+        .groupby("l_orderkey", as_index=False)
+        .agg(
+            min_supp=("l_suppkey", "min"),
+            max_supp=("l_suppkey", "max"),
+            min_late_supp=("late_suppkey", "min"),
+            max_late_supp=("late_suppkey", "max"),
+        )
+    )
+    waiting_orders = supp_range[
+        (supp_range["min_supp"] != supp_range["max_supp"])
+        & (supp_range["min_late_supp"] == supp_range["max_late_supp"])
+    ]
+
+    # Waiting lines of every supplier
+    return (
+        late_lines.pipe(semi_join, suppliers, left_on="l_suppkey", right_on="s_suppkey")
+        .pipe(
+            semi_join,
+            orders[orders["o_orderstatus"] == "F"],
+            left_on="l_orderkey",
+            right_on="o_orderkey",
+        )
+        .pipe(semi_join, waiting_orders, on="l_orderkey")
+        .groupby("l_suppkey", as_index=False)
+        .agg(numwait=("l_suppkey", "count"))
+    )
+
+
+def query(lineitem, orders, nation, supplier):
+    var1 = "SAUDI ARABIA"
+
+    suppliers = supplier.pipe(
+        semi_join,
+        nation[nation["n_name"] == var1],
+        left_on="s_nationkey",
+        right_on="n_nationkey",
+    )
+
+    q_final = (
+        pd.concat(map_partitions(partial, lineitem, orders, suppliers))
+        .merge(suppliers, left_on="l_suppkey", right_on="s_suppkey")
+        .groupby("s_name", as_index=False)
+        .agg(numwait=("numwait", "sum"))
+        .pipe(top_k, 100, ["numwait", "s_name"], ascending=[False, True])
+    )
+
+    return q_final
@@ -0,0 +1,62 @@
+import pandas as pd
+
+from datetime import date
+from tpch.utils import (
+    get_customer_ds,
+    get_orders_ds,
+    get_line_item_ds,
+    map_partitions,
+)
+from tpch.ops import top_k
+
+Q_NUM = 3
+
+
+def get_ds():
+    customer = get_customer_ds(
+        columns=["c_custkey", "c_mktsegment"],
+        filters=[("c_mktsegment", "==", "BUILDING")],
+    )
+    orders = get_orders_ds(
+        "partitioned",
+        columns=["o_orderkey", "o_custkey", "o_orderdate", "o_shippriority"],
+        filters=[("o_orderdate", "<", date(1995, 3, 15))],
+    )
+    lineitem = get_line_item_ds(
+        "partitioned",
+        columns=["l_orderkey", "l_extendedprice", "l_discount", "l_shipdate"],
+        filters=[("l_shipdate", ">", date(1995, 3, 15))],
+    )
+
+    return customer, orders, lineitem
+
+
+def partial(customer, orders, lineitem):
+    var1 = "BUILDING"
+    var2 = date(1995, 3, 15)
+
+    # Every order is in a single partition, so are its groups and the global
+    # top 10 is among the top 10 of the partitions
+    return (
+        customer[customer["c_mktsegment"] == var1]
+        .merge(orders, left_on="c_custkey", right_on="o_custkey")
+        .merge(lineitem, left_on="o_orderkey", right_on="l_orderkey")
+        .pipe(lambda df: df[df["o_orderdate"] < var2])
+        .pipe(lambda df: df[df["l_shipdate"] > var2])
+        .assign(revenue=lambda df: df["l_extendedprice"] * (1 - df["l_discount"]))
+        .groupby(["l_orderkey", "o_orderdate", "o_shippriority"], as_index=False)
+        .agg({"revenue": "sum"})
+        .pipe(top_k, 10, ["revenue", "o_orderdate"], ascending=[False, True])
+    )
+
+
+def query(customer, orders, lineitem):
+    q_final = pd.concat(map_partitions(partial, customer, orders, lineitem))[
+        [
+            "l_orderkey",
+            "revenue",
+            "o_orderdate",
+            "o_shippriority",
+        ]
+    ].pipe(top_k, 10, ["revenue", "o_orderdate"], ascending=[False, True])
+    return q_final
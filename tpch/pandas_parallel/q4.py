@@ -0,0 +1,53 @@
+import pandas as pd
+
+from datetime import date
+from tpch.utils import (
+    get_line_item_ds,
+    get_orders_ds,
+    map_partitions,
+)
+from tpch.ops import semi_join
+
+Q_NUM = 4
+
+
+def get_ds():
+    lineitem = get_line_item_ds(
+        "partitioned", columns=["l_orderkey", "l_commitdate", "l_receiptdate"]
+    )
+    orders = get_orders_ds(
+        "partitioned",
+        columns=["o_orderkey", "o_orderdate", "o_orderpriority"],
+        filters=[
+            ("o_orderdate", ">=", date(1993, 7, 1)),
+            ("o_orderdate", "<", date(1993, 10, 1)),
+        ],
+    )
+
+    return lineitem, orders
+
+
+def partial(lineitem, orders):
+    var1 = date(1993, 7, 1)
+    var2 = date(1993, 10, 1)
+
+    # Orders are counted by the partition holding them and their lines
+    late_lines = lineitem[lineitem["l_commitdate"] < lineitem["l_receiptdate"]]
+
+    return (
+        orders[(orders["o_orderdate"] < var2) & (orders["o_orderdate"] >= var1)]
+        .pipe(semi_join, late_lines, left_on="o_orderkey", right_on="l_orderkey")
+        .groupby("o_orderpriority", as_index=False, observed=True)["o_orderkey"]
+        .count()
+    )
+
+
+def query(lineitem, orders):
+    q_final = (
+        pd.concat(map_partitions(partial, lineitem, orders))
+        .groupby("o_orderpriority", as_index=False, observed=True)
+        .sum()
+        .sort_values(["o_orderpriority"])
+        .rename(columns={"o_orderkey": "order_count"})
+    )
+    return q_final
@@ -0,0 +1,50 @@
+import pandas as pd
+
+from datetime import date
+from tpch.utils import (
+    get_line_item_ds,
+    map_partitions,
+)
+
+Q_NUM = 6
+
+
+def get_ds():
+    lineitem = get_line_item_ds(
+        "partitioned",
+        columns=["l_quantity", "l_extendedprice", "l_discount", "l_shipdate"],
+        filters=[
+            ("l_shipdate", ">=", date(1994, 1, 1)),
+            ("l_shipdate", "<", date(1995, 1, 1)),
+            ("l_discount", ">=", 0.05),
+            ("l_discount", "<=", 0.07),
+            ("l_quantity", "<", 24),
+        ],
+    )
+
+    return lineitem
+
+
+def partial(lineitem):
+    var1 = date(1994, 1, 1)
+    var2 = date(1995, 1, 1)
+    var3 = 0.05
+    var4 = 0.07
+    var5 = 24
+
+    return (
+        lineitem[
+            (lineitem["l_shipdate"] < var2)
+            & (lineitem["l_shipdate"] >= var1)
+            & (lineitem["l_discount"] <= var4)
+            & (lineitem["l_discount"] >= var3)
+            & (lineitem["l_quantity"] < var5)
+        ]
+        .pipe(lambda df: df["l_extendedprice"] * df["l_discount"])
+        .sum()
+    )
+
+
+def query(lineitem):
+    result = sum(map_partitions(partial, lineitem))
+    return pd.DataFrame({"revenue": [result]})
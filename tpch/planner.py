@@ -0,0 +1,158 @@
+"""Join planner for the multi-way merge chains of the queries.
+
+A query gives its tables, the keys joining them and the filters of each
+table. The filters are applied first, then the tables are merged two at a time
+in the order whose intermediate results add up to the fewest estimated rows,
+found by dynamic programming over the subsets of tables. Filtered dimension
+tables thus get joined before they meet the fact tables, which in turn are
+only joined once they are cut down by the other tables.
+
+Estimates come from the number of rows of the tables: pandas and cuDF frames
+are counted once filtered, dask collections are estimated from the statistics
+of their table and a fixed filter selectivity. Frames of unknown tables count
+their own rows, or a fixed number for dask. The merges are those of the
+frames passed, so the same plan runs on every backend.
+"""
+
+from itertools import combinations
+
+from dask import is_dask_collection
+from tpch import utils
+
+# Fraction of the rows of a dask table assumed to pass its filters
+FILTER_SELECTIVITY = 0.1
+# Dask joins with a side estimated at most this large broadcast it
+BROADCAST_ROWS = 100_000
+# Rows assumed for a dask frame whose table is not known
+UNKNOWN_TABLE_ROWS = 1_000_000
+# TPC-H columns are prefixed by their table
+TABLE_PREFIXES = {
+    "c": "customer",
+    "l": "lineitem",
+    "n": "nation",
+    "o": "orders",
+    "p": "part",
+    "ps": "partsupp",
+    "r": "region",
+    "s": "supplier",
+}
+
+
+def _as_list(keys) -> list:
+    return [keys] if isinstance(keys, str) else list(keys)
+
+
+def _table_rows(df) -> int:
+    """Get the number of rows of the TPC-H table the columns of df come from.
+
+    Frames whose table is not known, as when their first column is derived or
+    their table was not loaded by utils, count their own rows instead, or
+    UNKNOWN_TABLE_ROWS for dask frames, which are not counted.
+    """
+    prefix = str(df.columns[0]).split("_")[0]
+    try:
+        return utils.get_table_rows(TABLE_PREFIXES[prefix])
+    except KeyError:
+        return UNKNOWN_TABLE_ROWS if is_dask_collection(df) else len(df)
+
+
+def _join_rows(left_rows: float, right_rows: float, key_values: int) -> float:
+    # Matching keys are assumed uniformly spread over the values of the key
+    distinct = max(min(left_rows, key_values), min(right_rows, key_values), 1)
+    return left_rows * right_rows / distinct
+
+
+def order_joins(rows: dict, key_values: list, joins: list) -> list:
+    """Plan the joins of the tables with the fewest intermediate rows.
+
+    rows gives the estimated rows of every table, key_values the distinct
+    values of the keys of every join, which are (table, keys, table, keys)
+    tuples. Returns the merges in the order they run, as (tables, tables,
+    left_on, right_on, rows) tuples, the tables being those joined so far on
+    either side.
+    """
+    names = list(rows)
+    # Best plan of every set of tables, as (intermediate rows, rows, merges)
+    best = {frozenset([name]): (0, rows[name], []) for name in names}
+    for size in range(2, len(names) + 1):
+        for group in map(frozenset, combinations(names, size)):
+            for left_size in range(1, size):
+                for left in map(frozenset, combinations(sorted(group), left_size)):
+                    right = group - left
+                    if left not in best or right not in best:
+                        continue
+                    merge = _plan_merge(left, right, best, key_values, joins)
+                    if merge is None:
+                        continue
+                    cost = best[left][0] + best[right][0] + merge[-1]
+                    if group not in best or cost < best[group][0]:
+                        merges = best[left][2] + best[right][2] + [merge]
+                        best[group] = (cost, merge[-1], merges)
+
+    everything = frozenset(names)
+    if everything not in best:
+        raise ValueError("the joins do not connect all the tables")
+    return best[everything][2]
+
+
+def _plan_merge(left, right, best, key_values: list, joins: list):
+    """Get the keys and estimated rows of the merge of two sets of tables."""
+    left_on, right_on, estimate = [], [], None
+    for i, (table1, keys1, table2, keys2) in enumerate(joins):
+        if table2 in left and table1 in right:
+            table1, keys1, table2, keys2 = table2, keys2, table1, keys1
+        if not (table1 in left and table2 in right):
+            continue
+        left_on += _as_list(keys1)
+        right_on += _as_list(keys2)
+        join_rows = _join_rows(best[left][1], best[right][1], key_values[i])
+        estimate = join_rows if estimate is None else min(estimate, join_rows)
+
+    if estimate is None:
+        return None
+    return left, right, left_on, right_on, estimate
+
+
+def join(tables: dict, joins: list, filters: dict = None):
+    """Filter and join tables in the order planned by order_joins.
+
+    tables maps names to frames, joins lists (table, keys, table, keys) tuples
+    and filters maps table names to functions giving the mask of rows to keep.
+    """
+    filters = filters or {}
+    table_rows = {name: _table_rows(df) for name, df in tables.items()}
+
+    frames, rows = {}, {}
+    for name, df in tables.items():
+        if name in filters:
+            df = df[filters[name](df)]
+        frames[frozenset([name])] = df
+        if is_dask_collection(df):
+            selectivity = FILTER_SELECTIVITY if name in filters else 1
+            rows[name] = max(table_rows[name] * selectivity, 1)
+        else:
+            rows[name] = len(df)
+
+    # A key takes at most as many values as the smaller of its two tables has
+    # rows, as for the primary and foreign keys of TPC-H
+    key_values = [
+        min(table_rows[table1], table_rows[table2]) for table1, _, table2, _ in joins
+    ]
+
+    group_rows = {group: rows[name] for group in frames for name in group}
+    for left, right, left_on, right_on, estimate in order_joins(
+        rows, key_values, joins
+    ):
+        # The smaller side goes to the right, which dask may broadcast
+        if group_rows[left] < group_rows[right]:
+            left, right, left_on, right_on = right, left, right_on, left_on
+        left_df, right_df = frames.pop(left), frames.pop(right)
+        kwargs = {}
+        if is_dask_collection(left_df) and group_rows[right] <= BROADCAST_ROWS:
+            kwargs["broadcast"] = True
+        frames[left | right] = left_df.merge(
+            right_df, left_on=left_on, right_on=right_on, **kwargs
+        )
+        group_rows[left | right] = estimate
+
+    return frames.popitem()[1]
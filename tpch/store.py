@@ -0,0 +1,282 @@
+"""Memory-mapped Arrow IPC table store.
+
+Each table is written once as an uncompressed Arrow IPC file next to its
+Parquet cache. Opening it memory maps the file, so every benchmark process
+gets zero-copy pandas (ArrowDtype) columns backed by the shared page cache
+instead of parsing or decoding the table again. Tables can also be hash
+partitioned on a key into one IPC file per partition, which the processes
+of a pool then map independently.
+
+The batches of a table are the row groups of its Parquet cache, whose min/max
+statistics serve as zone maps: filtered reads skip the batches that cannot
+match and take the ones that match entirely as they are, only filtering the
+rows of the others.
+"""
+
+import os
+from contextlib import ExitStack
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+STORE_SUFFIX = ".arrow"
+# Tests of a filter on the (min, max) range of a batch: whether some of its
+# rows may match, and whether all of them do
+ZONE_TESTS = {
+    "==": (
+        lambda low, high, v: low <= v <= high,
+        lambda low, high, v: low == high == v,
+    ),
+    "!=": (
+        lambda low, high, v: not low == high == v,
+        lambda low, high, v: not low <= v <= high,
+    ),
+    "<": (lambda low, high, v: low < v, lambda low, high, v: high < v),
+    "<=": (lambda low, high, v: low <= v, lambda low, high, v: high <= v),
+    ">": (lambda low, high, v: high > v, lambda low, high, v: low > v),
+    ">=": (lambda low, high, v: high >= v, lambda low, high, v: low >= v),
+    "in": (
+        lambda low, high, v: any(low <= x <= high for x in v),
+        lambda low, high, v: low == high and low in v,
+    ),
+}
+
+# Zone maps of every cached table read so far
+_zone_maps = {}
+
+
+def get_store_path(cached_path: str) -> str:
+    """Get the path of the IPC file for a cached Parquet table."""
+    return os.path.splitext(cached_path)[0] + STORE_SUFFIX
+
+
+def _get_dictionaries(parquet_file) -> dict:
+    """Collect the sorted values of every dictionary-encoded column."""
+    names = [
+        field.name
+        for field in parquet_file.schema_arrow
+        if pa.types.is_dictionary(field.type)
+    ]
+    values = {name: [] for name in names}
+    for i in range(parquet_file.num_row_groups if names else 0):
+        row_group = parquet_file.read_row_group(i, columns=names)
+        for name in names:
+            values[name] += [chunk.dictionary for chunk in row_group[name].chunks]
+
+    dictionaries = {}
+    for name, arrays in values.items():
+        unique = pc.unique(pa.concat_arrays(arrays))
+        dictionaries[name] = unique.take(pc.sort_indices(unique))
+    return dictionaries
+
+
+def _encode(table: pa.Table, dictionaries: dict) -> pa.Table:
+    """Re-encode the dictionary columns of a table with the given dictionaries."""
+    for name, dictionary in dictionaries.items():
+        chunks = []
+        for chunk in table[name].chunks:
+            positions = pc.index_in(chunk.dictionary, value_set=dictionary)
+            indices = positions.take(chunk.indices)
+            chunks.append(pa.DictionaryArray.from_arrays(indices, dictionary))
+        table = table.set_column(
+            table.schema.get_field_index(name), name, pa.chunked_array(chunks)
+        )
+    return table
+
+
+def write_table(cached_path: str, store_path: str) -> None:
+    """Write a cached Parquet table as an Arrow IPC file, one batch per row group."""
+    parquet_file = pq.ParquetFile(cached_path)
+    # IPC files hold a single dictionary per column, so every row group is
+    # encoded with the sorted values of the whole column. Categories then
+    # sort like the strings they stand for.
+    dictionaries = _get_dictionaries(parquet_file)
+
+    # Write to a temporary file first so that concurrent benchmark processes
+    # never map a partially written table
+    tmp_path = f"{store_path}.{os.getpid()}.tmp"
+    with pa.OSFile(tmp_path, "wb") as sink:
+        with pa.ipc.new_file(sink, parquet_file.schema_arrow) as writer:
+            for i in range(parquet_file.num_row_groups):
+                writer.write_table(
+                    _encode(parquet_file.read_row_group(i), dictionaries)
+                )
+    os.replace(tmp_path, store_path)
+
+
+def _map(store_path: str) -> pa.Table:
+    return pa.ipc.open_file(pa.memory_map(store_path, "r")).read_all()
+
+
+def open_table(cached_path: str) -> pa.Table:
+    """Memory map the IPC copy of a cached table, creating it if needed."""
+    store_path = get_store_path(cached_path)
+    if not os.path.exists(store_path):
+        write_table(cached_path, store_path)
+
+    return _map(store_path)
+
+
+def get_partition_paths(cached_path: str, num_partitions: int) -> list:
+    """Get the paths of the IPC files of a table split in num_partitions."""
+    stem = os.path.splitext(cached_path)[0]
+    return [
+        f"{stem}.part{num_partitions}-{i}{STORE_SUFFIX}" for i in range(num_partitions)
+    ]
+
+
+def partition_ids(keys: np.ndarray, num_partitions: int) -> np.ndarray:
+    """Get the partition of every key."""
+    # Multiplicative hashing, so that the sparse TPC-H order keys (8 out of
+    # every 32) still spread evenly over any number of partitions
+    hashed = keys.astype(np.uint64) * np.uint64(0x9E3779B97F4A7C15)
+    return (hashed >> np.uint64(32)) % np.uint64(num_partitions)
+
+
+def write_partitions(cached_path: str, key: str, paths: list) -> None:
+    """Hash partition a cached table on a key column, one IPC file per partition."""
+    table = open_table(cached_path)
+    tmp_paths = [f"{path}.{os.getpid()}.tmp" for path in paths]
+    with ExitStack() as stack:
+        writers = []
+        for tmp_path in tmp_paths:
+            sink = stack.enter_context(pa.OSFile(tmp_path, "wb"))
+            writers.append(stack.enter_context(pa.ipc.new_file(sink, table.schema)))
+        # Every batch is split in turn, so the whole table is never copied
+        for batch in table.to_batches():
+            ids = partition_ids(batch[key].to_numpy(), len(paths))
+            order = np.argsort(ids, kind="stable")
+            bounds = np.searchsorted(ids[order], np.arange(len(paths) + 1))
+            batch = batch.take(pa.array(order))
+            for i, writer in enumerate(writers):
+                writer.write_batch(batch.slice(bounds[i], bounds[i + 1] - bounds[i]))
+
+    for tmp_path, path in zip(tmp_paths, paths):
+        os.replace(tmp_path, path)
+
+
+def open_partitions(cached_path: str, key: str, num_partitions: int) -> list:
+    """Get the partition files of a cached table, creating them if needed."""
+    paths = get_partition_paths(cached_path, num_partitions)
+    if not all(os.path.exists(path) for path in paths):
+        write_partitions(cached_path, key, paths)
+
+        # Drop the partitions of the table in any other number
+        cache_dir, stem = os.path.split(os.path.splitext(cached_path)[0])
+        for file_name in os.listdir(cache_dir):
+            path = os.path.join(cache_dir, file_name)
+            if (
+                file_name.startswith(f"{stem}.part")
+                and file_name.endswith(STORE_SUFFIX)
+                and path not in paths
+            ):
+                os.remove(path)
+
+    return paths
+
+
+def get_zone_maps(cached_path: str) -> list:
+    """Get the (min, max) of the columns of every row group of a cached table."""
+    if cached_path not in _zone_maps:
+        metadata = pq.ParquetFile(cached_path).metadata
+        zone_maps = []
+        for i in range(metadata.num_row_groups):
+            row_group = metadata.row_group(i)
+            zone_map = {}
+            for j in range(row_group.num_columns):
+                column = row_group.column(j)
+                stats = column.statistics
+                if stats is not None and stats.has_min_max:
+                    zone_map[column.path_in_schema] = (stats.min, stats.max)
+            zone_maps.append(zone_map)
+        _zone_maps[cached_path] = zone_maps
+
+    return _zone_maps[cached_path]
+
+
+def _match_zone(zone_map: dict, filters: list):
+    """Test whether none (False), some (None) or all (True) rows of a batch match."""
+    matches = True
+    for col, op, value in filters:
+        if col not in zone_map or op not in ZONE_TESTS:
+            matches = None
+            continue
+        may_match, all_match = ZONE_TESTS[op]
+        low, high = zone_map[col]
+        try:
+            if not may_match(low, high, value):
+                return False
+            if not all_match(low, high, value):
+                matches = None
+        except TypeError:  # Statistics not comparable with the value
+            matches = None
+
+    return matches
+
+
+def _select(
+    table: pa.Table, columns: list = None, filters: list = None, zone_maps=None
+):
+    columns = columns or table.column_names
+    if not filters:
+        return table.select(columns)
+
+    batches = table.to_batches()
+    if zone_maps is None or len(zone_maps) != len(batches):
+        zone_maps = [{}] * len(batches)
+    matching, partial = [], []
+    for batch, zone_map in zip(batches, zone_maps):
+        matches = _match_zone(zone_map, filters)
+        if matches:
+            matching.append(batch)
+        elif matches is None:
+            partial.append(batch)
+
+    # Batches matching entirely are kept as they are, without copying them
+    filter_cols = [col for col, _, _ in filters if col not in columns]
+    partial = (
+        pa.Table.from_batches(partial, schema=table.schema)
+        .select(columns + list(dict.fromkeys(filter_cols)))
+        .filter(pq.filters_to_expression(filters))
+        .select(columns)
+    )
+    return pa.concat_tables(
+        [pa.Table.from_batches(matching, schema=table.schema).select(columns), partial]
+    )
+
+
+def read_table(cached_path: str, columns: list = None, filters: list = None):
+    """Read columns of a table, keeping only the rows that match the filters.
+
+    The returned columns are views of the memory-mapped file, except for the
+    rows of the batches that only match in part, which are copied.
+    """
+    zone_maps = get_zone_maps(cached_path) if filters else None
+    return _select(open_table(cached_path), columns, filters, zone_maps)
+
+
+def _types_mapper(arrow_type):
+    # Dictionary columns become pandas categoricals
+    return None if pa.types.is_dictionary(arrow_type) else pd.ArrowDtype(arrow_type)
+
+
+def to_pandas(table: pa.Table) -> pd.DataFrame:
+    """Convert a table to pandas without copying its non-dictionary columns."""
+    return table.to_pandas(types_mapper=_types_mapper)
+
+
+def read_ds(
+    cached_path: str, columns: list = None, filters: list = None
+) -> pd.DataFrame:
+    """Read a table as a pandas DataFrame backed by Arrow memory."""
+    return to_pandas(read_table(cached_path, columns, filters))
+
+
+def read_partition(
+    path: str, columns: list = None, filters: list = None
+) -> pd.DataFrame:
+    """Read a partition written by write_partitions as a pandas DataFrame."""
+    return to_pandas(_select(_map(path), columns, filters))
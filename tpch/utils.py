@@ -1,16 +1,283 @@
-import cudf
-import dask_cudf
+import hashlib
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pa_csv
+import pyarrow.dataset as pa_ds
+import pyarrow.parquet as pq
 
 from dask import dataframe as dd
+from tpch import store
+
+try:
+    import cudf
+    import dask_cudf
+except ImportError:  # Machines without a GPU can still run the CPU modes
+    cudf = dask_cudf = None
 
-ROOT_PATH = "./TPC-H/tables"
+ROOT_PATH = os.environ.get("TPCH_ROOT_PATH", "./TPC-H/tables")
 EXPORT_PATH = "./tpch/output/"
+# Columnar copies of the .tbl files live next to them
+CACHE_DIR = ".cache"
+# Bump when the layout of the cached files changes
+CACHE_VERSION = 1
+# Text exports: column widths and rows formatted at a time
+EXPORT_STR_COL_WIDTH = 25
+EXPORT_NUM_COL_WIDTH = 10
+EXPORT_CHUNK_SIZE = 100_000
+EXPORT_FORMATS = {"tbl": "out", "csv": "csv", "parquet": "parquet", "arrow": "arrow"}
+
+# Low-cardinality strings are declared as "category" and stored dictionary
+# encoded, so that filters and group-bys work on the integer codes
+ARROW_TYPES = {
+    int: pa.int64(),
+    float: pa.float64(),
+    str: pa.string(),
+    "category": pa.dictionary(pa.int32(), pa.string()),
+}
+STRING_DTYPE = pd.ArrowDtype(pa.string())
+# Rows per chunk of the out-of-core "chunked" mode
+CHUNK_ROWS = 1 << 20
+# Worker processes, and partitions of the fact tables, of the "partitioned"
+# mode. The tables are hash partitioned on the order key so that their joins
+# are local to a partition.
+PARTITIONS = os.cpu_count()
+PARTITION_KEYS = {"lineitem": "l_orderkey", "orders": "o_orderkey"}
+# Tables with a second copy sorted on the date their scans filter by range,
+# read with clustered=True. The copy is written in row groups of
+# CLUSTER_ROW_GROUP_ROWS rows, so that reads skip the row groups whose
+# statistics rule them out. Queries joining on the order key keep reading the
+# table in its original order, by order key. Sorting holds the table in memory
+# once, when the copy is made.
+CLUSTER_KEYS = {"lineitem": "l_shipdate"}
+CLUSTER_ROW_GROUP_ROWS = 1 << 16
+# Dask loads tables of at most this many rows in a single partition, which its
+# merges then broadcast instead of shuffling both sides: nation and region at
+# any scale factor, supplier (10,000 rows per SF) up to SF10
+SINGLE_PARTITION_ROWS = 100_000
+
+_pool = None
+# Columnar copy of every table loaded so far
+_cached_paths = {}
+
+
+def get_scale_factor_path(scale_factor: float) -> str:
+    """Get the default directory of the tables generated at a scale factor."""
+    return f"./TPC-H/sf{scale_factor:g}/tables"
 
 
 def get_table_path(table_name: str) -> str:
     """Get the path to the table based on the table name."""
-    return f"{ROOT_PATH}/{table_name}.tbl"
+    path = f"{ROOT_PATH}/{table_name}.tbl"
+    # Tables generated by tpch.dbgen may be written as Parquet instead
+    if not os.path.exists(path) and os.path.exists(f"{ROOT_PATH}/{table_name}.parquet"):
+        return f"{ROOT_PATH}/{table_name}.parquet"
+    return path
+
+
+def _cache_key(path: str, col_names: list, dtypes: dict, date_cols: list) -> str:
+    """Key a cached table on the source file and on how it is parsed."""
+    stat = os.stat(path)
+    schema = [
+        (col, ARROW_TYPES[dtypes[col]] if col in (dtypes or {}) else None)
+        for col in col_names
+    ]
+    payload = repr(
+        (CACHE_VERSION, stat.st_size, stat.st_mtime_ns, schema, date_cols or [])
+    )
+    return hashlib.sha1(payload.encode()).hexdigest()[:16]
+
+
+def _convert_to_parquet(
+    path: str,
+    cached_path: str,
+    col_names: list,
+    dtypes: dict,
+    date_cols: list,
+    sort_key: str = None,
+) -> None:
+    """Stream a pipe-delimited .tbl (or a Parquet) file into a typed Parquet file.
+
+    With a sort_key the table is sorted on it first, and written in row groups
+    of CLUSTER_ROW_GROUP_ROWS rows.
+    """
+    column_types = {col: ARROW_TYPES[dtype] for col, dtype in (dtypes or {}).items()}
+    for col in date_cols or []:
+        column_types[col] = pa.date32()
+
+    if path.endswith(".parquet"):
+        parquet_file = pq.ParquetFile(path)
+        source = parquet_file.schema_arrow
+        schema = pa.schema(
+            [(col, column_types.get(col, source.field(col).type)) for col in col_names]
+        )
+        reader = (
+            batch.select(col_names).cast(schema)
+            for batch in parquet_file.iter_batches(columns=col_names)
+        )
+    else:
+        reader = _open_tbl(path, col_names, column_types)
+        schema = reader.schema
+
+    # Write to a temporary file first so that concurrent benchmark processes
+    # never see a partially written table
+    tmp_path = f"{cached_path}.{os.getpid()}.tmp"
+    with pq.ParquetWriter(tmp_path, schema) as writer:
+        if sort_key:
+            table = pa.Table.from_batches(reader, schema=schema).sort_by(sort_key)
+            writer.write_table(table, row_group_size=CLUSTER_ROW_GROUP_ROWS)
+        else:
+            for batch in reader:
+                writer.write_batch(batch)
+    os.replace(tmp_path, cached_path)
+
+
+def _open_tbl(path: str, col_names: list, column_types: dict):
+    """Open a streaming reader over a pipe-delimited .tbl file."""
+    return pa_csv.open_csv(
+        path,
+        # Add an extra column for the trailing delimiter
+        read_options=pa_csv.ReadOptions(
+            column_names=col_names + ["dummy"], block_size=64 << 20
+        ),
+        parse_options=pa_csv.ParseOptions(delimiter="|"),
+        convert_options=pa_csv.ConvertOptions(
+            column_types=column_types, include_columns=col_names
+        ),
+    )
+
+
+def get_cached_table_path(
+    table_name: str,
+    col_names: list,
+    dtypes: dict = None,
+    date_cols: list = None,
+    sort_key: str = None,
+) -> str:
+    """Get the path to the columnar copy of a table, creating it if needed."""
+    path = get_table_path(table_name)
+    cache_dir = os.path.join(os.path.dirname(path), CACHE_DIR)
+    key = _cache_key(path, col_names, dtypes, date_cols)
+    # Sorted copies are cached next to the table, under their own name
+    name = f"{table_name}_by_{sort_key}" if sort_key else table_name
+    cached_path = os.path.join(cache_dir, f"{name}-{key}.parquet")
+
+    if not os.path.exists(cached_path):
+        os.makedirs(cache_dir, exist_ok=True)
+        _convert_to_parquet(path, cached_path, col_names, dtypes, date_cols, sort_key)
+
+        # Drop copies made from older versions of the table
+        for file_name in os.listdir(cache_dir):
+            if file_name.startswith(f"{name}-") and not file_name.startswith(
+                f"{name}-{key}"
+            ):
+                os.remove(os.path.join(cache_dir, file_name))
+
+    return cached_path
+
+
+def get_table_rows(table_name: str) -> int:
+    """Get the number of rows of a loaded table from its Parquet metadata."""
+    return pq.ParquetFile(_cached_paths[table_name]).metadata.num_rows
+
+
+class TableChunks:
+    """Stream a cached table as pandas DataFrames of at most CHUNK_ROWS rows.
+
+    Every iteration reads the table again, so at most a couple of chunks are
+    held in memory at any time.
+    """
+
+    def __init__(self, path: str, columns: list = None, filters: list = None):
+        self.path = path
+        self.columns = columns
+        self.filters = filters
+
+    def __iter__(self):
+        parquet_file = pq.ParquetFile(self.path)
+        columns = self.columns or parquet_file.schema_arrow.names
+        row_groups = range(parquet_file.num_row_groups)
+        expression = None
+        if self.filters:
+            expression = pq.filters_to_expression(self.filters)
+            # Skip the row groups ruled out by their statistics
+            fragments = pa_ds.dataset(self.path, format="parquet").get_fragments()
+            fragment = next(fragments).subset(expression)
+            row_groups = [row_group.id for row_group in fragment.row_groups]
+            filter_cols = [col for col, _, _ in self.filters if col not in columns]
+            columns = columns + list(dict.fromkeys(filter_cols))
+
+        batches = parquet_file.iter_batches(
+            batch_size=CHUNK_ROWS, row_groups=row_groups, columns=columns
+        )
+        for batch in batches:
+            table = pa.Table.from_batches([batch])
+            if expression is not None:
+                table = table.filter(expression).select(self.columns or columns)
+            if table.num_rows == 0:
+                continue
+            chunk = store.to_pandas(table)
+            # Categories come in order of appearance in each row group, sort
+            # them so that they also sort like strings once chunks are combined
+            for col in chunk.select_dtypes("category"):
+                categories = chunk[col].cat.categories
+                chunk[col] = chunk[col].cat.reorder_categories(categories.sort_values())
+            yield chunk
+
+
+class TablePartitions:
+    """A table hash partitioned into memory-mapped IPC files.
+
+    Only the paths are pickled to the worker processes, each of which maps
+    and reads the partitions it is given.
+    """
+
+    def __init__(self, paths: list, columns: list = None, filters: list = None):
+        self.paths = paths
+        self.columns = columns
+        self.filters = filters
+
+    def __len__(self):
+        return len(self.paths)
+
+    def read(self, i: int) -> pd.DataFrame:
+        return store.read_partition(self.paths[i], self.columns, self.filters)
+
+
+def get_pool() -> ProcessPoolExecutor:
+    """Get the process pool of the partitioned mode, started on first use."""
+    global _pool
+    if _pool is None:
+        _pool = ProcessPoolExecutor(PARTITIONS)
+    return _pool
+
+
+def _run_partition(func, i: int, args: tuple):
+    args = [arg.read(i) if isinstance(arg, TablePartitions) else arg for arg in args]
+    return func(*args)
+
+
+def map_partitions(func, *args) -> list:
+    """Run func on every partition of co-partitioned tables in the process pool.
+
+    TablePartitions arguments are replaced by their i-th partition, every other
+    argument is sent whole to each call. func has to be defined at the top
+    level of a module for the workers to find it.
+    """
+    num_partitions = {len(arg) for arg in args if isinstance(arg, TablePartitions)}
+    if len(num_partitions) != 1:
+        raise ValueError("the tables must have the same number of partitions")
+
+    return list(
+        get_pool().map(
+            _run_partition, repeat(func), range(num_partitions.pop()), repeat(args)
+        )
+    )
 
 
 def _read_ds(
@@ -19,72 +286,70 @@ def _read_ds(
     dtypes: dict = None,
     date_cols: list = None,
     mode: str = "pandas",
+    columns: list = None,
+    filters: list = None,
+    clustered: bool = False,
 ):
-    path = get_table_path(table_name)
-
-    # Set up read_csv parameters with an extra column for the trailing delimiter
-    params = {"sep": "|", "header": None, "dtype_backend": "pyarrow"}
-
-    # Add an extra column for the trailing delimiter
-    if col_names:
-        params["names"] = col_names + ["dummy"]
-
-    if dtypes:
-        # Only apply dtypes to the real columns
-        params["dtype"] = dtypes
-
-    # Parse dates during reading
-    if date_cols and mode not in [
-        "cudf",
-        "cudask",
-    ]:  # cudf/cudask handle dates separately
-        params["parse_dates"] = date_cols
-
-    # Choose the appropriate dataframe implementation based on mode
+    # Parsing the .tbl file only happens once, every later read is served from
+    # its typed columnar copy
+    if mode in ["cudf", "cudask"] and cudf is None:
+        raise ImportError(f"cudf and dask_cudf are required for mode '{mode}'")
+
+    if clustered and table_name not in CLUSTER_KEYS:
+        raise ValueError(f"{table_name} has no sorted copy")
+    sort_key = CLUSTER_KEYS[table_name] if clustered else None
+    path = _cached_paths[table_name] = get_cached_table_path(
+        table_name, col_names, dtypes, date_cols, sort_key
+    )
+
+    # Choose the appropriate dataframe implementation based on mode, reading
+    # only the requested columns. Filters are (column, op, value) tuples that
+    # are ANDed together; they skip row groups using the Parquet statistics
+    # and drop the remaining non-matching rows before they are materialized.
     if mode == "dask":
-        df = dd.read_csv(path, **params)
-    elif mode == "cudf" or mode == "cudask":
-        # Remove pyarrow backend setting for cuDF
-        alt_params = params.copy()
-        if "dtype_backend" in alt_params:
-            del alt_params["dtype_backend"]
-
-        # Remove parse_dates for cuDF initial load
-        if "parse_dates" in alt_params:
-            del alt_params["parse_dates"]
-
-        if mode == "cudf":
-            df = cudf.read_csv(path, **alt_params)
-        else:
-            df = dask_cudf.read_csv(path, **alt_params)
-    else:  # pandas mode by default
-        df = pd.read_csv(path, **params)
-
-    # Remove the dummy column that's created due to the trailing delimiter
-    if "dummy" in df.columns:
-        df = df.drop(columns=["dummy"])
-    elif df.columns.size > 0 and df.iloc[:, -1].isna().all():
-        df = df.iloc[:, :-1]
-
-    # Convert parsed dates to date types
-    if date_cols:
+        df = dd.read_parquet(
+            path, columns=columns, filters=filters, dtype_backend="pyarrow"
+        )
+    elif mode == "cudf":
+        df = cudf.read_parquet(path, columns=columns, filters=filters)
+    elif mode == "cudask":
+        df = dask_cudf.read_parquet(path, columns=columns, filters=filters)
+    elif mode == "chunked":
+        return TableChunks(path, columns=columns, filters=filters)
+    elif mode == "partitioned":
+        if table_name not in PARTITION_KEYS:
+            raise ValueError(f"{table_name} cannot be loaded in mode '{mode}'")
+        paths = store.open_partitions(path, PARTITION_KEYS[table_name], PARTITIONS)
+        return TablePartitions(paths, columns=columns, filters=filters)
+    else:  # pandas mode by default, served from the memory-mapped store
+        df = store.read_ds(path, columns=columns, filters=filters)
+
+    if (
+        mode in ["dask", "cudask"]
+        and get_table_rows(table_name) <= SINGLE_PARTITION_ROWS
+    ):
+        df = df.repartition(npartitions=1)
+
+    # cuDF has no date type, so dates are loaded as timestamps
+    if date_cols and mode in ["cudf", "cudask"]:
         for col in date_cols:
-            if mode == "cudf":
-                df[col] = cudf.to_datetime(df[col])
-            elif mode == "cudask":
-
-                def convert_partition(series):
-                    return cudf.to_datetime(series, format="%Y-%m-%d")
+            if col in df.columns:
+                df[col] = df[col].astype("datetime64[ms]")
 
-                meta = cudf.Series([], dtype="datetime64[ms]", name=col)
-                df[col] = df[col].map_partitions(convert_partition, meta=meta)
-            else:
-                df[col] = df[col].astype("date32[day][pyarrow]")
+    # Only pandas keeps categoricals: dask partitions would each get their own
+    # categories, and the GPU queries are written against string columns
+    if mode != "pandas":
+        string_type = "str" if mode in ["cudf", "cudask"] else STRING_DTYPE
+        for col, dtype in (dtypes or {}).items():
+            if dtype == "category" and col in df.columns:
+                df[col] = df[col].astype(string_type)
 
     return df
 
 
-def get_customer_ds(mode: str = "pandas") -> pd.DataFrame:
+def get_customer_ds(
+    mode: str = "pandas", columns: list = None, filters: list = None
+) -> pd.DataFrame:
     cols = [
         "c_custkey",
         "c_name",
@@ -102,13 +367,21 @@ def get_customer_ds(mode: str = "pandas") -> pd.DataFrame:
         "c_nationkey": int,
         "c_phone": str,
         "c_acctbal": float,
-        "c_mktsegment": str,
+        "c_mktsegment": "category",
         "c_comment": str,
     }
-    return _read_ds("customer", cols, dtypes, mode=mode)
+    return _read_ds(
+        "customer", cols, dtypes, mode=mode, columns=columns, filters=filters
+    )
 
 
-def get_line_item_ds(mode: str = "pandas") -> pd.DataFrame:
+def get_line_item_ds(
+    mode: str = "pandas",
+    columns: list = None,
+    filters: list = None,
+    clustered: bool = False,
+) -> pd.DataFrame:
+    """Read lineitem, from its copy sorted by l_shipdate if clustered."""
     cols = [
         "l_orderkey",
         "l_partkey",
@@ -136,24 +409,42 @@ def get_line_item_ds(mode: str = "pandas") -> pd.DataFrame:
         "l_extendedprice": float,
         "l_discount": float,
         "l_tax": float,
-        "l_returnflag": str,
-        "l_linestatus": str,
-        "l_shipinstruct": str,
-        "l_shipmode": str,
+        "l_returnflag": "category",
+        "l_linestatus": "category",
+        "l_shipinstruct": "category",
+        "l_shipmode": "category",
         "l_comment": str,
     }
     date_cols = ["l_shipdate", "l_commitdate", "l_receiptdate"]
 
-    return _read_ds("lineitem", cols, dtypes, date_cols, mode=mode)
-
-
-def get_nation_ds(mode: str = "pandas") -> pd.DataFrame:
+    return _read_ds(
+        "lineitem",
+        cols,
+        dtypes,
+        date_cols,
+        mode=mode,
+        columns=columns,
+        filters=filters,
+        clustered=clustered,
+    )
+
+
+def get_nation_ds(
+    mode: str = "pandas", columns: list = None, filters: list = None
+) -> pd.DataFrame:
     cols = ["n_nationkey", "n_name", "n_regionkey", "n_comment"]
-    dtypes = {"n_nationkey": int, "n_name": str, "n_regionkey": int, "n_comment": str}
-    return _read_ds("nation", cols, dtypes, mode=mode)
+    dtypes = {
+        "n_nationkey": int,
+        "n_name": "category",
+        "n_regionkey": int,
+        "n_comment": str,
+    }
+    return _read_ds("nation", cols, dtypes, mode=mode, columns=columns, filters=filters)
 
 
-def get_orders_ds(mode: str = "pandas") -> pd.DataFrame:
+def get_orders_ds(
+    mode: str = "pandas", columns: list = None, filters: list = None
+) -> pd.DataFrame:
     cols = [
         "o_orderkey",
         "o_custkey",
@@ -170,17 +461,21 @@ def get_orders_ds(mode: str = "pandas") -> pd.DataFrame:
         "o_custkey": int,
         "o_orderstatus": str,
         "o_totalprice": float,
-        "o_orderpriority": str,
+        "o_orderpriority": "category",
         "o_clerk": str,
         "o_shippriority": int,
         "o_comment": str,
     }
     date_cols = ["o_orderdate"]
 
-    return _read_ds("orders", cols, dtypes, date_cols, mode=mode)
+    return _read_ds(
+        "orders", cols, dtypes, date_cols, mode=mode, columns=columns, filters=filters
+    )
 
 
-def get_part_ds(mode: str = "pandas") -> pd.DataFrame:
+def get_part_ds(
+    mode: str = "pandas", columns: list = None, filters: list = None
+) -> pd.DataFrame:
     cols = [
         "p_partkey",
         "p_name",
@@ -196,17 +491,19 @@ def get_part_ds(mode: str = "pandas") -> pd.DataFrame:
         "p_partkey": int,
         "p_name": str,
         "p_mfgr": str,
-        "p_brand": str,
+        "p_brand": "category",
         "p_type": str,
         "p_size": int,
-        "p_container": str,
+        "p_container": "category",
         "p_retailprice": float,
         "p_comment": str,
     }
-    return _read_ds("part", cols, dtypes, mode=mode)
+    return _read_ds("part", cols, dtypes, mode=mode, columns=columns, filters=filters)
 
 
-def get_part_supp_ds(mode: str = "pandas") -> pd.DataFrame:
+def get_part_supp_ds(
+    mode: str = "pandas", columns: list = None, filters: list = None
+) -> pd.DataFrame:
     cols = ["ps_partkey", "ps_suppkey", "ps_availqty", "ps_supplycost", "ps_comment"]
     dtypes = {
         "ps_partkey": int,
@@ -215,16 +512,22 @@ def get_part_supp_ds(mode: str = "pandas") -> pd.DataFrame:
         "ps_supplycost": float,
         "ps_comment": str,
     }
-    return _read_ds("partsupp", cols, dtypes, mode=mode)
+    return _read_ds(
+        "partsupp", cols, dtypes, mode=mode, columns=columns, filters=filters
+    )
 
 
-def get_region_ds(mode: str = "pandas") -> pd.DataFrame:
+def get_region_ds(
+    mode: str = "pandas", columns: list = None, filters: list = None
+) -> pd.DataFrame:
     cols = ["r_regionkey", "r_name", "r_comment"]
     dtypes = {"r_regionkey": int, "r_name": str, "r_comment": str}
-    return _read_ds("region", cols, dtypes, mode=mode)
+    return _read_ds("region", cols, dtypes, mode=mode, columns=columns, filters=filters)
 
 
-def get_supplier_ds(mode: str = "pandas") -> pd.DataFrame:
+def get_supplier_ds(
+    mode: str = "pandas", columns: list = None, filters: list = None
+) -> pd.DataFrame:
     cols = [
         "s_suppkey",
         "s_name",
@@ -243,35 +546,112 @@ def get_supplier_ds(mode: str = "pandas") -> pd.DataFrame:
         "s_acctbal": float,
         "s_comment": str,
     }
-    return _read_ds("supplier", cols, dtypes, mode=mode)
-
-
-def export_df(df, output_file: str, is_cudf: bool = False) -> None:
-    # Default column width (adjust as needed)
-    str_col_width = 25
-    num_col_width = 10
-
+    return _read_ds(
+        "supplier", cols, dtypes, mode=mode, columns=columns, filters=filters
+    )
+
+
+def _to_arrow_chunks(df, chunk_size: int):
+    """Convert a dataframe to Arrow tables of at most chunk_size rows."""
+    if isinstance(df, dd.DataFrame):
+        # Only one partition is collected at a time
+        for i in range(df.npartitions):
+            yield from _to_arrow_chunks(df.get_partition(i).compute(), chunk_size)
+        return
+
+    if not hasattr(df, "columns"):
+        df = df.to_frame()
+
+    for start in range(0, max(len(df), 1), chunk_size):
+        chunk = df.iloc[start : start + chunk_size]
+        if hasattr(chunk, "to_arrow"):
+            # cuDF, copy each chunk to the host rather than the whole result
+            yield chunk.to_arrow(preserve_index=False)
+        else:
+            yield pa.Table.from_pandas(chunk, preserve_index=False)
+
+
+def _format_column(column: pa.ChunkedArray) -> pa.ChunkedArray:
+    """Format the values of a column as they are written to .out files."""
+    column_type = column.type
+    if pa.types.is_floating(column_type):
+        # Same repr as Python floats, e.g. 38.0 rather than Arrow's 38
+        values = column.to_numpy().astype(str)
+        strings = pa.array(values, mask=column.is_null().to_numpy(), type=pa.string())
+    elif pa.types.is_boolean(column_type):
+        strings = pc.if_else(column, "True", "False")
+    else:
+        strings = column.cast(pa.string())
+    strings = strings.fill_null("")
+
+    if (
+        pa.types.is_integer(column_type)
+        or pa.types.is_floating(column_type)
+        or pa.types.is_boolean(column_type)
+    ):
+        # Right-justify numbers
+        return pc.utf8_lpad(strings, width=EXPORT_NUM_COL_WIDTH)
+    # Left-justify everything else
+    return pc.utf8_rpad(strings, width=EXPORT_STR_COL_WIDTH)
+
+
+def _write_out_chunk(f, table: pa.Table) -> None:
+    """Write the rows of a chunk as |-separated lines in one go."""
+    if table.num_rows == 0:
+        return
+
+    columns = [_format_column(column) for column in table.columns]
+    lines = pc.binary_join_element_wise(*columns, "|")
+    lines = pc.binary_join_element_wise(lines, "\n", "")
+    lines = lines.combine_chunks() if isinstance(lines, pa.ChunkedArray) else lines
+
+    _, offsets, data = lines.buffers()
+    offsets = np.frombuffer(offsets, dtype=np.int32)
+    start, stop = offsets[lines.offset], offsets[lines.offset + len(lines)]
+    f.write(memoryview(data)[start:stop])
+
+
+def export_df(
+    df,
+    output_file: str,
+    fmt: str = "tbl",
+    chunk_size: int = EXPORT_CHUNK_SIZE,
+) -> None:
+    """Export a result to EXPORT_PATH, streaming it in chunks of rows.
+
+    fmt is either "tbl" (aligned |-separated text), "csv", "parquet" or "arrow".
+    cuDF and dask results are accepted as is, only one chunk or partition is
+    copied to host memory at a time.
+    """
     path = EXPORT_PATH + output_file
-
-    if is_cudf:
-        df = df.to_pandas()
-
-    with open(path, "w") as f:
-        # Write header
-        header = "|".join(str(col).ljust(str_col_width) for col in df.columns)
-        f.write(header + "\n")
-
-        # Write data rows
-        for _, row in df.iterrows():
-            # Format each value with appropriate justification
-            formatted_values = []
-            for val in row:
-                if isinstance(val, (int, float)):
-                    # Right-justify numbers
-                    formatted_values.append(str(val).rjust(num_col_width))
+    chunks = _to_arrow_chunks(df, chunk_size)
+
+    if fmt == "tbl":
+        with open(path, "wb") as f:
+            first = next(chunks)
+            header = "|".join(
+                str(col).ljust(EXPORT_STR_COL_WIDTH) for col in first.column_names
+            )
+            f.write(f"{header}\n".encode())
+            _write_out_chunk(f, first)
+            for chunk in chunks:
+                _write_out_chunk(f, chunk)
+        return
+
+    writer = None
+    try:
+        for chunk in chunks:
+            if writer is None:
+                schema = chunk.schema
+                if fmt == "parquet":
+                    writer = pq.ParquetWriter(path, schema)
+                elif fmt == "arrow":
+                    writer = pa.ipc.new_file(path, schema)
+                elif fmt == "csv":
+                    writer = pa_csv.CSVWriter(path, schema)
                 else:
-                    # Left-justify strings
-                    formatted_values.append(str(val).ljust(str_col_width))
-
-            formatted_row = "|".join(formatted_values)
-            f.write(formatted_row + "\n")
+                    raise ValueError(f"Unknown export format: {fmt}")
+            writer.write_table(chunk.cast(schema))
+    finally:
+        if writer is not None:
+            writer.close()
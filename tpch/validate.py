@@ -0,0 +1,112 @@
+"""Check query results against stored reference answers.
+
+The answers of a scale factor live next to its tables, e.g. the results for
+./TPC-H/sf1/tables are kept in ./TPC-H/sf1/answers/q<N>.parquet. Results are
+normalized before they are stored or compared, so that the backends can be
+checked against each other: numbers become floats, dates ISO strings and
+columns are matched by position rather than by name.
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from tpch import utils
+
+ANSWERS_DIR = "answers"
+# Decimal results only have to match to the cent, see TPC-H 2.1.3.5
+RTOL = 1e-9
+ATOL = 0.01
+
+
+def get_answers_path() -> str:
+    """Get the directory of the reference answers for the current tables."""
+    return os.path.join(os.path.dirname(os.path.normpath(utils.ROOT_PATH)), ANSWERS_DIR)
+
+
+def get_answer_path(q_num: int, answers_path: str = None) -> str:
+    return os.path.join(answers_path or get_answers_path(), f"q{q_num}.parquet")
+
+
+def _normalize_column(values: pd.Series) -> pd.Series:
+    if pd.api.types.is_bool_dtype(values) or pd.api.types.is_numeric_dtype(values):
+        return values.astype("float64")
+
+    if values.dtype.kind == "M" or (
+        isinstance(values.dtype, pd.ArrowDtype)
+        and values.dtype.pyarrow_dtype.equals(pa.date32())
+    ):
+        return pd.to_datetime(values).dt.strftime("%Y-%m-%d").astype(object)
+
+    values = values.astype(str).str.strip().astype(object)
+    try:
+        # Numbers computed as strings or decimals by some backends
+        return pd.to_numeric(values).astype("float64")
+    except (TypeError, ValueError):
+        return values
+
+
+def normalize(result) -> pd.DataFrame:
+    """Convert a materialized result to plain pandas columns."""
+    if isinstance(result, pd.Series):
+        result = result.to_frame()
+    result = result.reset_index(drop=True)
+
+    return pd.DataFrame({col: _normalize_column(result[col]) for col in result.columns})
+
+
+def record_answer(result, q_num: int, answers_path: str = None) -> str:
+    """Store the result of a query as its reference answer."""
+    path = get_answer_path(q_num, answers_path)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    normalize(result).to_parquet(path, index=False)
+    return path
+
+
+def _first_difference(actual, expected, rtol: float, atol: float) -> str:
+    for i in range(expected.shape[1]):
+        x = actual.iloc[:, i].to_numpy()
+        y = expected.iloc[:, i].to_numpy()
+        if x.dtype == np.float64 and y.dtype == np.float64:
+            equal = np.isclose(x, y, rtol=rtol, atol=atol, equal_nan=True)
+        elif x.dtype == y.dtype:
+            equal = x == y
+        else:
+            return f"column {i} ({expected.columns[i]}) has type {x.dtype}, expected {y.dtype}"
+        if not equal.all():
+            row = int(np.argmin(equal))
+            return (
+                f"column {i} ({expected.columns[i]}) differs at row {row}: "
+                f"{x[row]} != {y[row]}"
+            )
+
+    return None
+
+
+def _sort_rows(df: pd.DataFrame) -> pd.DataFrame:
+    return df.sort_values(list(df.columns)).reset_index(drop=True)
+
+
+def check_answer(
+    result, q_num: int, answers_path: str = None, rtol: float = RTOL, atol: float = ATOL
+) -> str:
+    """Compare a result with its reference answer, returning what differs if any."""
+    path = get_answer_path(q_num, answers_path)
+    if not os.path.exists(path):
+        return f"no reference answer in {path}"
+
+    expected = pd.read_parquet(path)
+    actual = normalize(result)
+    if actual.shape != expected.shape:
+        return f"shape {actual.shape}, expected {expected.shape}"
+
+    error = _first_difference(actual, expected, rtol, atol)
+    if error:
+        # Rows that tie on the ORDER BY keys may come back in any order
+        actual.columns = expected.columns
+        if _first_difference(_sort_rows(actual), _sort_rows(expected), rtol, atol):
+            return error
+
+    return None